@@ -0,0 +1,167 @@
+"""
+Load benchmark for the LLM phase of a run, against the local mock OpenRouter server.
+
+Usage: python bench_llm_phase.py [--events 50 200 1000] [--latency 0.2] [--rate-429 0.05]
+                                 [--malformed-rate 0.05] [--reasoning-mandatory]
+                                 [--trailing-seconds 1.0] [--stream]
+
+Each size builds a fresh analyzer (in a throwaway HOME and output directory, so no
+caches are shared between sizes), points it at the mock server and times
+build_candidate_snapshot(). Analyzer settings come from the usual OPENROUTER_* and
+BNTI_* environment variables. Reported per size: wall time, calls made, 429s,
+bisections and salvage re-queries triggered, and estimated prompt tokens sent.
+"""
+
+import argparse
+import logging
+import os
+import random
+import tempfile
+import time
+from datetime import datetime, timedelta
+from unittest import mock
+
+import borderneighboursthreatindex as analyzer_module
+from mock_openrouter_server import BORDER_COUNTRIES, MockOpenRouter
+
+DEFAULT_EVENT_COUNTS = (50, 200, 1000)
+BENCH_ENVIRONMENT = {
+    "OPENROUTER_API_KEY": "bench-primary-key",
+    "OPENROUTER_API_KEY_BACKUP": "bench-backup-key",
+    "OPENROUTER_REQUESTS_PER_MINUTE": "6000",
+    "BNTI_ATTRIBUTION_CACHE": "0",
+}
+HEADLINE_TEMPLATES = (
+    "{country} reports drone strike near border post {idx}",
+    "{country} parliament debates budget amendment {idx}",
+    "Talks between {country} and EU on trade corridor enter round {idx}",
+    "Regional markets steady as {country} currency recovers, day {idx}",
+    "Lebanon ceasefire monitors file report {idx}",
+)
+
+
+class LogCounter(logging.Handler):
+    """Count the analyzer's bisection and salvage warnings."""
+
+    def __init__(self):
+        super().__init__(logging.WARNING)
+        self.bisections = 0
+        self.salvage_requeries = 0
+
+    def emit(self, record):
+        message = record.getMessage()
+        if "retrying in smaller chunks" in message:
+            self.bisections += 1
+        elif "re-querying" in message:
+            self.salvage_requeries += 1
+
+
+def build_country_candidates(event_count, seed=7):
+    rng = random.Random(seed)
+    published = (datetime.utcnow() - timedelta(days=1)).replace(microsecond=0).isoformat()
+    candidates = {country: [] for country in BORDER_COUNTRIES}
+    for idx in range(event_count):
+        source_country = BORDER_COUNTRIES[idx % len(BORDER_COUNTRIES)]
+        title = rng.choice(HEADLINE_TEMPLATES).format(country=rng.choice(BORDER_COUNTRIES), idx=idx)
+        candidates[source_country].append({
+            "title": title,
+            "translated_title": title,
+            "link": f"https://bench.example/{idx}",
+            "date": published,
+        })
+    return candidates
+
+
+def build_analyzer(server_url, workdir):
+    environment = dict(BENCH_ENVIRONMENT)
+    environment.update({key: value for key, value in os.environ.items() if key in BENCH_ENVIRONMENT})
+    environment["HOME"] = workdir
+    environment["OPENROUTER_BASE_URL"] = server_url
+    with mock.patch.dict(os.environ, environment):
+        analyzer = analyzer_module.BNTIAnalyzer()
+    analyzer.output_path = workdir
+    analyzer.history_file = os.path.join(workdir, "bnti_history.csv")
+    return analyzer
+
+
+def run_benchmark(event_count, server, seed=7):
+    """Time build_candidate_snapshot() for event_count synthetic headlines."""
+    before = server.snapshot()
+    counter = LogCounter()
+    analyzer_logger = analyzer_module.logger
+    saved_level, saved_propagate = analyzer_logger.level, analyzer_logger.propagate
+    analyzer_logger.addHandler(counter)
+    analyzer_logger.setLevel(logging.WARNING)
+    analyzer_logger.propagate = False
+    try:
+        with tempfile.TemporaryDirectory() as workdir:
+            analyzer = build_analyzer(server.url, workdir)
+            country_candidates = build_country_candidates(event_count, seed=seed)
+            started = time.perf_counter()
+            candidate = analyzer.build_candidate_snapshot(country_candidates)
+            elapsed = time.perf_counter() - started
+            analyzer._shutdown_feed_parse_pool()
+    finally:
+        analyzer_logger.removeHandler(counter)
+        analyzer_logger.setLevel(saved_level)
+        analyzer_logger.propagate = saved_propagate
+
+    after = server.snapshot()
+    return {
+        "events": event_count,
+        "seconds": round(elapsed, 3),
+        "publishable": bool(candidate.get("publishable")),
+        "reason": candidate.get("reason"),
+        "calls": after["requests"] - before["requests"],
+        "rate_limited": after["rate_limited"] - before["rate_limited"],
+        "malformed": after["malformed"] - before["malformed"],
+        "bisections": counter.bisections,
+        "salvage_requeries": counter.salvage_requeries,
+        "prompt_tokens": after["prompt_tokens"] - before["prompt_tokens"],
+    }
+
+
+def main():
+    arg_parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    arg_parser.add_argument("--events", type=int, nargs="+", default=list(DEFAULT_EVENT_COUNTS))
+    arg_parser.add_argument("--latency", type=float, default=0.2)
+    arg_parser.add_argument("--latency-per-item", type=float, default=0.02)
+    arg_parser.add_argument("--rate-429", type=float, default=0.05)
+    arg_parser.add_argument("--malformed-rate", type=float, default=0.05)
+    arg_parser.add_argument("--retry-after", type=int, default=1)
+    arg_parser.add_argument("--reasoning-mandatory", action="store_true")
+    arg_parser.add_argument("--trailing-seconds", type=float, default=0.0)
+    arg_parser.add_argument("--stream", action="store_true", help="Run the analyzer with OPENROUTER_STREAM=1")
+    arg_parser.add_argument("--seed", type=int, default=7)
+    args = arg_parser.parse_args()
+    if args.stream:
+        os.environ["OPENROUTER_STREAM"] = "1"
+
+    server = MockOpenRouter(
+        latency=args.latency,
+        latency_per_item=args.latency_per_item,
+        trailing_seconds=args.trailing_seconds,
+        rate_429=args.rate_429,
+        malformed_rate=args.malformed_rate,
+        reasoning_mandatory=args.reasoning_mandatory,
+        retry_after=args.retry_after,
+        seed=args.seed,
+        token_estimator=object.__new__(analyzer_module.BNTIAnalyzer)._estimate_tokens,
+    ).start()
+    print(f"Mock OpenRouter at {server.url}")
+    print(f"{'events':>7} {'wall s':>8} {'calls':>6} {'429s':>5} {'bad':>4} {'bisect':>7} {'salvage':>8} {'tokens':>9}  result")
+    try:
+        for event_count in args.events:
+            result = run_benchmark(event_count, server, seed=args.seed)
+            outcome = "publishable" if result["publishable"] else result["reason"]
+            print(
+                f"{result['events']:>7} {result['seconds']:>8.2f} {result['calls']:>6} {result['rate_limited']:>5} "
+                f"{result['malformed']:>4} {result['bisections']:>7} {result['salvage_requeries']:>8} "
+                f"{result['prompt_tokens']:>9}  {outcome}"
+            )
+    finally:
+        server.stop()
+
+
+if __name__ == "__main__":
+    main()
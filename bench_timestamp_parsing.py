@@ -0,0 +1,78 @@
+"""Micro-benchmark: bnti_timestamps.parse_timestamp vs the old dateutil call.
+
+Usage: python bench_timestamp_parsing.py [--rounds N]
+"""
+import argparse
+import random
+import time
+import warnings
+from datetime import datetime, timedelta
+
+from dateutil import parser as date_parser
+
+import bnti_timestamps
+
+
+def build_corpus(size, unique):
+    base = datetime(2026, 3, 28, 6, 0, 0)
+    formats = [
+        lambda dt: dt.strftime("%a, %d %b %Y %H:%M:%S GMT"),
+        lambda dt: dt.strftime("%a, %d %b %Y %H:%M:%S +0300"),
+        lambda dt: dt.strftime("%Y-%m-%dT%H:%M:%SZ"),
+        lambda dt: dt.strftime("%Y-%m-%d %H:%M:%S.%f"),
+        lambda dt: dt.strftime("%B %d, %Y %I:%M %p"),
+    ]
+    rng = random.Random(7)
+    pool = [
+        formats[idx % len(formats)](base - timedelta(minutes=rng.randint(0, 60 * 24 * 7)))
+        for idx in range(unique)
+    ]
+    return [pool[rng.randrange(unique)] for _ in range(size)]
+
+
+def legacy_parse(value):
+    try:
+        return date_parser.parse(str(value)).replace(tzinfo=None)
+    except Exception:
+        return None
+
+
+def timed(label, func, corpus, rounds):
+    best = None
+    for _ in range(rounds):
+        bnti_timestamps._parse_timestamp_text.cache_clear()
+        start = time.perf_counter()
+        for value in corpus:
+            func(value)
+        elapsed = time.perf_counter() - start
+        best = elapsed if best is None else min(best, elapsed)
+    print(f"{label:<28} {best * 1000:9.2f} ms  ({best / len(corpus) * 1e6:6.2f} us/value)")
+    return best
+
+
+def main():
+    arg_parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    arg_parser.add_argument("--rounds", type=int, default=5)
+    arg_parser.add_argument("--size", type=int, default=20000)
+    arg_parser.add_argument("--unique", type=int, default=2000)
+    args = arg_parser.parse_args()
+
+    corpus = build_corpus(args.size, args.unique)
+    mismatches = [value for value in set(corpus) if legacy_parse(value) != bnti_timestamps.parse_timestamp(value)]
+    print(f"{len(corpus)} values, {len(set(corpus))} unique, {len(mismatches)} mismatches vs dateutil")
+
+    legacy = timed("dateutil (legacy)", legacy_parse, corpus, args.rounds)
+    uncached = timed(
+        "fast paths, no cache",
+        lambda value: bnti_timestamps.parse_rfc822(value) or bnti_timestamps.parse_iso(value) or legacy_parse(value),
+        corpus,
+        args.rounds,
+    )
+    cached = timed("parse_timestamp (LRU)", bnti_timestamps.parse_timestamp, corpus, args.rounds)
+    print(f"speedup: {legacy / uncached:.1f}x without cache, {legacy / cached:.1f}x with cache")
+
+
+if __name__ == "__main__":
+    with warnings.catch_warnings():
+        warnings.simplefilter("ignore")
+        main()
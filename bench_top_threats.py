@@ -0,0 +1,99 @@
+"""Micro-benchmark: translate_top_threats() heap selection vs the old enrich-and-sort pass.
+
+Usage: python bench_top_threats.py [--per-country 15 150 1500 15000] [--rounds N]
+
+Translation itself is stubbed out (passthrough backend) and the language cache is
+cleared before each round, so the timings cover enrichment, country tagging and
+top-K selection from cold. Per-event cost should stay flat as the number of events
+per country grows.
+"""
+import argparse
+import copy
+import gc
+import random
+import time
+
+import bnti_language
+import bnti_translation
+import borderneighboursthreatindex as analyzer_module
+
+DEFAULT_PER_COUNTRY = (15, 150, 1500, 15000)
+TITLES = (
+    "Iran talks resume in Vienna",
+    "Ελβετία: Δεκάδες νεκροί και εκατό τραυματίες",
+    "Кървава новогодишна нощ: 24 убити",
+    "تأثير الفساد على الانتخابات في العراق",
+    "Başkent Şam’da yeni yıl kutlamaları",
+)
+
+
+def build_dashboard(per_country, seed=7):
+    rng = random.Random(seed)
+    countries = {}
+    for country in analyzer_module.BNTIAnalyzer.BORDER_COUNTRIES:
+        countries[country] = {"events": [
+            {"title": f"{rng.choice(TITLES)} {country} {idx}", "weight": round(rng.uniform(-2, 8), 2), "confidence": 0.9}
+            for idx in range(per_country)
+        ]}
+    return {"countries": countries}
+
+
+def build_analyzer():
+    analyzer = object.__new__(analyzer_module.BNTIAnalyzer)
+    analyzer.openrouter_model = "openrouter/free"
+    analyzer.translation_backend = bnti_translation.PassthroughBackend()
+    return analyzer
+
+
+def legacy_translate_top_threats(analyzer, dashboard_data):
+    all_events = []
+    for c in dashboard_data["countries"]:
+        analyzer.detect_and_enrich_metadata(dashboard_data["countries"][c]["events"])
+        for e in dashboard_data["countries"][c]["events"]:
+            e["country"] = c
+            all_events.append(e)
+    top_list = sorted(all_events, key=lambda x: x['weight'], reverse=True)[:15]
+    analyzer._ensure_translated_titles(top_list)
+    return top_list
+
+
+def timed(func, dashboard, rounds):
+    best = None
+    for _ in range(rounds):
+        data = copy.deepcopy(dashboard)
+        bnti_language._detect_language_text.cache_clear()
+        gc.collect()
+        gc.disable()
+        try:
+            start = time.perf_counter()
+            top_list = func(data)
+            elapsed = time.perf_counter() - start
+        finally:
+            gc.enable()
+        best = elapsed if best is None else min(best, elapsed)
+    return best, top_list
+
+
+def main():
+    arg_parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    arg_parser.add_argument("--per-country", type=int, nargs="+", default=list(DEFAULT_PER_COUNTRY))
+    arg_parser.add_argument("--rounds", type=int, default=3)
+    args = arg_parser.parse_args()
+
+    analyzer = build_analyzer()
+    analyzer_module.logger.disabled = True
+    print(f"{'events':>8} {'legacy ms':>10} {'heap ms':>9} {'legacy us/ev':>13} {'heap us/ev':>11}  same top")
+    for per_country in args.per_country:
+        dashboard = build_dashboard(per_country)
+        event_count = per_country * len(dashboard["countries"])
+        legacy, legacy_top = timed(lambda data: legacy_translate_top_threats(analyzer, data), dashboard, args.rounds)
+        heap, heap_top = timed(analyzer.translate_top_threats, dashboard, args.rounds)
+        same = [event["title"] for event in legacy_top] == [event["title"] for event in heap_top]
+        print(
+            f"{event_count:>8} {legacy * 1000:>10.2f} {heap * 1000:>9.2f} "
+            f"{legacy / event_count * 1e6:>13.2f} {heap / event_count * 1e6:>11.2f}  {same}"
+        )
+
+
+if __name__ == "__main__":
+    main()
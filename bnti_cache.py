@@ -0,0 +1,94 @@
+"""TTL + LRU JSON record cache behind the attribution and translation caches.
+
+RecordCache keeps {key: {<field>: value, "stored_at": ..., "used_at": ...}} in an
+OrderedDict in least-recently-used order. Records older than the TTL are dropped on
+load and on lookup, the oldest ones are evicted past max_entries, and save() writes
+the whole cache atomically. Rows with the wrong payload type or timestamps that are
+not numbers (a hand-edited or truncated file) are skipped on load, not raised.
+"""
+import json
+import os
+import threading
+import time
+from collections import OrderedDict
+
+
+def write_text_atomic(path, payload):
+    os.makedirs(os.path.dirname(path), exist_ok=True)
+    tmp_path = f"{path}.tmp"
+    with open(tmp_path, "w", encoding="utf-8") as handle:
+        handle.write(payload)
+    os.replace(tmp_path, path)
+
+
+def _timestamp(value):
+    try:
+        return float(value)
+    except (TypeError, ValueError):
+        return None
+
+
+class RecordCache:
+    def __init__(self, path, field, value_type, ttl_seconds, max_entries):
+        self.path = path
+        self.field = field
+        self.value_type = value_type
+        self.ttl_seconds = ttl_seconds
+        self.max_entries = max(int(max_entries), 1)
+        self.lock = threading.Lock()
+        self.records = OrderedDict()
+
+    def load(self):
+        """Read the file if there is one; an unreadable file raises and leaves the cache empty."""
+        if not self.path or not os.path.exists(self.path):
+            return self
+        with open(self.path, "r", encoding="utf-8") as handle:
+            data = json.load(handle)
+        if not isinstance(data, dict):
+            return self
+
+        now = time.time()
+        records = []
+        for key, record in data.items():
+            if not isinstance(record, dict) or not isinstance(record.get(self.field), self.value_type):
+                continue
+            stored_at = _timestamp(record.get("stored_at", 0))
+            used_at = _timestamp(record.get("used_at", 0))
+            if stored_at is None or used_at is None or now - stored_at > self.ttl_seconds:
+                continue
+            records.append((used_at, key, {self.field: record[self.field], "stored_at": stored_at, "used_at": used_at}))
+        records.sort(key=lambda item: item[0])
+        with self.lock:
+            self.records = OrderedDict((key, record) for _, key, record in records[-self.max_entries:])
+        return self
+
+    def get_many(self, keys):
+        """Return {key: value} for the keys still fresh, refreshing their LRU position."""
+        now = time.time()
+        found = {}
+        with self.lock:
+            for key in keys:
+                record = self.records.get(key)
+                if record is None:
+                    continue
+                if now - record["stored_at"] > self.ttl_seconds:
+                    del self.records[key]
+                    continue
+                record["used_at"] = now
+                self.records.move_to_end(key)
+                found[key] = record[self.field]
+        return found
+
+    def put_many(self, items):
+        now = time.time()
+        with self.lock:
+            for key, value in items:
+                self.records[key] = {self.field: value, "stored_at": now, "used_at": now}
+                self.records.move_to_end(key)
+            while len(self.records) > self.max_entries:
+                self.records.popitem(last=False)
+
+    def save(self):
+        with self.lock:
+            payload = json.dumps(self.records, ensure_ascii=True, separators=(",", ":"))
+        write_text_atomic(self.path, payload)
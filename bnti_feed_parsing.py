@@ -0,0 +1,99 @@
+"""Feed parsing helpers that can run outside the analyzer process.
+
+Everything here is module-level and picklable so BNTIAnalyzer can hand raw feed
+bytes to a process pool and get back compact (title, link, published) tuples.
+"""
+from datetime import datetime, timedelta
+
+import feedparser
+
+from bnti_timestamps import parse_timestamp
+
+RECENT_ENTRY_DAYS = 2
+FALLBACK_ENTRY_LIMIT = 5
+SORTED_FEED_MIN_PREFIX = 2
+
+
+def entry_field(entry, name):
+    return entry.get(name) if hasattr(entry, "get") else getattr(entry, name, None)
+
+
+def select_recent_entries(entries, now=None, assume_sorted=True):
+    """Return entries from the last RECENT_ENTRY_DAYS, else the first FALLBACK_ENTRY_LIMIT valid ones.
+
+    Most feeds are newest-first. With assume_sorted, once every dated entry so far
+    has been in descending order (and none was undated), the first entry older than
+    the cutoff ends the scan: nothing after it can be recent.
+    """
+    if not entries:
+        return []
+
+    cutoff = (now or datetime.now()) - timedelta(days=RECENT_ENTRY_DAYS)
+    recent_entries = []
+    fallback = []
+    in_order = True
+    previous_date = None
+    dated_count = 0
+    for entry in entries:
+        link = entry_field(entry, "link")
+        title = entry_field(entry, "title")
+        if not link or not title:
+            continue
+        if len(fallback) < FALLBACK_ENTRY_LIMIT:
+            fallback.append(entry)
+
+        published_date_str = entry_field(entry, "published")
+        if not published_date_str:
+            in_order = False
+            recent_entries.append(entry)
+            continue
+
+        published_date = parse_timestamp(published_date_str)
+        if published_date is None:
+            continue
+        if previous_date is not None and published_date > previous_date:
+            in_order = False
+        previous_date = published_date
+        dated_count += 1
+
+        if published_date >= cutoff:
+            recent_entries.append(entry)
+        elif (
+            assume_sorted
+            and in_order
+            and dated_count > SORTED_FEED_MIN_PREFIX
+            and (recent_entries or len(fallback) >= FALLBACK_ENTRY_LIMIT)
+        ):
+            break
+
+    return recent_entries or fallback
+
+
+def entries_to_rows(entries):
+    rows = []
+    for entry in entries:
+        published = entry_field(entry, "published")
+        rows.append((
+            str(entry_field(entry, "title")),
+            str(entry_field(entry, "link")),
+            str(published) if published else None,
+        ))
+    return rows
+
+
+def rows_to_entries(rows):
+    entries = []
+    for title, link, published in rows:
+        entry = feedparser.FeedParserDict()
+        entry["title"] = title
+        entry["link"] = link
+        if published:
+            entry["published"] = published
+        entries.append(entry)
+    return entries
+
+
+def parse_feed_content(content):
+    """Parse raw feed bytes and return the recent entries as (title, link, published) tuples."""
+    feed = feedparser.parse(content)
+    return entries_to_rows(select_recent_entries(feed.entries if hasattr(feed, "entries") else []))
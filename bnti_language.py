@@ -0,0 +1,146 @@
+"""Offline headline language detection from Unicode script blocks.
+
+detect_language() counts the letters of each script in one pass and labels the
+dominant one: Greek "el", Armenian "hy", Georgian "ka", Cyrillic "bg" (or "ru"
+when Russian-only letters appear), Arabic script "ar" (or "fa" / "ckb" when
+Persian or Sorani Kurdish letters appear). A non-Latin script wins once it holds a
+fifth of the letters, so brand names do not make a Greek title English. Latin
+titles are "az" with an Azerbaijani schwa, "tr" with a Turkish-only letter, and
+"local" (the label the dashboard shows for any language it cannot name) with any
+other accented letter outside the loanword whitelist below. They stay "en" when
+their only accents are a stray whitelisted one, such as the é in "café", so a
+curly quote or an accented name does not send an English headline to the
+translator. Results are memoized per title.
+"""
+from bisect import bisect_right
+from collections import Counter
+from functools import lru_cache
+
+LANGUAGE_CACHE_SIZE = 8192
+# A Latin title stays "en" with at most this many, or this share of, whitelisted accented letters
+ENGLISH_MAX_ACCENTED_LETTERS = 1
+ENGLISH_MAX_ACCENTED_SHARE = 0.05
+NON_LATIN_MIN_SHARE = 0.2
+TURKISH_MIN_MARKERS = 1
+# Accents English headlines borrow for names and loanwords; any other Latin letter
+# (ç, ê, ö, ü, ...) belongs to a local language such as Turkish or Kurmanji
+ENGLISH_LOANWORD_ACCENTS = frozenset("áàâãéèëíïóôúñÁÀÂÃÉÈËÍÏÓÔÚÑ")
+# Shown as the "LOCAL" source badge in js/stream.js
+UNKNOWN_LANGUAGE = "local"
+
+SCRIPT_RANGES = (
+    (0x00C0, 0x024F, "latin"),
+    (0x0250, 0x02AF, "latin"),  # IPA extensions, including the Azerbaijani schwa ə
+    (0x0370, 0x03FF, "greek"),
+    (0x0400, 0x052F, "cyrillic"),
+    (0x0530, 0x058F, "armenian"),
+    (0x0600, 0x06FF, "arabic"),
+    (0x0750, 0x077F, "arabic"),
+    (0x10A0, 0x10FF, "georgian"),
+    (0x1C90, 0x1CBF, "georgian"),
+    (0x1E00, 0x1EFF, "latin"),
+    (0x1F00, 0x1FFF, "greek"),
+    (0xFB50, 0xFDFF, "arabic"),
+    (0xFE70, 0xFEFF, "arabic"),
+)
+_RANGE_STARTS = [start for start, _, _ in SCRIPT_RANGES]
+
+# Letters that single out one language within a script
+MARKER_LETTERS = {
+    **dict.fromkeys("ڕڵۆێە", "ckb"),
+    **dict.fromkeys("پچژگکی", "fa"),
+    **dict.fromkeys("ğĞıİşŞ", "tr"),
+    **dict.fromkeys("əƏ", "az"),
+    **dict.fromkeys("ыЫэЭёЁ", "ru"),
+}
+
+SCRIPT_LANGUAGES = {
+    "greek": "el",
+    "armenian": "hy",
+    "georgian": "ka",
+}
+
+
+def script_of(char):
+    code = ord(char)
+    position = bisect_right(_RANGE_STARTS, code) - 1
+    if position >= 0:
+        start, end, script = SCRIPT_RANGES[position]
+        if code <= end:
+            return script
+    return "other"
+
+
+def _char_class(char):
+    """(script, marker language) for a letter, else None."""
+    if not char.isalpha():
+        return None
+    if char.isascii():
+        return "ascii", None
+    script = script_of(char)
+    marker = MARKER_LETTERS.get(char)
+    if marker is None and script == "latin" and char not in ENGLISH_LOANWORD_ACCENTS:
+        marker = UNKNOWN_LANGUAGE
+    return script, marker
+
+
+_CHAR_CLASSES = {}
+
+
+@lru_cache(maxsize=LANGUAGE_CACHE_SIZE)
+def _detect_language_text(text):
+    if text.isascii():
+        return "en"
+    counts = {}
+    accented = 0
+    markers = {}
+    # Counter does the per-character pass in C; only distinct characters are classified
+    for char, occurrences in Counter(text).items():
+        char_class = _CHAR_CLASSES.get(char, False)
+        if char_class is False:
+            char_class = _CHAR_CLASSES[char] = _char_class(char)
+        if char_class is None:
+            continue
+        script, marker = char_class
+        counts[script] = counts.get(script, 0) + occurrences
+        if script == "latin":
+            accented += occurrences
+        if marker:
+            markers[marker] = markers.get(marker, 0) + occurrences
+
+    latin_letters = counts.pop("ascii", 0) + counts.get("latin", 0)
+    if latin_letters:
+        counts["latin"] = latin_letters
+    if not counts:
+        return "en"
+
+    script = max(counts, key=counts.get)
+    if script == "latin":
+        others = {name: count for name, count in counts.items() if name != "latin"}
+        if others and max(others.values()) >= NON_LATIN_MIN_SHARE * sum(counts.values()):
+            script = max(others, key=others.get)
+    if script == "latin":
+        if "az" in markers:
+            return "az"
+        if markers.get("tr", 0) >= TURKISH_MIN_MARKERS:
+            return "tr"
+        if UNKNOWN_LANGUAGE in markers:
+            return UNKNOWN_LANGUAGE
+        if accented <= ENGLISH_MAX_ACCENTED_LETTERS or accented <= ENGLISH_MAX_ACCENTED_SHARE * latin_letters:
+            return "en"
+        return UNKNOWN_LANGUAGE
+    if script == "cyrillic":
+        return "ru" if "ru" in markers else "bg"
+    if script == "arabic":
+        for language in ("ckb", "fa"):
+            if language in markers:
+                return language
+        return "ar"
+    return SCRIPT_LANGUAGES.get(script, UNKNOWN_LANGUAGE)
+
+
+def detect_language(text):
+    """Return a language code for a headline; titles without letters count as "en"."""
+    if not text:
+        return "en"
+    return _detect_language_text(str(text))
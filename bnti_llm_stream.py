@@ -0,0 +1,125 @@
+"""Incremental reading of streamed (SSE) chat completions.
+
+iter_response_lines() and iter_sse_content() turn an OpenRouter streaming
+response into content deltas as they arrive; JsonArrayItemParser picks complete
+top-level objects out of a JSON array as its text arrives, so a caller can stop
+reading once every item it asked for has been seen.
+"""
+import json
+
+
+class StreamError(Exception):
+    """The provider reported an error inside the event stream."""
+
+
+def iter_response_lines(response, chunk_size=8192):
+    """Yield raw lines as soon as they arrive.
+
+    requests' iter_lines() blocks until a whole chunk is buffered, which would hide
+    the early deltas; urllib3's read1() returns whatever the socket has.
+    """
+    read1 = getattr(response.raw, "read1", None)
+    if read1 is None:
+        yield from response.iter_lines(chunk_size=1)
+        return
+    pending = b""
+    while True:
+        data = read1(chunk_size, decode_content=True)
+        if not data:
+            break
+        pending += data
+        *lines, pending = pending.split(b"\n")
+        yield from lines
+    if pending:
+        yield pending
+
+
+def iter_sse_content(lines):
+    for raw_line in lines:
+        line = raw_line.decode("utf-8", "replace") if isinstance(raw_line, bytes) else raw_line
+        line = line.strip()
+        if not line.startswith("data:"):
+            continue
+        data = line[5:].strip()
+        if data == "[DONE]":
+            return
+        try:
+            chunk = json.loads(data)
+        except ValueError:
+            continue
+        if chunk.get("error"):
+            raise StreamError(str(chunk["error"].get("message", chunk["error"])))
+        for choice in chunk.get("choices") or []:
+            content = (choice.get("delta") or {}).get("content")
+            if content:
+                yield content
+
+
+class JsonArrayItemParser:
+    """Feed text chunks; get back each top-level array item as soon as it closes.
+
+    Items that are not strict JSON are counted in skipped and left for the full-text
+    parser. closed is set once the outer array ends, and array_text then holds it.
+    """
+
+    def __init__(self):
+        self.array_start = None
+        self.array_text = None
+        self.closed = False
+        self.items = []
+        self.skipped = 0
+        self._buffer = ""
+        self._depth = 0
+        self._in_string = False
+        self._escaped = False
+        self._item_start = None
+
+    def feed(self, chunk):
+        new_items = []
+        if self.closed:
+            return new_items
+        offset = len(self._buffer)
+        self._buffer += chunk
+        for position in range(offset, len(self._buffer)):
+            char = self._buffer[position]
+            if self._in_string:
+                if self._escaped:
+                    self._escaped = False
+                elif char == "\\":
+                    self._escaped = True
+                elif char == '"':
+                    self._in_string = False
+                continue
+            if self.array_start is None:
+                if char == "[":
+                    self.array_start = position
+                    self._depth = 1
+                continue
+            if char == '"':
+                self._in_string = True
+            elif char in "[{":
+                if self._depth == 1:
+                    self._item_start = position
+                self._depth += 1
+            elif char in "]}":
+                self._depth -= 1
+                if self._depth == 1 and self._item_start is not None:
+                    try:
+                        item = json.loads(self._buffer[self._item_start:position + 1])
+                    except ValueError:
+                        item = None
+                    if item is None:
+                        self.skipped += 1
+                    else:
+                        self.items.append(item)
+                        new_items.append(item)
+                    self._item_start = None
+                elif self._depth == 0:
+                    self.closed = True
+                    self.array_text = self._buffer[self.array_start:position + 1]
+                    break
+        return new_items
+
+    @property
+    def text(self):
+        return self._buffer
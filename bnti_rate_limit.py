@@ -0,0 +1,39 @@
+"""Thread-safe token bucket shared by the OpenRouter and translation request paths.
+
+acquire() blocks until a token is available; the bucket refills at rate_per_second
+up to burst tokens. A rate of zero or less turns pacing off.
+"""
+import threading
+import time
+
+
+class TokenBucket:
+    def __init__(self, rate_per_second, burst=1.0):
+        self.rate_per_second = rate_per_second
+        self.burst = float(max(burst, 1))
+        self.tokens = self.burst
+        self.updated_at = time.monotonic()
+        self.lock = threading.Lock()
+
+    def _refill_locked(self, now):
+        elapsed = now - self.updated_at
+        self.tokens = min(self.burst, self.tokens + elapsed * max(self.rate_per_second, 0.0))
+        self.updated_at = now
+
+    def acquire(self):
+        while True:
+            with self.lock:
+                if self.rate_per_second <= 0:
+                    return
+                self._refill_locked(time.monotonic())
+                if self.tokens >= 1:
+                    self.tokens -= 1
+                    return
+                wait = (1 - self.tokens) / self.rate_per_second
+            time.sleep(wait)
+
+    def set_rate(self, rate_per_second):
+        """Change the refill rate; tokens earned at the old rate are kept."""
+        with self.lock:
+            self._refill_locked(time.monotonic())
+            self.rate_per_second = rate_per_second
@@ -0,0 +1,72 @@
+"""Timestamp parsing shared by feed extraction, the feed cache and history handling.
+
+parse_timestamp() returns the same naive wall-clock datetime as
+dateutil.parser.parse(value).replace(tzinfo=None): any zone or offset is dropped,
+not applied. RFC 822 pubDates and ISO 8601 strings are handled by strict fast
+paths; anything else goes to dateutil. Results are memoized per string.
+"""
+import re
+from datetime import datetime
+from functools import lru_cache
+
+from dateutil import parser as date_parser
+
+TIMESTAMP_CACHE_SIZE = 8192
+
+MONTHS = {
+    "jan": 1, "feb": 2, "mar": 3, "apr": 4, "may": 5, "jun": 6,
+    "jul": 7, "aug": 8, "sep": 9, "oct": 10, "nov": 11, "dec": 12,
+}
+
+RFC822_PATTERN = re.compile(
+    r"^(?:(?:mon|tue|wed|thu|fri|sat|sun)(?:,\s*|\s+))?"
+    r"(\d{1,2})\s+(jan|feb|mar|apr|may|jun|jul|aug|sep|oct|nov|dec)\s+(\d{4})\s+"
+    r"(\d{1,2}):(\d{2})(?::(\d{2}))?"
+    r"(?:\s*(?:[+-]\d{4}|gmt|utc|ut|z|[a-z]{3,4}))?$",
+    re.IGNORECASE,
+)
+
+ISO_PATTERN = re.compile(
+    r"^\d{4}-\d{2}-\d{2}"
+    r"(?:[T ]\d{2}:\d{2}(?::\d{2}(?:\.\d{1,6})?)?)?"
+    r"(?:Z|[+-]\d{2}:?\d{2})?$"
+)
+
+
+def parse_rfc822(text):
+    match = RFC822_PATTERN.match(text)
+    if not match:
+        return None
+    day, month, year, hour, minute, second = match.groups()
+    try:
+        return datetime(int(year), MONTHS[month.lower()], int(day), int(hour), int(minute), int(second or 0))
+    except ValueError:
+        return None
+
+
+def parse_iso(text):
+    if not ISO_PATTERN.match(text):
+        return None
+    try:
+        return datetime.fromisoformat(text).replace(tzinfo=None)
+    except ValueError:
+        return None
+
+
+@lru_cache(maxsize=TIMESTAMP_CACHE_SIZE)
+def _parse_timestamp_text(text):
+    stripped = text.strip()
+    parsed = parse_rfc822(stripped) or parse_iso(stripped)
+    if parsed is not None:
+        return parsed
+    try:
+        return date_parser.parse(stripped).replace(tzinfo=None)
+    except Exception:
+        return None
+
+
+def parse_timestamp(value):
+    """Return a naive datetime for value, or None when it is empty or unparseable."""
+    if not value:
+        return None
+    return _parse_timestamp_text(str(value))
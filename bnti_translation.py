@@ -0,0 +1,80 @@
+"""Translation backends behind BNTIAnalyzer._ensure_translated_titles().
+
+A backend exposes translate(text, dest="en") and returns the English text, or None
+when it has no translation for the title; an exception counts as a failed call.
+remote backends are cached and paced by the analyzer's token bucket, local ones
+are not. Pick one with BNTI_TRANSLATION_BACKEND:
+
+- googletrans: the unofficial Google Translate client (default)
+- passthrough: translates nothing, titles are shown as published
+- dictionary: title -> English lookups from the JSON object in
+  BNTI_TRANSLATION_DICTIONARY, for offline tests and benchmarks
+
+googletrans is only imported when its backend is created, so the local backends
+work without it installed.
+"""
+import json
+import threading
+import time
+
+
+class GoogleTranslateBackend:
+    name = "googletrans"
+    engine = "Google Neural MT"
+    remote = True
+
+    def __init__(self):
+        from googletrans import Translator
+
+        self._translator_class = Translator
+        # A googletrans client wraps one HTTP session, so each worker thread gets its own
+        self._local = threading.local()
+
+    def translate(self, text, dest="en"):
+        translator = getattr(self._local, "translator", None)
+        if translator is None:
+            translator = self._local.translator = self._translator_class()
+        return translator.translate(text, dest=dest).text
+
+
+class PassthroughBackend:
+    name = "passthrough"
+    engine = None
+    remote = False
+
+    def translate(self, text, dest="en"):
+        return None
+
+
+class DictionaryBackend:
+    name = "dictionary"
+    engine = "Local dictionary"
+    remote = False
+
+    def __init__(self, translations=None, latency_seconds=0.0):
+        self.translations = dict(translations or {})
+        self.latency_seconds = latency_seconds
+
+    @classmethod
+    def from_file(cls, path, latency_seconds=0.0):
+        with open(path, "r", encoding="utf-8") as handle:
+            data = json.load(handle)
+        if not isinstance(data, dict):
+            raise ValueError(f"{path} must hold a JSON object of title -> translation")
+        return cls({str(title): str(text) for title, text in data.items()}, latency_seconds)
+
+    def translate(self, text, dest="en"):
+        if self.latency_seconds:
+            time.sleep(self.latency_seconds)
+        return self.translations.get(text)
+
+
+TRANSLATION_BACKENDS = {
+    backend.name: backend for backend in (GoogleTranslateBackend, PassthroughBackend, DictionaryBackend)
+}
+
+
+def create_backend(name, dictionary_path=None):
+    if name == "dictionary":
+        return DictionaryBackend.from_file(dictionary_path) if dictionary_path else DictionaryBackend()
+    return TRANSLATION_BACKENDS[name]()
@@ -1,20 +1,39 @@
 ﻿import feedparser
 from datetime import datetime, timedelta
-from dateutil import parser as date_parser
 import os
 import pandas as pd
 import concurrent.futures
+from concurrent.futures.process import BrokenProcessPool
 import time
 import logging
 import math
+import multiprocessing
+import pickle
 import json
 import ast
+import email.utils
+import asyncio
+import atexit
+import gzip
+import hashlib
+import heapq
 import socket
 import re
+import ssl
+import sqlite3
 import numpy as np
+import queue
 import threading
+import weakref
+from collections.abc import Mapping
 from urllib.parse import quote_plus, urlparse
-from googletrans import Translator
+import bnti_cache
+import bnti_feed_parsing
+from bnti_language import detect_language
+import bnti_llm_stream
+import bnti_rate_limit
+import bnti_translation
+from bnti_timestamps import parse_timestamp
 from urllib3.exceptions import InsecureRequestWarning
 
 # Configure logging
@@ -27,6 +46,17 @@ warnings.simplefilter("ignore", InsecureRequestWarning)
 # Set socket timeout to prevent hanging on bad feeds
 socket.setdefaulttimeout(10)
 
+# Analyzers with a write-behind feed cache; one exit hook flushes whichever are still alive
+_FEED_CACHE_WRITERS = weakref.WeakSet()
+
+
+def _flush_feed_cache_writers():
+    for analyzer in list(_FEED_CACHE_WRITERS):
+        analyzer._flush_feed_cache()
+
+
+atexit.register(_flush_feed_cache_writers)
+
 class BNTIAnalyzer:
     BORDER_COUNTRIES = ["Armenia", "Georgia", "Greece", "Iran", "Iraq", "Syria", "Bulgaria"]
     SOURCE_SUFFIX_HINTS = {
@@ -66,7 +96,57 @@ class BNTIAnalyzer:
     FEED_REQUEST_TIMEOUT_SECONDS = 8
     FEED_PROXY_TIMEOUT_SECONDS = 8
     FEED_MAX_USER_AGENT_ATTEMPTS = 2
+    FEED_MAX_WORKERS = 32
+    FEED_MAX_CONNECTIONS_PER_HOST = 4
+    FEED_ASYNC_MAX_IN_FLIGHT = 128
+    FETCH_ENGINES = ("threads", "async")
+    ATTRIBUTION_MODES = ("two_pass", "combined")
+    FEED_PARSE_MAX_WORKERS = 4
+    FEED_PARSE_POOL_ERRORS = (BrokenProcessPool, pickle.PicklingError)
+    HTTP_POOL_CONNECTIONS = 4
+    HTTP_POOL_MAXSIZE = 8
+    FEED_CACHE_BACKENDS = ("sqlite", "json")
+    FEED_CACHE_FLUSH_INTERVAL_SECONDS = 30
+    FEED_CACHE_UPSERT_SQL = (
+        "INSERT INTO feed_cache (url, fetched_at, etag, last_modified, entries) VALUES (?, ?, ?, ?, ?) "
+        "ON CONFLICT(url) DO UPDATE SET fetched_at = excluded.fetched_at, etag = excluded.etag, "
+        "last_modified = excluded.last_modified, entries = excluded.entries"
+    )
+    FEED_REQUEST_HEADERS = {
+        'Accept': 'text/html,application/xhtml+xml,application/xml;q=0.9,image/avif,image/webp,image/apng,*/*;q=0.8,application/signed-exchange;v=b3;q=0.7',
+        'Accept-Language': 'en-US,en;q=0.9',
+        'Cache-Control': 'no-cache',
+        'Pragma': 'no-cache',
+        'Upgrade-Insecure-Requests': '1',
+        'Sec-Fetch-Dest': 'document',
+        'Sec-Fetch-Mode': 'navigate',
+        'Sec-Fetch-Site': 'none',
+        'Sec-Fetch-User': '?1',
+        'Sec-Ch-Ua': '"Chromium";v="122", "Not(A:Brand";v="24", "Google Chrome";v="122"',
+        'Sec-Ch-Ua-Mobile': '?0',
+        'Sec-Ch-Ua-Platform': '"Linux"',
+        'Connection': 'keep-alive',
+        'Referer': 'https://www.google.com/'
+    }
     OPENROUTER_TIMEOUT_SECONDS = 45
+    OPENROUTER_MAX_IN_FLIGHT = 4
+    OPENROUTER_REQUESTS_PER_MINUTE = 20
+    OPENROUTER_MAX_RETRY_AFTER_SECONDS = 120
+    OPENROUTER_FAILURE_COOLDOWN_SECONDS = 3
+    OPENROUTER_KEY_RATE_LIMIT_WINDOW_SECONDS = 300
+    OPENROUTER_MIN_BATCH_SIZE = 2
+    OPENROUTER_MAX_BATCH_SIZE = 25
+    OPENROUTER_BATCH_GROW_STEP = 2
+    OPENROUTER_SLOW_CALL_RATIO = 0.5
+    LLM_TUNING_EWMA_ALPHA = 0.3
+    ATTRIBUTION_CACHE_TTL_HOURS = 72
+    ATTRIBUTION_CACHE_MAX_ENTRIES = 5000
+    ATTRIBUTION_RESULT_FIELDS = ("primary_country", "category", "subject", "final_country")
+    OPENROUTER_PROMPT_TOKEN_BUDGET = 3000
+    PROMPT_ASCII_CHARS_PER_TOKEN = 4
+    PROMPT_NON_ASCII_CHARS_PER_TOKEN = 1.5
+    PROMPT_HEADLINES_SLOT = "\0headlines\0"
+    PROMPT_TEMPLATE_PARTS = {}
     MIN_PUBLISHABLE_TOTAL_SIGNALS = 20
     MIN_PUBLISHABLE_ACTIVE_COUNTRIES = 3
     MIN_SIGNAL_COVERAGE_RATIO = 0.35
@@ -74,21 +154,74 @@ class BNTIAnalyzer:
     SUMMARY_WINDOW_HOURS = 6
     SUMMARY_REFRESH_INTERVAL_HOURS = 6
     SUMMARY_MAX_SOURCE_EVENTS = 12
+    TOP_THREATS_TO_TRANSLATE = 15
+    DASHBOARD_OUTPUT_FORMATS = ("pretty", "compact")
+    DASHBOARD_SIDECAR_SUFFIXES = {"gzip": "gz", "br": "br"}
+    DASHBOARD_JS_PREFIX = b"window.BNTI_DATA = "
+    TRANSLATION_MAX_WORKERS = 4
+    TRANSLATION_REQUESTS_PER_SECOND = 4.0
+    TRANSLATION_CACHE_TTL_HOURS = 24 * 30
+    TRANSLATION_CACHE_MAX_ENTRIES = 5000
+    TRANSLATION_BACKENDS = tuple(bnti_translation.TRANSLATION_BACKENDS)
+    TRANSLATION_BUDGET_SECONDS = 20
 
     def __init__(self):
         self.output_path = os.getcwd()
         self.history_file = os.path.join(self.output_path, "bnti_history.csv")
         self._init_cache()
+        self._init_attribution_cache()
+        self._reset_feed_fetch_results()
+        self._init_http_pool()
+        self._init_feed_parse_pool()
+        self.fetch_engine = os.environ.get("BNTI_FETCH_ENGINE", "threads").strip().lower()
+        if self.fetch_engine not in self.FETCH_ENGINES:
+            logger.warning(f"Unknown fetch engine '{self.fetch_engine}', using threads")
+            self.fetch_engine = "threads"
+        self.dashboard_output_format = os.environ.get("BNTI_OUTPUT_FORMAT", "pretty").strip().lower()
+        if self.dashboard_output_format not in self.DASHBOARD_OUTPUT_FORMATS:
+            logger.warning(f"Unknown output format '{self.dashboard_output_format}', using pretty")
+            self.dashboard_output_format = "pretty"
+        self.dashboard_sidecars = []
+        for encoding in os.environ.get("BNTI_OUTPUT_SIDECARS", "").split(","):
+            encoding = encoding.strip().lower()
+            if encoding in self.DASHBOARD_SIDECAR_SUFFIXES:
+                self.dashboard_sidecars.append(encoding)
+            elif encoding:
+                logger.warning(f"Unknown output sidecar '{encoding}', skipping")
         
         # TRANSLATOR (For Report Summaries Only)
-        self.translator = Translator()
+        self._init_translation_service()
 
         # OPENROUTER LLM (For Country Re-Attribution)
         self.openrouter_api_key = os.environ.get("OPENROUTER_API_KEY", "")
         self.openrouter_backup_api_key = os.environ.get("OPENROUTER_API_KEY_BACKUP", "")
+        self.openrouter_extra_api_keys = [
+            key.strip() for key in os.environ.get("OPENROUTER_API_KEYS", "").split(",") if key.strip()
+        ]
         self.openrouter_model = os.environ.get("OPENROUTER_MODEL", "openrouter/free")
-        self.openrouter_base_url = "https://openrouter.ai/api/v1/chat/completions"
+        self.openrouter_base_url = os.environ.get(
+            "OPENROUTER_BASE_URL", "https://openrouter.ai/api/v1/chat/completions"
+        )
         self.openrouter_batch_size = max(int(os.environ.get("OPENROUTER_BATCH_SIZE", "10")), 1)
+        self.openrouter_max_in_flight = max(
+            int(os.environ.get("OPENROUTER_MAX_IN_FLIGHT", str(self.OPENROUTER_MAX_IN_FLIGHT))), 1
+        )
+        self.openrouter_prompt_token_budget = max(
+            int(os.environ.get("OPENROUTER_PROMPT_TOKEN_BUDGET", str(self.OPENROUTER_PROMPT_TOKEN_BUDGET))), 0
+        )
+        self._init_openrouter_key_health()
+        self._init_openrouter_rate_limit()
+        self._init_llm_batch_tuning()
+        self.openrouter_salvage_mode = os.environ.get(
+            "OPENROUTER_SALVAGE", "1"
+        ).strip().lower() not in ("0", "false", "no", "off")
+        self.openrouter_streaming = os.environ.get(
+            "OPENROUTER_STREAM", "0"
+        ).strip().lower() in ("1", "true", "yes", "on")
+        self.attribution_mode = os.environ.get("OPENROUTER_ATTRIBUTION_MODE", "two_pass").strip().lower()
+        if self.attribution_mode not in self.ATTRIBUTION_MODES:
+            logger.warning(f"Unknown attribution mode '{self.attribution_mode}', using two_pass")
+            self.attribution_mode = "two_pass"
         self.border_countries = list(self.BORDER_COUNTRIES)
         self.category_weights = dict(self.LLM_CATEGORY_WEIGHTS)
 
@@ -255,23 +388,37 @@ class BNTIAnalyzer:
     def _init_cache(self):
         cache_root = os.path.join(os.path.expanduser("~"), ".cache", "bnti")
         self.cache_dir = cache_root
-        self.feed_cache_file = os.path.join(self.cache_dir, "feed_cache.json")
+        self.feed_cache_backend = os.environ.get("BNTI_FEED_CACHE_BACKEND", "sqlite").strip().lower()
+        if self.feed_cache_backend not in self.FEED_CACHE_BACKENDS:
+            logger.warning(f"Unknown feed cache backend '{self.feed_cache_backend}', using sqlite")
+            self.feed_cache_backend = "sqlite"
+        self.legacy_feed_cache_file = os.path.join(self.cache_dir, "feed_cache.json")
+        if self.feed_cache_backend == "sqlite":
+            self.feed_cache_file = os.path.join(self.cache_dir, "feed_cache.sqlite3")
+        else:
+            self.feed_cache_file = self.legacy_feed_cache_file
         self.cache_fresh_ttl_seconds = 60 * 30
         self.cache_stale_ttl_seconds = 60 * 60 * 48
         self.cache_lock = threading.Lock()
+        self.cache_local = threading.local()
         self.feed_cache = {}
+        self._init_feed_cache_writer()
         try:
             os.makedirs(self.cache_dir, exist_ok=True)
-            self.feed_cache = self._load_feed_cache()
+            if self.feed_cache_backend == "sqlite":
+                self._init_sqlite_cache()
+            else:
+                self.feed_cache = self._load_feed_cache()
         except Exception as e:
             logger.warning(f"Feed cache disabled: {e}")
             self.feed_cache_file = None
 
-    def _load_feed_cache(self):
-        if not self.feed_cache_file or not os.path.exists(self.feed_cache_file):
+    def _load_feed_cache(self, path=None):
+        path = path or self.feed_cache_file
+        if not path or not os.path.exists(path):
             return {}
         try:
-            with open(self.feed_cache_file, "r", encoding="utf-8") as handle:
+            with open(path, "r", encoding="utf-8") as handle:
                 data = json.load(handle)
             if isinstance(data, dict):
                 return data
@@ -279,30 +426,308 @@ class BNTIAnalyzer:
             logger.warning(f"Failed to load feed cache: {e}")
         return {}
 
-    def _save_feed_cache_locked(self):
+    def _save_feed_cache_locked(self, snapshot=None):
         if not self.feed_cache_file:
-            return
+            return 0
+        payload = json.dumps(
+            self.feed_cache if snapshot is None else snapshot,
+            ensure_ascii=True,
+            separators=(",", ":"),
+        )
         tmp_path = f"{self.feed_cache_file}.tmp"
         with open(tmp_path, "w", encoding="utf-8") as handle:
-            json.dump(self.feed_cache, handle, ensure_ascii=True, separators=(",", ":"))
+            handle.write(payload)
         os.replace(tmp_path, self.feed_cache_file)
+        return len(payload)
+
+    # Write-behind: fetch threads only mark records dirty; flushes batch them to disk
+    def _init_feed_cache_writer(self):
+        self.feed_cache_dirty = {}
+        self.feed_cache_flushing = {}
+        self.feed_cache_flush_lock = threading.Lock()
+        self.feed_cache_flush_timer = None
+        self.feed_cache_stats = {"flush_count": 0, "records_written": 0, "bytes_written": 0}
+        _FEED_CACHE_WRITERS.add(self)
+
+    def _schedule_feed_cache_flush_locked(self):
+        if self.feed_cache_flush_timer is not None:
+            return
+        timer = threading.Timer(self.FEED_CACHE_FLUSH_INTERVAL_SECONDS, self._flush_feed_cache)
+        timer.daemon = True
+        self.feed_cache_flush_timer = timer
+        timer.start()
+
+    def _flush_feed_cache(self):
+        """Write every dirty record in one batch: one atomic file replace or one SQLite transaction."""
+        with self.feed_cache_flush_lock:
+            with self.cache_lock:
+                timer = self.feed_cache_flush_timer
+                self.feed_cache_flush_timer = None
+                pending = self.feed_cache_dirty
+                if not pending:
+                    return 0
+                self.feed_cache_dirty = {}
+                if self._uses_sqlite_cache():
+                    self.feed_cache_flushing = pending
+                    snapshot = None
+                else:
+                    self.feed_cache.update(pending)
+                    snapshot = dict(self.feed_cache)
+            if timer is not None:
+                timer.cancel()
+
+            bytes_written = 0
+            try:
+                if not self.feed_cache_file:
+                    return 0
+                if snapshot is None:
+                    rows = [self._cache_row(url, payload) for url, payload in pending.items()]
+                    connection = self._cache_connection()
+                    with connection:
+                        connection.executemany(self.FEED_CACHE_UPSERT_SQL, rows)
+                    bytes_written = sum(len(value or "") for row in rows for value in row)
+                else:
+                    bytes_written = self._save_feed_cache_locked(snapshot)
+            except Exception as e:
+                logger.warning(f"Feed cache flush failed: {e}")
+                with self.cache_lock:
+                    # Keep the batch for the next flush; records marked dirty since then are newer
+                    for url, payload in pending.items():
+                        self.feed_cache_dirty.setdefault(url, payload)
+                return 0
+            finally:
+                with self.cache_lock:
+                    self.feed_cache_flushing = {}
+
+            self.feed_cache_stats["flush_count"] += 1
+            self.feed_cache_stats["records_written"] += len(pending)
+            self.feed_cache_stats["bytes_written"] += bytes_written
+            return bytes_written
+
+    # Headline attribution cache: final LLM verdicts keyed by model, prompt version and headline
+    def _init_attribution_cache(self):
+        self.attribution_cache = self._open_record_cache(
+            "attribution", "result", dict, self.ATTRIBUTION_CACHE_TTL_HOURS, self.ATTRIBUTION_CACHE_MAX_ENTRIES
+        )
+
+    def _save_attribution_cache(self):
+        self._save_record_cache(getattr(self, "attribution_cache", None), "attribution")
+
+    def _open_record_cache(self, name, field, value_type, default_ttl_hours, default_max_entries):
+        """The {name}_cache.json RecordCache tuned by BNTI_{NAME}_CACHE*, or None when that variable is off."""
+        prefix = f"BNTI_{name.upper()}_CACHE"
+        if os.environ.get(prefix, "1").strip().lower() in ("0", "false", "no", "off"):
+            return None
+        cache = bnti_cache.RecordCache(
+            os.path.join(self.cache_dir, f"{name}_cache.json"),
+            field,
+            value_type,
+            3600 * float(os.environ.get(f"{prefix}_TTL_HOURS", str(default_ttl_hours))),
+            int(os.environ.get(f"{prefix}_MAX_ENTRIES", str(default_max_entries))),
+        )
+        try:
+            cache.load()
+        except Exception as e:
+            logger.warning(f"Failed to load {name} cache: {e}")
+        return cache
+
+    def _save_record_cache(self, cache, name):
+        if cache is None:
+            return
+        try:
+            cache.save()
+        except Exception as e:
+            logger.warning(f"Failed to save {name} cache: {e}")
+
+    def _attribution_prompt_version(self):
+        """Hash of the active mode's prompt templates, so any prompt edit invalidates cached verdicts."""
+        versions = getattr(self, "attribution_prompt_versions", None)
+        if versions is None:
+            versions = self.attribution_prompt_versions = {}
+        mode = self._attribution_mode()
+        if mode not in versions:
+            if mode == "combined":
+                templates = self._build_combined_attribution_prompt([])
+            else:
+                templates = self._build_attribution_prompt([]) + "\0" + self._build_country_audit_prompt([], {})
+            versions[mode] = hashlib.sha256(templates.encode("utf-8")).hexdigest()[:16]
+        return versions[mode]
+
+    def _attribution_cache_key(self, event):
+        material = "\0".join([
+            str(getattr(self, "openrouter_model", "")),
+            self._attribution_prompt_version(),
+            self._format_headline_for_prompt(event),
+        ])
+        return hashlib.sha256(material.encode("utf-8")).hexdigest()
+
+    def _lookup_attribution_cache(self, all_events):
+        """Return ({idx: cached verdict}, [positions that still need the LLM])."""
+        cache = getattr(self, "attribution_cache", None)
+        if cache is None:
+            return {}, list(range(len(all_events)))
+
+        keys = [self._attribution_cache_key(event) for event in all_events]
+        found = cache.get_many(keys)
+        cached = {idx: dict(found[key]) for idx, key in enumerate(keys) if key in found}
+        pending = [idx for idx, key in enumerate(keys) if key not in found]
+        return cached, pending
+
+    def _store_attribution_results(self, all_events, attribution_map):
+        cache = getattr(self, "attribution_cache", None)
+        if cache is None or not attribution_map:
+            return
+        cache.put_many([
+            (
+                self._attribution_cache_key(all_events[idx]),
+                {field: result[field] for field in self.ATTRIBUTION_RESULT_FIELDS},
+            )
+            for idx, result in attribution_map.items()
+        ])
+
+    # Translation cache: English renderings of headlines, so repeated titles cost no translator calls
+    def _init_translation_cache(self):
+        self.translation_cache = self._open_record_cache(
+            "translation", "text", str, self.TRANSLATION_CACHE_TTL_HOURS, self.TRANSLATION_CACHE_MAX_ENTRIES
+        )
+
+    def _save_translation_cache(self):
+        self._save_record_cache(getattr(self, "translation_cache", None), "translation")
+
+    def _translation_cache_key(self, title, dest="en"):
+        return hashlib.sha256(f"{dest}\0{title}".encode("utf-8")).hexdigest()
+
+    def _lookup_translation_cache(self, titles):
+        """Return ({title: cached translation}, [titles that still need the translator])."""
+        cache = getattr(self, "translation_cache", None)
+        if cache is None:
+            return {}, list(titles)
+
+        keys = [self._translation_cache_key(title) for title in titles]
+        found = cache.get_many(keys)
+        cached = {title: found[key] for title, key in zip(titles, keys) if key in found}
+        pending = [title for title, key in zip(titles, keys) if key not in found]
+        return cached, pending
+
+    def _store_translations(self, translations):
+        cache = getattr(self, "translation_cache", None)
+        if cache is None or not translations:
+            return
+        cache.put_many([(self._translation_cache_key(title), text) for title, text in translations.items()])
+
+    # SQLite backend: one row per URL, WAL journal, rows loaded on demand
+    def _cache_connection(self):
+        connection = getattr(self.cache_local, "connection", None)
+        if connection is None:
+            connection = sqlite3.connect(self.feed_cache_file, timeout=30)
+            connection.execute("PRAGMA synchronous=NORMAL")
+            self.cache_local.connection = connection
+        return connection
+
+    def _init_sqlite_cache(self):
+        connection = self._cache_connection()
+        connection.execute("PRAGMA journal_mode=WAL")
+        with connection:
+            connection.execute(
+                """CREATE TABLE IF NOT EXISTS feed_cache (
+                    url TEXT PRIMARY KEY,
+                    fetched_at TEXT NOT NULL,
+                    etag TEXT,
+                    last_modified TEXT,
+                    entries TEXT NOT NULL
+                )"""
+            )
+        self._import_legacy_feed_cache(connection)
+
+    def _import_legacy_feed_cache(self, connection):
+        """Seed an empty SQLite cache from feed_cache.json so the first run keeps its stale fallbacks."""
+        if not os.path.exists(self.legacy_feed_cache_file):
+            return
+        if connection.execute("SELECT 1 FROM feed_cache LIMIT 1").fetchone():
+            return
+        legacy = self._load_feed_cache(self.legacy_feed_cache_file)
+        rows = [
+            self._cache_row(url, record)
+            for url, record in legacy.items()
+            if isinstance(record, dict) and record.get("fetched_at") and isinstance(record.get("entries"), list)
+        ]
+        if not rows:
+            return
+        with connection:
+            connection.executemany(self.FEED_CACHE_UPSERT_SQL, rows)
+        logger.info(f"Imported {len(rows)} feeds from legacy feed_cache.json")
+
+    def _cache_row(self, url, payload):
+        return (
+            url,
+            payload["fetched_at"],
+            payload.get("etag"),
+            payload.get("last_modified"),
+            json.dumps(payload["entries"], ensure_ascii=True, separators=(",", ":")),
+        )
+
+    def _uses_sqlite_cache(self):
+        return getattr(self, "feed_cache_backend", "json") == "sqlite"
 
     def _cache_entry_age_seconds(self, entry):
         fetched_at = entry.get("fetched_at")
         if not fetched_at:
             return None
-        try:
-            cached_time = date_parser.parse(fetched_at).replace(tzinfo=None)
-        except Exception:
+        cached_time = parse_timestamp(fetched_at)
+        if cached_time is None:
             return None
         return (datetime.utcnow() - cached_time).total_seconds()
 
-    def _get_cached_entries(self, url, max_age_seconds):
-        if not self.feed_cache_file:
-            return None, None
+    def _read_cache_record(self, url):
+        if not getattr(self, "feed_cache_file", None):
+            return None
+        with self.cache_lock:
+            entry = self.feed_cache_dirty.get(url) or self.feed_cache_flushing.get(url)
+        if entry:
+            return entry
+        if self._uses_sqlite_cache():
+            try:
+                row = self._cache_connection().execute(
+                    "SELECT fetched_at, etag, last_modified, entries FROM feed_cache WHERE url = ?",
+                    (url,),
+                ).fetchone()
+            except sqlite3.Error as e:
+                logger.warning(f"Feed cache read failed for {url}: {e}")
+                return None
+            if not row:
+                return None
+            try:
+                entries = json.loads(row[3])
+            except ValueError as e:
+                logger.warning(f"Dropping corrupt feed cache row for {url}: {e}")
+                self._delete_cache_row(url)
+                return None
+            entry = {"fetched_at": row[0], "entries": entries}
+            if row[1]:
+                entry["etag"] = row[1]
+            if row[2]:
+                entry["last_modified"] = row[2]
+            return entry
         with self.cache_lock:
             entry = self.feed_cache.get(url)
-        if not isinstance(entry, dict):
+        return entry if isinstance(entry, dict) else None
+
+    def _delete_cache_row(self, url):
+        try:
+            connection = self._cache_connection()
+            with connection:
+                connection.execute("DELETE FROM feed_cache WHERE url = ?", (url,))
+        except sqlite3.Error as e:
+            logger.warning(f"Feed cache delete failed for {url}: {e}")
+
+    def _store_cache_record(self, url, payload):
+        with self.cache_lock:
+            self.feed_cache_dirty[url] = payload
+            self._schedule_feed_cache_flush_locked()
+
+    def _get_cached_entries(self, url, max_age_seconds):
+        entry = self._read_cache_record(url)
+        if not entry:
             return None, None
         age = self._cache_entry_age_seconds(entry)
         if age is None or age > max_age_seconds:
@@ -328,7 +753,7 @@ class BNTIAnalyzer:
             serialized.append(item)
         return serialized
 
-    def _write_cache_entries(self, url, entries):
+    def _write_cache_entries(self, url, entries, validators=None):
         if not self.feed_cache_file:
             return
         serialized = self._serialize_entries(entries)
@@ -338,9 +763,131 @@ class BNTIAnalyzer:
             "fetched_at": datetime.utcnow().strftime("%Y-%m-%dT%H:%M:%S"),
             "entries": serialized
         }
-        with self.cache_lock:
-            self.feed_cache[url] = payload
-            self._save_feed_cache_locked()
+        payload.update(validators or {})
+        self._store_cache_record(url, payload)
+
+    def _response_validators(self, response):
+        headers = getattr(response, "headers", None) or {}
+        validators = {}
+        etag = headers.get("ETag")
+        last_modified = headers.get("Last-Modified")
+        if isinstance(etag, str) and etag:
+            validators["etag"] = etag
+        if isinstance(last_modified, str) and last_modified:
+            validators["last_modified"] = last_modified
+        return validators
+
+    def _get_conditional_headers(self, url):
+        """If-None-Match / If-Modified-Since for a cached feed, only when its entries are still on hand."""
+        entry = self._read_cache_record(url)
+        if not entry or not entry.get("entries"):
+            return {}
+        headers = {}
+        if entry.get("etag"):
+            headers["If-None-Match"] = entry["etag"]
+        if entry.get("last_modified"):
+            headers["If-Modified-Since"] = entry["last_modified"]
+        return headers
+
+    def _revalidate_cache_entries(self, url, response):
+        """Handle a 304: mark the cached copy fresh again and serve it without reparsing a body."""
+        entry = self._read_cache_record(url)
+        if not entry or not isinstance(entry.get("entries"), list):
+            return []
+        payload = dict(entry)
+        payload["fetched_at"] = datetime.utcnow().strftime("%Y-%m-%dT%H:%M:%S")
+        payload.update(self._response_validators(response))
+        self._store_cache_record(url, payload)
+        return self._extract_entries(payload["entries"])
+
+    def _entries_from_feed_response(self, url, response):
+        if response.status_code == 304:
+            return self._revalidate_cache_entries(url, response)
+        entries = self._parse_feed_content(response.content)
+        return self._cache_parsed_entries(url, response, entries)
+
+    async def _entries_from_feed_response_async(self, url, response):
+        if response.status_code == 304:
+            return await asyncio.to_thread(self._revalidate_cache_entries, url, response)
+        entries = await self._parse_feed_content_async(response.content)
+        return self._cache_parsed_entries(url, response, entries)
+
+    def _cache_parsed_entries(self, url, response, entries):
+        if entries:
+            self._write_cache_entries(url, entries, validators=self._response_validators(response))
+        return entries
+
+    # Feed parsing is CPU-bound, so it runs in worker processes instead of the I/O threads
+    def _init_feed_parse_pool(self):
+        default_workers = min(self.FEED_PARSE_MAX_WORKERS, os.cpu_count() or 1)
+        self.feed_parse_workers = max(int(os.environ.get("BNTI_FEED_PARSE_WORKERS", str(default_workers))), 0)
+        self.feed_parse_pool = None
+        self.feed_parse_pool_lock = threading.Lock()
+
+    def _get_feed_parse_pool(self):
+        """Return the shared parse pool, or None when parsing should stay in-process."""
+        if getattr(self, "feed_parse_workers", 0) <= 0:
+            return None
+        with self.feed_parse_pool_lock:
+            if self.feed_parse_pool is None:
+                # spawn, not fork: the parent is full of fetch threads holding locks
+                self.feed_parse_pool = concurrent.futures.ProcessPoolExecutor(
+                    max_workers=self.feed_parse_workers,
+                    mp_context=multiprocessing.get_context("spawn"),
+                )
+            return self.feed_parse_pool
+
+    def _disable_feed_parse_pool(self, error):
+        logger.warning(f"Feed parse pool failed ({error}), parsing in-process")
+        self.feed_parse_workers = 0
+        self._shutdown_feed_parse_pool()
+
+    def _shutdown_feed_parse_pool(self):
+        if not hasattr(self, "feed_parse_pool_lock"):
+            return
+        with self.feed_parse_pool_lock:
+            pool, self.feed_parse_pool = self.feed_parse_pool, None
+        if pool is not None:
+            pool.shutdown(wait=False)
+
+    def _parse_feed_content_inline(self, content):
+        feed = feedparser.parse(content)
+        return self._extract_entries(feed.entries if hasattr(feed, 'entries') else [])
+
+    def _submit_feed_parse(self, pool, content):
+        try:
+            return pool.submit(bnti_feed_parsing.parse_feed_content, content)
+        except Exception as e:
+            # The pool could not start its workers or has been shut down
+            self._disable_feed_parse_pool(e)
+            return None
+
+    def _feed_parse_worker_failed(self, error):
+        """Disable the pool when it broke; a single feed's parse error only falls back for that feed."""
+        if isinstance(error, self.FEED_PARSE_POOL_ERRORS):
+            self._disable_feed_parse_pool(error)
+        else:
+            logger.warning(f"Feed parse failed in worker ({error}), parsing this feed in-process")
+
+    def _parse_feed_content(self, content):
+        pool = self._get_feed_parse_pool()
+        future = self._submit_feed_parse(pool, content) if pool is not None else None
+        if future is not None:
+            try:
+                return bnti_feed_parsing.rows_to_entries(future.result())
+            except Exception as e:
+                self._feed_parse_worker_failed(e)
+        return self._parse_feed_content_inline(content)
+
+    async def _parse_feed_content_async(self, content):
+        pool = self._get_feed_parse_pool()
+        future = self._submit_feed_parse(pool, content) if pool is not None else None
+        if future is not None:
+            try:
+                return bnti_feed_parsing.rows_to_entries(await asyncio.wrap_future(future))
+            except Exception as e:
+                self._feed_parse_worker_failed(e)
+        return self._parse_feed_content_inline(content)
 
     def _google_news_url(self, query):
         encoded = quote_plus(query)
@@ -363,38 +910,7 @@ class BNTIAnalyzer:
             self.rss_urls[country] = merged
 
     def _extract_entries(self, entries):
-        if not entries:
-            return []
-
-        now = datetime.now()
-        recent_entries = []
-        for entry in entries:
-            link = entry.get('link') if hasattr(entry, 'get') else getattr(entry, 'link', None)
-            title = entry.get('title') if hasattr(entry, 'get') else getattr(entry, 'title', None)
-            if not link or not title:
-                continue
-
-            published_date_str = entry.get('published') if hasattr(entry, 'get') else getattr(entry, 'published', None)
-            if published_date_str:
-                try:
-                    published_date = date_parser.parse(published_date_str).replace(tzinfo=None)
-                    if published_date >= (now - timedelta(days=2)):
-                        recent_entries.append(entry)
-                except Exception:
-                    continue
-            else:
-                recent_entries.append(entry)
-
-        if recent_entries:
-            return recent_entries
-
-        fallback = []
-        for entry in entries:
-            link = entry.get('link') if hasattr(entry, 'get') else getattr(entry, 'link', None)
-            title = entry.get('title') if hasattr(entry, 'get') else getattr(entry, 'title', None)
-            if link and title:
-                fallback.append(entry)
-        return fallback[:5]
+        return bnti_feed_parsing.select_recent_entries(entries)
 
     def _build_proxy_url(self, url):
         parsed = urlparse(url)
@@ -440,11 +956,12 @@ class BNTIAnalyzer:
             deduped.append(entry)
         return deduped[:12]
 
-    def _fetch_proxy_entries(self, url, session, headers):
+    def _fetch_proxy_entries(self, url, session=None, headers=None):
         proxy_url = self._build_proxy_url(url)
         if not proxy_url:
             return []
         try:
+            session = session or self._get_http_session(proxy_url)
             response = session.get(
                 proxy_url,
                 headers=headers,
@@ -457,13 +974,21 @@ class BNTIAnalyzer:
             logger.warning(f"Proxy fetch failed for {url}: {e}")
             return []
 
-    def fetch_feed_entries(self, country, url):
-        import requests
-        from requests.adapters import HTTPAdapter
+    # Long-lived HTTP sessions, one keep-alive connection pool per host
+    def _init_http_pool(self):
+        self.http_sessions = {}
+        self.http_sessions_lock = threading.Lock()
+        self.http_pool_connections = max(
+            int(os.environ.get("BNTI_HTTP_POOL_CONNECTIONS", str(self.HTTP_POOL_CONNECTIONS))), 1
+        )
+        self.http_pool_maxsize = max(
+            int(os.environ.get("BNTI_HTTP_POOL_MAXSIZE", str(self.HTTP_POOL_MAXSIZE))), 1
+        )
+
+    def _build_feed_retry(self):
         from urllib3.util.retry import Retry
 
-        session = requests.Session()
-        retries = Retry(
+        return Retry(
             total=self.FEED_RETRY_TOTAL,
             connect=self.FEED_RETRY_CONNECT,
             read=self.FEED_RETRY_READ,
@@ -472,39 +997,53 @@ class BNTIAnalyzer:
             allowed_methods=frozenset(["HEAD", "GET", "OPTIONS"]),
             respect_retry_after_header=True
         )
-        session.mount('https://', HTTPAdapter(max_retries=retries))
-        session.mount('http://', HTTPAdapter(max_retries=retries))
-
-        base_headers = {
-            'Accept': 'text/html,application/xhtml+xml,application/xml;q=0.9,image/avif,image/webp,image/apng,*/*;q=0.8,application/signed-exchange;v=b3;q=0.7',
-            'Accept-Language': 'en-US,en;q=0.9',
-            'Cache-Control': 'no-cache',
-            'Pragma': 'no-cache',
-            'Upgrade-Insecure-Requests': '1',
-            'Sec-Fetch-Dest': 'document',
-            'Sec-Fetch-Mode': 'navigate',
-            'Sec-Fetch-Site': 'none',
-            'Sec-Fetch-User': '?1',
-            'Sec-Ch-Ua': '"Chromium";v="122", "Not(A:Brand";v="24", "Google Chrome";v="122"',
-            'Sec-Ch-Ua-Mobile': '?0',
-            'Sec-Ch-Ua-Platform': '"Linux"',
-            'Connection': 'keep-alive',
-            'Referer': 'https://www.google.com/'
-        }
 
-        cached_entries, _ = self._get_cached_entries(url, self.cache_fresh_ttl_seconds)
-        if cached_entries:
-            cached = self._extract_entries(cached_entries)
-            if cached:
-                return cached
+    def _get_http_session(self, url, max_retries=None):
+        """Return the shared session for url's host, creating it on first use.
+
+        The retry policy is fixed when the host's session is created; feeds use the
+        feed Retry policy, callers with their own retry loop pass max_retries=0.
+        """
+        import requests
+        from requests.adapters import HTTPAdapter
+
+        if not hasattr(self, "http_sessions"):
+            self._init_http_pool()
+
+        host = self._feed_host(url)
+        with self.http_sessions_lock:
+            session = self.http_sessions.get(host)
+            if session is None:
+                session = requests.Session()
+                adapter = HTTPAdapter(
+                    max_retries=self._build_feed_retry() if max_retries is None else max_retries,
+                    pool_connections=self.http_pool_connections,
+                    pool_maxsize=self.http_pool_maxsize,
+                )
+                session.mount('https://', adapter)
+                session.mount('http://', adapter)
+                self.http_sessions[host] = session
+        return session
+
+    def fetch_feed_entries(self, country, url):
+        import requests
+
+        session = self._get_http_session(url)
+        base_headers = dict(self.FEED_REQUEST_HEADERS)
+
+        cached = self._fresh_cached_entries(url)
+        if cached:
+            return cached
 
         last_error = None
         saw_timeout = False
         saw_non_timeout_error = False
+        conditional_headers = self._get_conditional_headers(url)
         user_agents = self.user_agents[:self.FEED_MAX_USER_AGENT_ATTEMPTS]
         for user_agent in user_agents:
             headers = dict(base_headers)
             headers['User-Agent'] = user_agent
+            headers.update(conditional_headers)
             try:
                 response = session.get(
                     url,
@@ -512,11 +1051,10 @@ class BNTIAnalyzer:
                     timeout=self.FEED_REQUEST_TIMEOUT_SECONDS,
                 )
                 response.raise_for_status()
-                feed = feedparser.parse(response.content)
-                entries = self._extract_entries(feed.entries if hasattr(feed, 'entries') else [])
+                entries = self._entries_from_feed_response(url, response)
                 if entries:
-                    self._write_cache_entries(url, entries)
                     return entries
+                conditional_headers = {}
             except requests.exceptions.SSLError as e:
                 last_error = e
                 try:
@@ -527,11 +1065,9 @@ class BNTIAnalyzer:
                         verify=False,
                     )
                     response.raise_for_status()
-                    feed = feedparser.parse(response.content)
-                    entries = self._extract_entries(feed.entries if hasattr(feed, 'entries') else [])
+                    entries = self._entries_from_feed_response(url, response)
                     if entries:
                         logger.warning(f"SSL verification skipped for {url}")
-                        self._write_cache_entries(url, entries)
                         return entries
                 except Exception as e2:
                     last_error = e2
@@ -559,11 +1095,21 @@ class BNTIAnalyzer:
                 last_error = e
 
         if not skip_network_fallbacks:
-            entries = self._fetch_proxy_entries(url, session, base_headers)
+            entries = self._fetch_proxy_entries(url, None, base_headers)
             if entries:
                 self._write_cache_entries(url, entries)
                 return entries
 
+        return self._stale_cached_entries(url, last_error)
+
+    def _fresh_cached_entries(self, url):
+        cached_entries, _ = self._get_cached_entries(url, self.cache_fresh_ttl_seconds)
+        if cached_entries:
+            return self._extract_entries(cached_entries)
+        return []
+
+    def _stale_cached_entries(self, url, last_error=None):
+        """Last resort once every network path failed: serve a cached copy up to the stale TTL."""
         cached_entries, cache_age = self._get_cached_entries(url, self.cache_stale_ttl_seconds)
         if cached_entries:
             cached = self._extract_entries(cached_entries)
@@ -577,16 +1123,272 @@ class BNTIAnalyzer:
             logger.error(f"Error fetching {url}: {last_error}")
         return []
 
+    def _reset_feed_fetch_results(self):
+        self.feed_fetch_lock = threading.Lock()
+        self.feed_fetch_results = {}
+
+    def _fetch_feed_shared(self, country, url, fetch=None):
+        """Single-flight fetch: concurrent callers for one URL share one download and one parse."""
+        fetch = fetch or self.fetch_feed_entries
+        with self.feed_fetch_lock:
+            future = self.feed_fetch_results.get(url)
+            is_leader = future is None
+            if is_leader:
+                future = concurrent.futures.Future()
+                self.feed_fetch_results[url] = future
+
+        if is_leader:
+            try:
+                future.set_result(fetch(country, url) or [])
+            except Exception as e:
+                future.set_exception(e)
+        return list(future.result())
+
+    def _feed_host(self, url):
+        return urlparse(url).netloc.lower()
+
+    def _schedule_feed_jobs(self):
+        """Interleave every (country, url) job round-robin by host so no single host fills the pool."""
+        host_queues = {}
+        for country, urls in self.rss_urls.items():
+            for position, url in enumerate(urls or []):
+                host_queues.setdefault(self._feed_host(url), []).append((country, position, url))
+
+        jobs = []
+        queues = list(host_queues.values())
+        while queues:
+            for host_queue in queues:
+                jobs.append(host_queue.pop(0))
+            queues = [host_queue for host_queue in queues if host_queue]
+        return jobs
+
+    def _fetch_all_feeds(self):
+        """Fetch every country's feeds under one bounded pool with per-host concurrency caps.
+
+        Returns a {country: entries} map; entries keep each country's URL order.
+        """
+        jobs = self._schedule_feed_jobs()
+        results = {country: [[] for _ in urls or []] for country, urls in self.rss_urls.items()}
+        if not jobs:
+            return {country: [] for country in results}
+
+        self._reset_feed_fetch_results()
+        host_limits = {}
+        host_limits_lock = threading.Lock()
+
+        def fetch_with_host_limit(country, url):
+            host = self._feed_host(url)
+            with host_limits_lock:
+                limit = host_limits.get(host)
+                if limit is None:
+                    limit = threading.BoundedSemaphore(self.FEED_MAX_CONNECTIONS_PER_HOST)
+                    host_limits[host] = limit
+            with limit:
+                return self.fetch_feed_entries(country, url)
+
+        logger.info(f"Fetching {len(jobs)} feeds across {len(results)} countries...")
+        max_workers = max(1, min(self.FEED_MAX_WORKERS, len(jobs)))
+        with concurrent.futures.ThreadPoolExecutor(max_workers=max_workers) as executor:
+            futures = {
+                executor.submit(self._fetch_feed_shared, country, url, fetch_with_host_limit): (country, position, url)
+                for country, position, url in jobs
+            }
+            for future in concurrent.futures.as_completed(futures):
+                country, position, url = futures[future]
+                try:
+                    results[country][position] = future.result() or []
+                except Exception as e:
+                    logger.error(f"Error fetching {url}: {e}")
+
+        logger.info(f"Fetched {len(self.feed_fetch_results)} unique feeds for {len(jobs)} feed jobs")
+        return self._finish_feed_fetch(results)
+
+    def _finish_feed_fetch(self, results):
+        self._shutdown_feed_parse_pool()
+        if getattr(self, "feed_cache_file", None):
+            self._flush_feed_cache()
+            stats = self.feed_cache_stats
+            logger.info(
+                f"Feed cache: {stats['records_written']} records in {stats['flush_count']} flushes "
+                f"({stats['bytes_written']} bytes written)"
+            )
+        return {
+            country: [entry for entries in per_url for entry in entries]
+            for country, per_url in results.items()
+        }
+
+    def _fetch_country_entries(self, engine=None):
+        engine = (engine or getattr(self, "fetch_engine", "threads")).strip().lower()
+        if engine == "async":
+            try:
+                return asyncio.run(self._fetch_all_feeds_async())
+            except ImportError as e:
+                logger.warning(f"Async fetch engine unavailable ({e}), using threads")
+        return self._fetch_all_feeds()
+
+    # Asyncio ingestion engine: the fetch_feed_entries fallback chain on one event loop
+    def _build_async_feed_clients(self):
+        """Return {verify: client}; the verify=False client serves the SSL fallback."""
+        import httpx
+
+        clients = {}
+        for verify in (True, False):
+            try:
+                clients[verify] = httpx.AsyncClient(
+                    verify=verify,
+                    timeout=self.FEED_REQUEST_TIMEOUT_SECONDS,
+                    follow_redirects=True,
+                )
+            except TypeError:
+                # httpx < 0.20 follows redirects by default and has no follow_redirects option
+                clients[verify] = httpx.AsyncClient(verify=verify, timeout=self.FEED_REQUEST_TIMEOUT_SECONDS)
+        return clients
+
+    def _is_ssl_error(self, error):
+        seen = set()
+        while error is not None and id(error) not in seen:
+            if isinstance(error, ssl.SSLError):
+                return True
+            seen.add(id(error))
+            error = error.__cause__ or error.__context__
+        return False
+
+    def _is_timeout_error(self, error):
+        if isinstance(error, (asyncio.TimeoutError, socket.timeout)):
+            return True
+        return any(cls.__name__ == "TimeoutException" for cls in type(error).__mro__)
+
+    async def _async_get(self, client, url, headers, timeout):
+        response = await asyncio.wait_for(client.get(url, headers=headers), timeout)
+        if response.status_code >= 400:
+            response.raise_for_status()
+        return response
+
+    async def _fetch_proxy_entries_async(self, url, client):
+        proxy_url = self._build_proxy_url(url)
+        if not proxy_url:
+            return []
+        try:
+            response = await self._async_get(
+                client,
+                proxy_url,
+                dict(self.FEED_REQUEST_HEADERS),
+                self.FEED_PROXY_TIMEOUT_SECONDS,
+            )
+            entries = self._parse_proxy_markdown(response.text)
+            return self._extract_entries(entries)
+        except Exception as e:
+            logger.warning(f"Proxy fetch failed for {url}: {e}")
+            return []
+
+    async def _fetch_feed_entries_async(self, url, clients, global_limit, host_limit):
+        # Cache reads can hit SQLite, so they run on the default executor, not the event loop
+        cached = await asyncio.to_thread(self._fresh_cached_entries, url)
+        if cached:
+            return cached
+
+        last_error = None
+        saw_timeout = False
+        saw_non_timeout_error = False
+        async with global_limit, host_limit:
+            conditional_headers = await asyncio.to_thread(self._get_conditional_headers, url)
+            for user_agent in self.user_agents[:self.FEED_MAX_USER_AGENT_ATTEMPTS]:
+                headers = dict(self.FEED_REQUEST_HEADERS)
+                headers['User-Agent'] = user_agent
+                headers.update(conditional_headers)
+                try:
+                    response = await self._async_get(clients[True], url, headers, self.FEED_REQUEST_TIMEOUT_SECONDS)
+                    entries = await self._entries_from_feed_response_async(url, response)
+                    if entries:
+                        return entries
+                    conditional_headers = {}
+                except Exception as e:
+                    last_error = e
+                    if self._is_ssl_error(e):
+                        try:
+                            response = await self._async_get(
+                                clients[False], url, headers, self.FEED_REQUEST_TIMEOUT_SECONDS
+                            )
+                            entries = await self._entries_from_feed_response_async(url, response)
+                            if entries:
+                                logger.warning(f"SSL verification skipped for {url}")
+                                return entries
+                        except Exception as e2:
+                            last_error = e2
+                            saw_non_timeout_error = True
+                    elif self._is_timeout_error(e):
+                        saw_timeout = True
+                    else:
+                        saw_non_timeout_error = True
+
+            # feedparser.parse(url) would download with blocking urllib, so go straight to the proxy
+            if not saw_timeout or saw_non_timeout_error:
+                entries = await self._fetch_proxy_entries_async(url, clients[True])
+                if entries:
+                    self._write_cache_entries(url, entries)
+                    return entries
+
+        return await asyncio.to_thread(self._stale_cached_entries, url, last_error)
+
+    async def _fetch_all_feeds_async(self):
+        """Async twin of _fetch_all_feeds: one task per unique URL, all on the calling thread.
+
+        The global and per-host caps are asyncio semaphores, and every request is bounded
+        by asyncio.wait_for, so a stalled host cannot hold the run past its timeout.
+        """
+        jobs = self._schedule_feed_jobs()
+        results = {country: [[] for _ in urls or []] for country, urls in self.rss_urls.items()}
+        if not jobs:
+            return {country: [] for country in results}
+
+        clients = self._build_async_feed_clients()
+        unique_urls = list(dict.fromkeys(url for _, _, url in jobs))
+        global_limit = asyncio.Semaphore(self.FEED_ASYNC_MAX_IN_FLIGHT)
+        host_limits = {}
+        for url in unique_urls:
+            host = self._feed_host(url)
+            if host not in host_limits:
+                host_limits[host] = asyncio.Semaphore(self.FEED_MAX_CONNECTIONS_PER_HOST)
+
+        logger.info(f"Fetching {len(jobs)} feeds across {len(results)} countries (async engine)...")
+        try:
+            fetched = await asyncio.gather(
+                *[
+                    self._fetch_feed_entries_async(url, clients, global_limit, host_limits[self._feed_host(url)])
+                    for url in unique_urls
+                ],
+                return_exceptions=True,
+            )
+        finally:
+            for client in clients.values():
+                await client.aclose()
+
+        entries_by_url = {}
+        for url, entries in zip(unique_urls, fetched):
+            if isinstance(entries, BaseException):
+                logger.error(f"Error fetching {url}: {entries}")
+                entries = []
+            entries_by_url[url] = entries or []
+        for country, position, url in jobs:
+            results[country][position] = list(entries_by_url[url])
+
+        logger.info(f"Fetched {len(unique_urls)} unique feeds for {len(jobs)} feed jobs")
+        return self._finish_feed_fetch(results)
+
     # Keywords that indicate non-threatening news (false positive filter)
-    def process_country(self, country, urls):
+    def process_country(self, country, urls, fetched_entries=None):
         logger.info(f"Processing {country}...")
-        all_entries = []
-        
-        with concurrent.futures.ThreadPoolExecutor() as executor:
-            futures = [executor.submit(self.fetch_feed_entries, country, url) for url in urls]
-            for future in concurrent.futures.as_completed(futures):
-                all_entries.extend(future.result())
-        
+        if fetched_entries is not None:
+            all_entries = list(fetched_entries)
+        else:
+            all_entries = []
+            # A standalone call is its own run: start from an empty single-flight table
+            self._reset_feed_fetch_results()
+            with concurrent.futures.ThreadPoolExecutor() as executor:
+                futures = [executor.submit(self._fetch_feed_shared, country, url) for url in urls]
+                for future in concurrent.futures.as_completed(futures):
+                    all_entries.extend(future.result())
+
         if not all_entries:
             return country, []
 
@@ -630,12 +1432,7 @@ class BNTIAnalyzer:
         return round(min(max(index, 1.0), 10.0), 2)
 
     def _parse_timestamp(self, value):
-        if not value:
-            return None
-        try:
-            return date_parser.parse(str(value)).replace(tzinfo=None)
-        except Exception:
-            return None
+        return parse_timestamp(value)
 
     def _extract_index(self, record):
         for key in ("main_index", "index"):
@@ -694,54 +1491,185 @@ class BNTIAnalyzer:
             e["ai_model"] = e.get("ai_model") or self.openrouter_model
             e["ai_confidence_score"] = f"{e.get('confidence', 1.0) * 100:.1f}%"
 
-            # Simple language heuristic
-            if e["title"].isascii():
-                e["detected_lang"] = "en"
-                e["is_translated"] = False
-            else:
-                e["detected_lang"] = "local" # approximations
-                e["is_translated"] = False # will be updated if selected for translation
+            e["detected_lang"] = detect_language(e["title"])
+            e["is_translated"] = False # will be updated if selected for translation
 
-    def _ensure_translated_titles(self, events):
+    # Translation service: a pluggable backend, a small worker pool and a shared token bucket
+    def _init_translation_service(self):
+        backend_name = os.environ.get("BNTI_TRANSLATION_BACKEND", "googletrans").strip().lower()
+        if backend_name not in self.TRANSLATION_BACKENDS:
+            logger.warning(f"Unknown translation backend '{backend_name}', using googletrans")
+            backend_name = "googletrans"
+        try:
+            self.translation_backend = bnti_translation.create_backend(
+                backend_name, os.environ.get("BNTI_TRANSLATION_DICTIONARY") or None
+            )
+        except Exception as e:
+            logger.warning(f"Translation backend '{backend_name}' unavailable ({e}), using passthrough")
+            self.translation_backend = bnti_translation.PassthroughBackend()
+        self.translation_max_workers = max(
+            int(os.environ.get("BNTI_TRANSLATION_WORKERS", str(self.TRANSLATION_MAX_WORKERS))), 1
+        )
+        self.translation_bucket = bnti_rate_limit.TokenBucket(
+            float(os.environ.get("BNTI_TRANSLATION_REQUESTS_PER_SECOND", str(self.TRANSLATION_REQUESTS_PER_SECOND))),
+            burst=self.translation_max_workers,
+        )
+        self.translation_budget_seconds = max(
+            float(os.environ.get("BNTI_TRANSLATION_BUDGET_SECONDS", str(self.TRANSLATION_BUDGET_SECONDS))), 0.0
+        )
+        self.translation_stats_lock = threading.Lock()
+        self.translation_stats = {}
+        self._init_translation_cache()
+
+    def _translation_backend(self):
+        backend = getattr(self, "translation_backend", None)
+        if backend is None:
+            backend = self.translation_backend = bnti_translation.GoogleTranslateBackend()
+        return backend
+
+    def _acquire_translation_token(self):
+        bucket = getattr(self, "translation_bucket", None)
+        if bucket is not None:
+            bucket.acquire()
+
+    def _record_translation(self, backend, outcome, seconds=0.0):
+        lock = getattr(self, "translation_stats_lock", None)
+        if lock is None:
+            return
+        with lock:
+            stats = self.translation_stats.setdefault(backend.name, {
+                "calls": 0, "translated": 0, "untranslated": 0, "failures": 0, "skipped": 0,
+                "seconds": 0.0, "max_seconds": 0.0,
+            })
+            stats[outcome] += 1
+            if outcome != "skipped":
+                stats["calls"] += 1
+                stats["seconds"] += seconds
+                stats["max_seconds"] = max(stats["max_seconds"], seconds)
+
+    def _translation_metrics(self):
+        """Per-backend call counts and latency for this analyzer's translation calls."""
+        lock = getattr(self, "translation_stats_lock", None)
+        if lock is None:
+            return {}
+        with lock:
+            metrics = {name: dict(stats) for name, stats in self.translation_stats.items()}
+        for stats in metrics.values():
+            stats["avg_seconds"] = round(stats["seconds"] / stats["calls"], 3) if stats["calls"] else 0.0
+            stats["seconds"] = round(stats["seconds"], 3)
+            stats["max_seconds"] = round(stats["max_seconds"], 3)
+        return metrics
+
+    def _translate_title(self, title, deadline=None):
+        backend = self._translation_backend()
+        if backend.remote:
+            self._acquire_translation_token()
+        if deadline is not None and time.monotonic() >= deadline:
+            self._record_translation(backend, "skipped")
+            return None
+        started = time.perf_counter()
+        try:
+            translated = backend.translate(title, dest='en')
+        except Exception as e:
+            self._record_translation(backend, "failures", time.perf_counter() - started)
+            logger.warning(f"Translation failed: {e}")
+            return None
+        self._record_translation(backend, "translated" if translated else "untranslated", time.perf_counter() - started)
+        return translated or None
+
+    def _translate_titles(self, titles):
+        """Return {title: English text} for each title that could be translated; failures are left out.
+
+        Titles still waiting when the translation budget runs out are skipped, not queued.
+        """
+        if not titles:
+            return {}
+        backend = self._translation_backend()
+        if backend.remote:
+            translations, pending = self._lookup_translation_cache(titles)
+        else:
+            translations, pending = {}, list(titles)
+        if not pending:
+            return translations
+
+        started = time.monotonic()
+        budget = getattr(self, "translation_budget_seconds", 0)
+        deadline = started + budget if budget else None
+        workers = min(getattr(self, "translation_max_workers", 1), len(pending))
+        if workers > 1:
+            with concurrent.futures.ThreadPoolExecutor(
+                max_workers=workers, thread_name_prefix="bnti-translate"
+            ) as pool:
+                results = list(pool.map(lambda title: self._translate_title(title, deadline), pending))
+        else:
+            results = [self._translate_title(title, deadline) for title in pending]
+
+        fresh = {title: text for title, text in zip(pending, results) if text is not None}
+        translations.update(fresh)
+        logger.info(
+            f"Translation ({backend.name}): {len(fresh)}/{len(pending)} titles in "
+            f"{time.monotonic() - started:.2f}s, {len(titles) - len(pending)} from cache"
+        )
+        if fresh and backend.remote:
+            self._store_translations(fresh)
+            self._save_translation_cache()
+        return translations
+
+    def _ensure_translated_titles(self, events, enrich=True):
         if not events:
             return events
 
-        self.detect_and_enrich_metadata(events)
+        if enrich:
+            self.detect_and_enrich_metadata(events)
+        pending = {}
         for event in events:
             if event.get("translated_title"):
                 continue
-
-            try:
-                if event.get("detected_lang") == "en":
-                    event["translated_title"] = event["title"]
+            if event.get("detected_lang") == "en":
+                event["translated_title"] = event["title"]
+                event["is_translated"] = False
+            else:
+                pending.setdefault(event["title"], []).append(event)
+
+        translations = self._translate_titles(list(pending))
+        engine = self._translation_backend().engine if translations else None
+        for title, waiting in pending.items():
+            translated = translations.get(title)
+            for event in waiting:
+                if translated is None:
+                    event["translated_title"] = title
                     event["is_translated"] = False
                 else:
-                    trans = self.translator.translate(event["title"], dest='en')
-                    event["translated_title"] = trans.text
+                    event["translated_title"] = translated
                     event["is_translated"] = True
-                    event["translation_engine"] = "Google Neural MT"
-                    time.sleep(0.5)
-            except Exception as e:
-                logger.warning(f"Translation failed: {e}")
-                event["translated_title"] = event["title"]
-                event["is_translated"] = False
+                    event["translation_engine"] = engine
 
         return events
 
     def translate_top_threats(self, dashboard_data):
-        """Translates only the top 15 most weighted events to English with metadata."""
-        all_events = []
-        for c in dashboard_data["countries"]:
-            self.detect_and_enrich_metadata(dashboard_data["countries"][c]["events"])
-            for e in dashboard_data["countries"][c]["events"]:
-                e["country"] = c
-                all_events.append(e)
-        
-        # Sort by weight descending (Top 15 for better coverage)
-        top_list = sorted(all_events, key=lambda x: x['weight'], reverse=True)[:15]
+        """Translates only the top 15 most weighted events to English with metadata.
+
+        Every event is enriched and tagged with its country in one pass; the top events
+        are picked with a bounded heap rather than a sort of the whole set.
+        """
+        def tagged_events():
+            for country, data in dashboard_data["countries"].items():
+                events = data["events"]
+                self.detect_and_enrich_metadata(events)
+                for event in events:
+                    event["country"] = country
+                    yield event
+
+        top_list = heapq.nlargest(self.TOP_THREATS_TO_TRANSLATE, tagged_events(), key=lambda event: event["weight"])
 
         logger.info(f"Translating Top {len(top_list)} Threats...")
-        self._ensure_translated_titles(top_list)
+        self._ensure_translated_titles(top_list, enrich=False)
+        for backend_name, stats in self._translation_metrics().items():
+            logger.info(
+                f"Translation backend {backend_name}: {stats['translated']}/{stats['calls']} calls translated, "
+                f"{stats['failures']} failed, {stats['skipped']} skipped over budget, "
+                f"latency avg {stats['avg_seconds']:.3f}s max {stats['max_seconds']:.3f}s"
+            )
         return top_list
 
     def load_history(self):
@@ -1167,22 +2095,57 @@ Events:
         self.translate_top_threats(dashboard_data)
         return dashboard_data
 
+    def _serialize_dashboard(self, dashboard_data):
+        """UTF-8 JSON bytes for the dashboard: indented by default, minified in compact mode."""
+        if getattr(self, "dashboard_output_format", "pretty") == "compact":
+            text = json.dumps(dashboard_data, ensure_ascii=False, separators=(",", ":"))
+        else:
+            text = json.dumps(dashboard_data, indent=2, ensure_ascii=False)
+        return text.encode("utf-8")
+
+    def _compress_dashboard(self, payload, encoding):
+        if encoding == "gzip":
+            # mtime=0 keeps the sidecar byte-identical when the data has not changed
+            return gzip.compress(payload, compresslevel=9, mtime=0)
+        try:
+            import brotli
+        except ImportError as e:
+            logger.warning(f"Brotli sidecar unavailable ({e}), skipping")
+            return None
+        return brotli.compress(payload, quality=11)
+
     def _write_dashboard_files(self, dashboard_data, json_path=None, js_path=None):
+        """Serialize once and write the same bytes to the JSON, the JS wrapper and any sidecars."""
         json_path = json_path or os.path.join(self.output_path, "bnti_data.json")
         js_path = js_path or os.path.join(self.output_path, "bnti_data.js")
 
-        json_tmp = f"{json_path}.tmp"
-        js_tmp = f"{js_path}.tmp"
-
-        with open(json_tmp, "w", encoding="utf-8") as handle:
-            json.dump(dashboard_data, handle, indent=2, ensure_ascii=False)
+        payload = self._serialize_dashboard(dashboard_data)
+        outputs = [
+            (json_path, (payload,)),
+            (js_path, (self.DASHBOARD_JS_PREFIX, payload, b";")),
+        ]
+        stale_sidecars = []
+        sidecars = getattr(self, "dashboard_sidecars", [])
+        for encoding, suffix in self.DASHBOARD_SIDECAR_SUFFIXES.items():
+            sidecar_path = f"{json_path}.{suffix}"
+            compressed = self._compress_dashboard(payload, encoding) if encoding in sidecars else None
+            if compressed is None:
+                stale_sidecars.append(sidecar_path)
+            else:
+                outputs.append((sidecar_path, (compressed,)))
 
-        with open(js_tmp, "w", encoding="utf-8") as handle:
-            json_str = json.dumps(dashboard_data, indent=2, ensure_ascii=False)
-            handle.write(f"window.BNTI_DATA = {json_str};")
+        for path, chunks in outputs:
+            with open(f"{path}.tmp", "wb") as handle:
+                handle.writelines(chunks)
+        for path, _ in outputs:
+            os.replace(f"{path}.tmp", path)
+        # A sidecar left from an earlier run would be served in place of the new data
+        for path in stale_sidecars:
+            if os.path.exists(path):
+                os.remove(path)
 
-        os.replace(json_tmp, json_path)
-        os.replace(js_tmp, js_path)
+        sizes = ", ".join(f"{os.path.basename(path)} {sum(len(chunk) for chunk in chunks)} B" for path, chunks in outputs)
+        logger.info(f"Dashboard written: {sizes}")
 
     def _promote_candidate_snapshot(self, candidate, json_path=None, js_path=None):
         if not candidate or not candidate.get("publishable"):
@@ -1223,15 +2186,308 @@ Events:
     # OPENROUTER LLM â€” COUNTRY RE-ATTRIBUTION
     # â•â•â•â•â•â•â•â•â•â•â•â•â•â•â•â•â•â•â•â•â•â•â•â•â•â•â•â•â•â•â•â•â•â•â•â•â•â•â•â•â•â•â•â•â•â•â•â•â•â•â•â•â•â•â•â•â•â•â•â•â•â•â•
 
-    def _call_openrouter(self, prompt, max_retries=2):
-        """Call OpenRouter with automatic primary/backup key failover."""
-        import requests
+    # Adaptive batch sizing: AIMD on each model's observed parse success and latency
+    def _init_llm_batch_tuning(self):
+        self.openrouter_adaptive_batching = os.environ.get(
+            "OPENROUTER_ADAPTIVE_BATCH", "1"
+        ).strip().lower() not in ("0", "false", "no", "off")
+        cache_dir = getattr(self, "cache_dir", None)
+        self.llm_tuning_file = os.path.join(cache_dir, "llm_batch_tuning.json") if cache_dir else None
+        self.llm_tuning_lock = threading.Lock()
+        self.llm_tuning = self._load_llm_tuning()
+        self.llm_run_metrics = {"batch_sizes": [], "calls": 0, "failed_calls": 0}
+
+    def _load_llm_tuning(self):
+        path = self.llm_tuning_file
+        if not path or not os.path.exists(path):
+            return {}
+        try:
+            with open(path, "r", encoding="utf-8") as handle:
+                data = json.load(handle)
+        except Exception as e:
+            logger.warning(f"Failed to load LLM batch tuning: {e}")
+            return {}
+        return {model: state for model, state in data.items() if isinstance(state, dict)} if isinstance(data, dict) else {}
+
+    def _save_llm_tuning(self):
+        if not getattr(self, "openrouter_adaptive_batching", False) or not self.llm_tuning_file:
+            return
+        with self.llm_tuning_lock:
+            payload = json.dumps(self.llm_tuning, ensure_ascii=True, sort_keys=True)
+        try:
+            bnti_cache.write_text_atomic(self.llm_tuning_file, payload)
+        except Exception as e:
+            logger.warning(f"Failed to save LLM batch tuning: {e}")
+
+    def _clamp_llm_batch_size(self, size):
+        return max(self.OPENROUTER_MIN_BATCH_SIZE, min(self.OPENROUTER_MAX_BATCH_SIZE, int(size)))
+
+    def _llm_model_tuning_locked(self):
+        """Tuned state for the active model, re-seeded when OPENROUTER_BATCH_SIZE changes.
+
+        The configured size is stored as seed_batch_size, so an operator who changes it
+        restarts the AIMD walk from the new value instead of the persisted one.
+        """
+        model = str(getattr(self, "openrouter_model", ""))
+        seed = self._clamp_llm_batch_size(getattr(self, "openrouter_batch_size", 10))
+        state = self.llm_tuning.get(model)
+        if state is None:
+            state = {
+                "batch_size": seed,
+                "seed_batch_size": seed,
+                "success_rate": 1.0,
+                "latency_seconds": None,
+                "prompt_tokens": None,
+                "observations": 0,
+            }
+            self.llm_tuning[model] = state
+        elif state.get("seed_batch_size") != seed:
+            state["batch_size"] = seed
+            state["seed_batch_size"] = seed
+        return state
+
+    def _current_llm_batch_size(self):
+        if not getattr(self, "openrouter_adaptive_batching", False):
+            return max(int(getattr(self, "openrouter_batch_size", 10)), 1)
+        with self.llm_tuning_lock:
+            return self._clamp_llm_batch_size(self._llm_model_tuning_locked()["batch_size"])
+
+    def _plan_llm_batch(self, all_events, start):
+        """End index of the next batch to dispatch, recorded in llm_run_metrics when adaptive.
+
+        The batch holds at most the current batch size, and with a prompt token budget it
+        also stops before the estimated prompt would exceed it (always at least one item).
+        """
+        end = min(start + self._current_llm_batch_size(), len(all_events))
+        budget = int(getattr(self, "openrouter_prompt_token_budget", 0) or 0)
+        if budget > 0:
+            kind = "combined" if self._attribution_mode() == "combined" else "attribution"
+            used = sum(self._estimate_tokens(part) for part in self._prompt_parts(kind))
+            packed = start
+            while packed < end:
+                line = f"{packed + 1}. {self._format_headline_for_prompt(all_events[packed])}\n"
+                used += self._estimate_tokens(line)
+                if used > budget and packed > start:
+                    break
+                packed += 1
+            end = packed
+        if getattr(self, "openrouter_adaptive_batching", False):
+            with self.llm_tuning_lock:
+                self.llm_run_metrics["batch_sizes"].append(end - start)
+        return end
+
+    def _observe_llm_batch(self, event_count, parsed_ok, latency_seconds, prompt):
+        """Feed one answered call back into the model's tuning.
+
+        A batch that fails to parse halves the size; a slow success trims it; a fast
+        success at or above the current size grows it by OPENROUTER_BATCH_GROW_STEP.
+        """
+        if not getattr(self, "openrouter_adaptive_batching", False):
+            return
+        alpha = self.LLM_TUNING_EWMA_ALPHA
+        prompt_tokens = self._estimate_tokens(prompt)
+        with self.llm_tuning_lock:
+            state = self._llm_model_tuning_locked()
+            state["observations"] = int(state.get("observations", 0)) + 1
+            state["success_rate"] = (1 - alpha) * float(state.get("success_rate", 1.0)) + alpha * (1.0 if parsed_ok else 0.0)
+            for key, value in (("latency_seconds", latency_seconds), ("prompt_tokens", prompt_tokens)):
+                previous = state.get(key)
+                state[key] = value if previous is None else (1 - alpha) * float(previous) + alpha * value
+
+            size = self._clamp_llm_batch_size(state["batch_size"])
+            slow = latency_seconds > self.OPENROUTER_TIMEOUT_SECONDS * self.OPENROUTER_SLOW_CALL_RATIO
+            if not parsed_ok and event_count > 1:
+                size = min(size, event_count // 2)
+            elif parsed_ok and slow:
+                size = min(size, event_count - 1)
+            elif parsed_ok and event_count >= size:
+                size += self.OPENROUTER_BATCH_GROW_STEP
+            state["batch_size"] = self._clamp_llm_batch_size(size)
+
+            self.llm_run_metrics["calls"] += 1
+            if not parsed_ok:
+                self.llm_run_metrics["failed_calls"] += 1
+
+    def _llm_metrics_summary(self):
+        if not getattr(self, "openrouter_adaptive_batching", False):
+            return None
+        with self.llm_tuning_lock:
+            state = dict(self._llm_model_tuning_locked())
+            metrics = dict(self.llm_run_metrics)
+            metrics["batch_sizes"] = list(self.llm_run_metrics["batch_sizes"])
+        metrics["model"] = str(getattr(self, "openrouter_model", ""))
+        metrics["next_batch_size"] = state["batch_size"]
+        metrics["success_rate"] = round(float(state["success_rate"]), 3)
+        if state.get("latency_seconds") is not None:
+            metrics["latency_seconds"] = round(float(state["latency_seconds"]), 2)
+        if state.get("prompt_tokens") is not None:
+            metrics["prompt_tokens"] = int(state["prompt_tokens"])
+        return metrics
+
+    # Shared token bucket: every OpenRouter request from every batch thread draws from it
+    def _init_openrouter_rate_limit(self):
+        # OPENROUTER_REQUESTS_PER_MINUTE is per key; the bucket is shared by all of them
+        self.openrouter_requests_per_minute = max(float(
+            os.environ.get("OPENROUTER_REQUESTS_PER_MINUTE", str(self.OPENROUTER_REQUESTS_PER_MINUTE))
+        ), 0.0)
+        key_count = max(len(self._openrouter_api_keys()), 1)
+        self.openrouter_bucket = bnti_rate_limit.TokenBucket(
+            self.openrouter_requests_per_minute * key_count / 60.0,
+            burst=max(getattr(self, "openrouter_max_in_flight", 1), 1),
+        )
 
+    def _acquire_openrouter_token(self):
+        """Block until the bucket has a token; Retry-After pauses live on the key, not here."""
+        bucket = getattr(self, "openrouter_bucket", None)
+        if bucket is not None:
+            bucket.acquire()
+
+    def _rescale_openrouter_rate(self):
+        """Shrink the shared bucket to the keys still enabled, after a key is rejected."""
+        if not hasattr(self, "openrouter_bucket"):
+            return
+        with self.openrouter_key_lock:
+            disabled = {key for key, state in self.openrouter_key_health.items() if state["disabled"]}
+        key_count = max(len([key for key in self._openrouter_api_keys() if key not in disabled]), 1)
+        self.openrouter_bucket.set_rate(self.openrouter_requests_per_minute * key_count / 60.0)
+
+    def _retry_after_seconds(self, response):
+        headers = getattr(response, "headers", None)
+        if not isinstance(headers, Mapping):
+            return None
+        value = headers.get("Retry-After")
+        if not value:
+            return None
+        try:
+            seconds = float(value)
+        except (TypeError, ValueError):
+            try:
+                retry_at = email.utils.parsedate_to_datetime(str(value))
+            except (TypeError, ValueError):
+                return None
+            if retry_at.tzinfo is None:
+                return None
+            seconds = (retry_at - datetime.now(retry_at.tzinfo)).total_seconds()
+        return min(max(seconds, 0.0), self.OPENROUTER_MAX_RETRY_AFTER_SECONDS)
+
+    # Per-key health: every attempt goes to the healthiest configured key
+    def _openrouter_api_keys(self):
         api_keys = []
-        for key in [self.openrouter_api_key, getattr(self, "openrouter_backup_api_key", "")]:
+        candidates = [getattr(self, "openrouter_api_key", ""), getattr(self, "openrouter_backup_api_key", "")]
+        for key in candidates + list(getattr(self, "openrouter_extra_api_keys", [])):
             if key and key not in api_keys:
                 api_keys.append(key)
+        return api_keys
+
+    def _init_openrouter_key_health(self):
+        self.openrouter_key_health = {}
+        self.openrouter_key_lock = threading.Lock()
+
+    def _openrouter_key_state_locked(self, api_key):
+        state = self.openrouter_key_health.get(api_key)
+        if state is None:
+            state = {
+                "cooldown_until": 0.0,
+                "rate_limited_at": [],
+                "latency_seconds": None,
+                "in_flight": 0,
+                "disabled": False,
+            }
+            self.openrouter_key_health[api_key] = state
+        return state
 
+    def _acquire_openrouter_key(self, candidates):
+        """Return (key, seconds to wait) for the healthiest candidate; the primary key wins ties.
+
+        Keys are ranked by remaining cooldown, requests in flight, recent 429s and latency
+        EWMA. The chosen key is counted as in flight until _release_openrouter_key.
+        """
+        if not hasattr(self, "openrouter_key_lock"):
+            self._init_openrouter_key_health()
+        now = time.monotonic()
+        with self.openrouter_key_lock:
+            ranked = []
+            for position, api_key in enumerate(candidates):
+                state = self._openrouter_key_state_locked(api_key)
+                if state["disabled"]:
+                    continue
+                state["rate_limited_at"] = [
+                    stamp for stamp in state["rate_limited_at"]
+                    if now - stamp <= self.OPENROUTER_KEY_RATE_LIMIT_WINDOW_SECONDS
+                ]
+                ranked.append((
+                    max(state["cooldown_until"] - now, 0.0),
+                    state["in_flight"],
+                    len(state["rate_limited_at"]),
+                    state["latency_seconds"] or 0.0,
+                    position,
+                    api_key,
+                ))
+            if not ranked:
+                return None, 0.0
+            wait, _, _, _, _, api_key = min(ranked)
+            self.openrouter_key_health[api_key]["in_flight"] += 1
+        return api_key, wait
+
+    def _release_openrouter_key(self, api_key, latency_seconds=None, cooldown_seconds=0.0,
+                                rate_limited=False, disabled=False):
+        alpha = self.LLM_TUNING_EWMA_ALPHA
+        with self.openrouter_key_lock:
+            state = self._openrouter_key_state_locked(api_key)
+            state["in_flight"] = max(state["in_flight"] - 1, 0)
+            now = time.monotonic()
+            if cooldown_seconds > 0:
+                state["cooldown_until"] = max(state["cooldown_until"], now + cooldown_seconds)
+            if rate_limited:
+                state["rate_limited_at"].append(now)
+            if disabled:
+                state["disabled"] = True
+            if latency_seconds is not None:
+                previous = state["latency_seconds"]
+                state["latency_seconds"] = (
+                    latency_seconds if previous is None else (1 - alpha) * previous + alpha * latency_seconds
+                )
+        if disabled:
+            self._rescale_openrouter_rate()
+
+    def _call_llm(self, prompt, expected_ids=None):
+        """Batch call: streamed when OPENROUTER_STREAM is on, so it can stop at the last ID."""
+        if expected_ids and getattr(self, "openrouter_streaming", False):
+            return self._call_openrouter(prompt, expected_ids=expected_ids)
+        return self._call_openrouter(prompt)
+
+    def _read_openrouter_stream(self, resp, expected_ids):
+        """Consume SSE deltas until every expected ID has arrived or the JSON array closes.
+
+        Returns just the array text when it can, so trailing chatter never reaches the
+        parsers; the connection is closed early either way.
+        """
+        parser = bnti_llm_stream.JsonArrayItemParser()
+        expected = set(expected_ids)
+        seen = set()
+        try:
+            for delta in bnti_llm_stream.iter_sse_content(bnti_llm_stream.iter_response_lines(resp)):
+                for item in parser.feed(delta):
+                    if isinstance(item, dict):
+                        seen.add(item.get("id"))
+                if expected <= seen and not parser.skipped:
+                    return json.dumps(parser.items)
+                if parser.closed:
+                    return parser.array_text if not parser.skipped else parser.text
+        finally:
+            resp.close()
+        return parser.text
+
+    def _call_openrouter(self, prompt, max_retries=2, expected_ids=None):
+        """Call OpenRouter, routing each attempt to the healthiest configured key.
+
+        Each key gets max_retries + 1 attempts. A failed attempt puts only that key in
+        cooldown, so the next attempt moves to another key at once; a 429 cools its key
+        down for the Retry-After while the other keys keep drawing from the shared
+        bucket, whose rate is OPENROUTER_REQUESTS_PER_MINUTE per key. With expected_ids
+        the response is streamed and read only as far as needed.
+        """
+        api_keys = self._openrouter_api_keys()
         if not api_keys:
             logger.warning("OpenRouter API keys not set — cannot build publishable candidate")
             return None
@@ -1242,63 +2498,94 @@ Events:
             "temperature": 0.0,
             "max_tokens": 8192,
         }
-
-        for api_key in api_keys:
+        post_options = {}
+        if expected_ids:
+            base_payload["stream"] = True
+            post_options["stream"] = True
+
+        session = self._get_http_session(self.openrouter_base_url, max_retries=0)
+        attempts = {api_key: 0 for api_key in api_keys}
+        while True:
+            api_key, wait = self._acquire_openrouter_key(
+                [key for key in api_keys if attempts[key] <= max_retries]
+            )
+            if api_key is None:
+                return None
+            if wait > 0:
+                logger.warning(f"All OpenRouter keys cooling down, waiting {wait:.1f}s")
+                time.sleep(wait)
+            attempt = attempts[api_key]
+            attempts[api_key] += 1
+            key_label = f"key {api_keys.index(api_key) + 1}/{len(api_keys)}"
             headers = {
                 "Authorization": f"Bearer {api_key}",
                 "Content-Type": "application/json",
                 "HTTP-Referer": "https://akgularda.github.io/border-neighbor-threat-index/",
                 "X-Title": "BNTI Intelligence Pipeline",
             }
-            for attempt in range(max_retries + 1):
-                try:
+            outcome = {"cooldown_seconds": self.OPENROUTER_FAILURE_COOLDOWN_SECONDS}
+            started = time.monotonic()
+            resp = None
+            try:
+                payload = dict(base_payload)
+                payload["reasoning"] = {"effort": "none"}
+                self._acquire_openrouter_token()
+                resp = session.post(
+                    self.openrouter_base_url,
+                    headers=headers,
+                    json=payload,
+                    timeout=self.OPENROUTER_TIMEOUT_SECONDS,
+                    **post_options,
+                )
+                if resp.status_code == 400 and "Reasoning is mandatory" in resp.text:
+                    if expected_ids:
+                        resp.close()
                     payload = dict(base_payload)
-                    payload["reasoning"] = {"effort": "none"}
-                    resp = requests.post(
+                    self._acquire_openrouter_token()
+                    resp = session.post(
                         self.openrouter_base_url,
                         headers=headers,
                         json=payload,
                         timeout=self.OPENROUTER_TIMEOUT_SECONDS,
+                        **post_options,
                     )
-                    if resp.status_code == 400 and "Reasoning is mandatory" in resp.text:
-                        payload = dict(base_payload)
-                        resp = requests.post(
-                            self.openrouter_base_url,
-                            headers=headers,
-                            json=payload,
-                            timeout=self.OPENROUTER_TIMEOUT_SECONDS,
-                        )
 
-                    if resp.status_code == 429:
-                        if attempt < max_retries:
-                            wait = min(30, 5 * (attempt + 1))
-                            logger.warning(f"OpenRouter rate-limited, waiting {wait}s (attempt {attempt + 1})")
-                            time.sleep(wait)
-                            continue
-                        logger.warning("OpenRouter key exhausted after retry budget; trying next key")
-                        break
+                if resp.status_code == 429:
+                    cooldown = self._retry_after_seconds(resp)
+                    if cooldown is None:
+                        cooldown = min(30, 5 * (attempt + 1))
+                    outcome = {"cooldown_seconds": cooldown, "rate_limited": True}
+                    if attempt < max_retries:
+                        logger.warning(
+                            f"OpenRouter {key_label} rate-limited, cooling down {cooldown}s (attempt {attempt + 1})"
+                        )
+                    else:
+                        logger.warning(f"OpenRouter {key_label} exhausted after retry budget; trying next key")
+                    continue
 
-                    if resp.status_code in (401, 403):
-                        logger.warning("OpenRouter key rejected; trying next key")
-                        break
+                if resp.status_code in (401, 403):
+                    logger.warning(f"OpenRouter {key_label} rejected; trying next key")
+                    outcome = {"disabled": True}
+                    attempts[api_key] = max_retries + 1
+                    continue
 
-                    resp.raise_for_status()
+                resp.raise_for_status()
+                if expected_ids:
+                    content = self._read_openrouter_stream(resp, expected_ids)
+                else:
                     data = resp.json()
                     content = data.get("choices", [{}])[0].get("message", {}).get("content", "")
-                    if content:
-                        return content
-                    logger.warning("OpenRouter returned empty content")
-                    if attempt < max_retries:
-                        time.sleep(3)
-                        continue
-                    break
-                except Exception as e:
-                    logger.warning(f"OpenRouter call failed (attempt {attempt + 1}): {e}")
-                    if attempt < max_retries:
-                        time.sleep(3)
-                        continue
-                    break
-        return None
+                if content:
+                    outcome = {"latency_seconds": time.monotonic() - started}
+                    return content
+                logger.warning(f"OpenRouter returned empty content ({key_label})")
+            except Exception as e:
+                logger.warning(f"OpenRouter call failed ({key_label}, attempt {attempt + 1}): {e}")
+            finally:
+                # A streamed response holds its pooled connection until it is read or closed
+                if expected_ids and resp is not None:
+                    resp.close()
+                self._release_openrouter_key(api_key, **outcome)
 
     def _normalize_headline_for_llm(self, value):
         return re.sub(r"\s+", " ", str(value or "").replace('"', "'")).strip()
@@ -1354,12 +2641,44 @@ Events:
             headline_block += f' | Original: "{original_title}"'
         return headline_block
 
-    def _build_attribution_prompt(self, all_events, start_index=0):
+    def _event_indices(self, all_events, start_index=0, indices=None):
+        """Global event indices for a batch: explicit ones for salvage re-queries, else contiguous."""
+        if indices is not None:
+            return list(indices)
+        return list(range(start_index, start_index + len(all_events)))
+
+    def _prompt_parts(self, kind):
+        """Static (head, tail) around the headlines block, rendered once per prompt kind."""
+        parts = self.PROMPT_TEMPLATE_PARTS.get(kind)
+        if parts is None:
+            render = {
+                "attribution": self._render_attribution_prompt,
+                "country_audit": self._render_country_audit_prompt,
+                "combined": self._render_combined_attribution_prompt,
+            }[kind]
+            head, tail = render(self.PROMPT_HEADLINES_SLOT).split(self.PROMPT_HEADLINES_SLOT)
+            parts = self.PROMPT_TEMPLATE_PARTS.setdefault(kind, (head, tail))
+        return parts
+
+    def _assemble_prompt(self, kind, lines):
+        head, tail = self._prompt_parts(kind)
+        return head + "\n".join(lines) + tail
+
+    def _estimate_tokens(self, text):
+        """Rough token count: ~4 ASCII chars per token, non-Latin scripts tokenize much denser."""
+        ascii_chars = len(text.encode("ascii", "ignore"))
+        return math.ceil(
+            ascii_chars / self.PROMPT_ASCII_CHARS_PER_TOKEN
+            + (len(text) - ascii_chars) / self.PROMPT_NON_ASCII_CHARS_PER_TOKEN
+        )
+
+    def _build_attribution_prompt(self, all_events, start_index=0, indices=None):
         lines = []
-        for i, event in enumerate(all_events):
-            lines.append(f"{start_index + i + 1}. {self._format_headline_for_prompt(event)}")
+        for global_idx, event in zip(self._event_indices(all_events, start_index, indices), all_events):
+            lines.append(f"{global_idx + 1}. {self._format_headline_for_prompt(event)}")
+        return self._assemble_prompt("attribution", lines)
 
-        headlines_block = "\n".join(lines)
+    def _render_attribution_prompt(self, headlines_block):
         return f"""You are a geopolitical intelligence analyst for Turkiye's border threat monitoring system.
 Turkiye's border neighbor countries are: Armenia, Georgia, Greece, Iran, Iraq, Syria, Bulgaria.
 
@@ -1459,7 +2778,12 @@ Respond ONLY with a valid JSON array, no explanation, no markdown:
                     return parsed
         return None
 
-    def _parse_attribution_response(self, response_text, all_events, start_index=0):
+    def _parse_attribution_response(self, response_text, all_events, start_index=0, indices=None, salvage=False):
+        """Map global index -> attribution; all-or-nothing unless salvage keeps the valid items.
+
+        Salvage only forgives duplicate, missing or invalid rows: an ID outside the batch
+        rejects the whole response in either mode.
+        """
         attribution_map = {}
         if not response_text:
             return attribution_map
@@ -1469,22 +2793,33 @@ Respond ONLY with a valid JSON array, no explanation, no markdown:
             logger.warning("OpenRouter response is not a JSON array")
             return attribution_map
 
-        expected_ids = set(range(start_index + 1, start_index + len(all_events) + 1))
+        expected_ids = {idx + 1 for idx in self._event_indices(all_events, start_index, indices)}
         seen_ids = set()
+        rejected_ids = set()
         valid_categories = set(self.category_weights.keys())
 
         for item in parsed:
             if not isinstance(item, dict):
+                if salvage:
+                    continue
                 return {}
 
             idx = item.get("id")
+            if idx not in expected_ids:
+                # An ID from outside the batch means the rows are shifted, so none can be trusted
+                if salvage:
+                    logger.warning(f"Attribution response has unexpected id {idx!r}; rejecting the batch")
+                return {}
             primary_country = self._resolve_border_country(item.get("primary_country"))
             category = str(item.get("category", "")).strip().lower()
             subject = str(item.get("subject", "")).strip()
-            if idx not in expected_ids or idx in seen_ids:
-                return {}
-            if primary_country is None or category not in valid_categories or not subject:
-                return {}
+            valid = primary_country is not None and category in valid_categories and bool(subject)
+            if idx in seen_ids or not valid:
+                if not salvage:
+                    return {}
+                if idx in seen_ids:
+                    rejected_ids.add(idx)
+                continue
 
             seen_ids.add(idx)
             attribution_map[int(idx) - 1] = {
@@ -1493,47 +2828,93 @@ Respond ONLY with a valid JSON array, no explanation, no markdown:
                 "subject": subject,
             }
 
+        if salvage:
+            # An ID answered twice is ambiguous, so neither answer is kept
+            for idx in rejected_ids:
+                attribution_map.pop(int(idx) - 1, None)
+            return attribution_map
         if seen_ids != expected_ids:
             return {}
         return attribution_map
 
-    def _resolve_attribution_batch(self, all_events, start_index=0):
-        prompt = self._build_attribution_prompt(all_events, start_index=start_index)
-        response = self._call_openrouter(prompt)
-        parsed = self._parse_attribution_response(response, all_events, start_index=start_index)
+    def _resolve_attribution_batch(self, all_events, start_index=0, indices=None):
+        return self._resolve_llm_items(
+            "attribution",
+            all_events,
+            self._event_indices(all_events, start_index, indices),
+            lambda events, ids: self._build_attribution_prompt(events, indices=ids),
+            lambda text, events, ids, salvage: self._parse_attribution_response(
+                text, events, indices=ids, salvage=salvage
+            ),
+            lambda events, ids: self._resolve_attribution_batch(events, indices=ids),
+        )
+
+    def _resolve_llm_items(self, stage, all_events, indices, build_prompt, parse_response, resolve_subset):
+        """One LLM call for the batch; on an incomplete answer, re-query the gaps or bisect.
+
+        In salvage mode the valid items are kept and only the missing IDs go back through
+        resolve_subset; otherwise the batch is split in half until every item resolves.
+        """
+        salvage = getattr(self, "openrouter_salvage_mode", False)
+        prompt = build_prompt(all_events, indices)
+        started = time.monotonic()
+        response = self._call_llm(prompt, [idx + 1 for idx in indices])
+        parsed = parse_response(response, all_events, indices, salvage)
+        if response is not None:
+            self._observe_llm_batch(len(all_events), len(parsed) == len(all_events), time.monotonic() - started, prompt)
         if len(parsed) == len(all_events):
             return parsed
+        if salvage and parsed:
+            return self._requery_missing_items(stage, all_events, indices, parsed, resolve_subset)
         if len(all_events) == 1:
             return {}
 
         logger.warning(
-            f"LLM attribution batch {start_index + 1}-{start_index + len(all_events)} invalid; retrying in smaller chunks"
+            f"LLM {stage} batch {self._describe_indices(indices)} invalid; retrying in smaller chunks"
         )
         midpoint = len(all_events) // 2
-        left_events = all_events[:midpoint]
-        right_events = all_events[midpoint:]
-        left_map = self._resolve_attribution_batch(left_events, start_index=start_index)
-        if len(left_map) != len(left_events):
+        left_map = resolve_subset(all_events[:midpoint], indices[:midpoint])
+        if len(left_map) != midpoint:
             return {}
-        right_map = self._resolve_attribution_batch(right_events, start_index=start_index + midpoint)
-        if len(right_map) != len(right_events):
+        right_map = resolve_subset(all_events[midpoint:], indices[midpoint:])
+        if len(right_map) != len(all_events) - midpoint:
             return {}
         merged = dict(left_map)
         merged.update(right_map)
         return merged
 
-    def _build_country_audit_prompt(self, all_events, attribution_map, start_index=0):
+    def _describe_indices(self, indices):
+        if indices == list(range(indices[0], indices[0] + len(indices))):
+            return f"{indices[0] + 1}-{indices[-1] + 1}"
+        return ",".join(str(idx + 1) for idx in indices)
+
+    def _requery_missing_items(self, stage, all_events, indices, parsed, resolve):
+        """Keep the salvaged items and send only the missing or invalid IDs back to the LLM."""
+        missing_positions = [pos for pos, idx in enumerate(indices) if idx not in parsed]
+        missing_indices = [indices[pos] for pos in missing_positions]
+        logger.warning(
+            f"LLM {stage} salvaged {len(parsed)}/{len(indices)} items; "
+            f"re-querying {self._describe_indices(missing_indices)}"
+        )
+        retried = resolve([all_events[pos] for pos in missing_positions], missing_indices)
+        if len(retried) != len(missing_indices):
+            return {}
+        merged = dict(parsed)
+        merged.update(retried)
+        return merged
+
+    def _build_country_audit_prompt(self, all_events, attribution_map, start_index=0, indices=None):
         lines = []
-        for i, event in enumerate(all_events):
-            global_idx = start_index + i
+        for global_idx, event in zip(self._event_indices(all_events, start_index, indices), all_events):
             proposed = attribution_map.get(global_idx, {})
             proposed_country = proposed.get("primary_country", "IRRELEVANT")
             lines.append(
                 f'{global_idx + 1}. {self._format_headline_for_prompt(event)} | '
                 f'Proposed primary_country: "{proposed_country}"'
             )
+        return self._assemble_prompt("country_audit", lines)
 
-        headlines_block = "\n".join(lines)
+    def _render_country_audit_prompt(self, headlines_block):
         return f"""You are auditing country attribution for Turkiye's border threat monitoring system.
 Return the final published country for each headline.
 Ignore the publication language, outlet nationality, and feed source.
@@ -1555,7 +2936,7 @@ Items:
 Respond ONLY with a valid JSON array, no explanation, no markdown:
 [{{"id": 1, "final_country": "Iran"}}, {{"id": 2, "final_country": "IRRELEVANT"}}]"""
 
-    def _parse_country_audit_response(self, response_text, all_events, start_index=0):
+    def _parse_country_audit_response(self, response_text, all_events, start_index=0, indices=None, salvage=False):
         audit_map = {}
         if not response_text:
             return audit_map
@@ -1565,70 +2946,117 @@ Respond ONLY with a valid JSON array, no explanation, no markdown:
             logger.warning("Country audit response is not a JSON array")
             return audit_map
 
-        expected_ids = set(range(start_index + 1, start_index + len(all_events) + 1))
+        expected_ids = {idx + 1 for idx in self._event_indices(all_events, start_index, indices)}
         seen_ids = set()
+        rejected_ids = set()
         for item in parsed:
             if not isinstance(item, dict):
+                if salvage:
+                    continue
                 return {}
 
             idx = item.get("id")
-            final_country = self._resolve_border_country(item.get("final_country"))
-            if idx not in expected_ids or idx in seen_ids or final_country is None:
+            if idx not in expected_ids:
+                if salvage:
+                    logger.warning(f"Country audit response has unexpected id {idx!r}; rejecting the batch")
                 return {}
+            final_country = self._resolve_border_country(item.get("final_country"))
+            if idx in seen_ids or final_country is None:
+                if not salvage:
+                    return {}
+                if idx in seen_ids:
+                    rejected_ids.add(idx)
+                continue
 
             seen_ids.add(idx)
             audit_map[int(idx) - 1] = {
                 "final_country": final_country,
             }
 
+        if salvage:
+            for idx in rejected_ids:
+                audit_map.pop(int(idx) - 1, None)
+            return audit_map
         if seen_ids != expected_ids:
             return {}
         return audit_map
 
-    def _slice_attribution_map(self, attribution_map, start_index, event_count):
-        return {
-            idx: attribution_map[idx]
-            for idx in range(start_index, start_index + event_count)
-            if idx in attribution_map
-        }
+    def _build_combined_attribution_prompt(self, all_events, start_index=0, indices=None):
+        """Attribution prompt with the country audit folded in, answered in one response."""
+        lines = []
+        for global_idx, event in zip(self._event_indices(all_events, start_index, indices), all_events):
+            lines.append(f"{global_idx + 1}. {self._format_headline_for_prompt(event)}")
+        return self._assemble_prompt("combined", lines)
+
+    def _render_combined_attribution_prompt(self, headlines_block):
+        head, _ = self._prompt_parts("attribution")
+        instructions = head.rsplit("\n\nHeadlines:\n", 1)[0]
+        instructions = instructions.replace("do THREE things:", "do FOUR things:").replace(
+            "3. Write a short subject phrase describing the main thing the headline is about.",
+            "3. Write a short subject phrase describing the main thing the headline is about.\n"
+            "4. Audit your primary_country and return the final published country as final_country.",
+        )
+        return f"""{instructions}
 
-    def _resolve_country_audit_batch(self, all_events, attribution_map, start_index=0):
-        prompt = self._build_country_audit_prompt(all_events, attribution_map, start_index=start_index)
-        response = self._call_openrouter(prompt)
-        parsed = self._parse_country_audit_response(response, all_events, start_index=start_index)
-        if len(parsed) == len(all_events):
-            return parsed
-        if len(all_events) == 1:
-            return {}
+Country audit rules (final_country):
+- Treat primary_country as a candidate guess and re-check it against the headline itself.
+- Ignore the publication language, outlet nationality, and feed source.
+- final_country must be one of: Armenia, Georgia, Greece, Iran, Iraq, Syria, Bulgaria, IRRELEVANT.
+- If primary_country is wrong, replace it with the correct border country in final_country.
+- If no single border country is clearly the direct main subject, final_country is IRRELEVANT.
+- Do not keep a country just because the article came from that country's media.
 
-        logger.warning(
-            f"LLM country audit batch {start_index + 1}-{start_index + len(all_events)} invalid; retrying in smaller chunks"
+Headlines:
+{headlines_block}
+
+Respond ONLY with a valid JSON array, no explanation, no markdown:
+[{{\"id\": 1, \"primary_country\": \"Syria\", \"category\": \"neutral\", \"subject\": \"Syrian municipal reconstruction\", \"final_country\": \"Syria\"}}, {{\"id\": 2, \"primary_country\": \"IRRELEVANT\", \"category\": \"neutral\", \"subject\": \"Israeli domestic cost pressures\", \"final_country\": \"IRRELEVANT\"}}]"""
+
+    def _parse_combined_attribution_response(self, response_text, all_events, start_index=0, indices=None, salvage=False):
+        """Validate each item against both the attribution and the country audit rules."""
+        attribution_map = self._parse_attribution_response(
+            response_text, all_events, start_index=start_index, indices=indices, salvage=salvage
         )
-        midpoint = len(all_events) // 2
-        left_events = all_events[:midpoint]
-        right_events = all_events[midpoint:]
-
-        left_attribution_map = self._slice_attribution_map(attribution_map, start_index, midpoint)
-        right_attribution_map = self._slice_attribution_map(
-            attribution_map,
-            start_index + midpoint,
-            len(right_events),
+        if not attribution_map:
+            return {}
+        audit_map = self._parse_country_audit_response(
+            response_text, all_events, start_index=start_index, indices=indices, salvage=salvage
+        )
+        return self._merge_audited_batch(
+            {idx: result for idx, result in attribution_map.items() if idx in audit_map},
+            audit_map,
         )
 
-        left_map = self._resolve_country_audit_batch(left_events, left_attribution_map, start_index=start_index)
-        if len(left_map) != len(left_events):
-            return {}
-        right_map = self._resolve_country_audit_batch(
-            right_events,
-            right_attribution_map,
-            start_index=start_index + midpoint,
+    def _resolve_combined_batch(self, all_events, start_index=0, indices=None):
+        return self._resolve_llm_items(
+            "combined attribution",
+            all_events,
+            self._event_indices(all_events, start_index, indices),
+            lambda events, ids: self._build_combined_attribution_prompt(events, indices=ids),
+            lambda text, events, ids, salvage: self._parse_combined_attribution_response(
+                text, events, indices=ids, salvage=salvage
+            ),
+            lambda events, ids: self._resolve_combined_batch(events, indices=ids),
         )
-        if len(right_map) != len(right_events):
-            return {}
 
-        merged = dict(left_map)
-        merged.update(right_map)
-        return merged
+    def _select_attribution_map(self, attribution_map, indices):
+        return {idx: attribution_map[idx] for idx in indices if idx in attribution_map}
+
+    def _resolve_country_audit_batch(self, all_events, attribution_map, start_index=0, indices=None):
+        return self._resolve_llm_items(
+            "country audit",
+            all_events,
+            self._event_indices(all_events, start_index, indices),
+            lambda events, ids: self._build_country_audit_prompt(
+                events, self._select_attribution_map(attribution_map, ids), indices=ids
+            ),
+            lambda text, events, ids, salvage: self._parse_country_audit_response(
+                text, events, indices=ids, salvage=salvage
+            ),
+            lambda events, ids: self._resolve_country_audit_batch(
+                events, self._select_attribution_map(attribution_map, ids), indices=ids
+            ),
+        )
 
     def _collect_candidate_events(self, country_candidates):
         all_events = []
@@ -1770,6 +3198,198 @@ Respond ONLY with a valid JSON array, no explanation, no markdown:
             "baseline_active_countries": baseline["active_countries"],
         }
 
+    def _llm_batch_failure(self, reason, start):
+        return {"publishable": False, "reason": reason, "failed_batch_start": start}
+
+    def _merge_audited_batch(self, batch_map, audit_map):
+        merged_map = {}
+        for idx, result in batch_map.items():
+            merged = dict(result)
+            merged["final_country"] = audit_map[idx]["final_country"]
+            merged_map[idx] = merged
+        return merged_map
+
+    def _attribution_mode(self):
+        return getattr(self, "attribution_mode", "two_pass")
+
+    def _resolve_llm_batch(self, batch_events, start):
+        """Attribution then country audit for one batch; returns (attribution map, failure or None)."""
+        if self._attribution_mode() == "combined":
+            batch_map = self._resolve_combined_batch(batch_events, start_index=start)
+            if len(batch_map) != len(batch_events):
+                logger.warning(f"LLM combined attribution failed for batch starting at {start + 1}")
+                return {}, self._llm_batch_failure("llm_call_failed", start)
+            return batch_map, None
+
+        batch_map = self._resolve_attribution_batch(batch_events, start_index=start)
+        if len(batch_map) != len(batch_events):
+            logger.warning(f"LLM attribution failed for batch starting at {start + 1}")
+            return {}, self._llm_batch_failure("llm_call_failed", start)
+
+        audit_map = self._resolve_country_audit_batch(batch_events, batch_map, start_index=start)
+        if len(audit_map) != len(batch_events):
+            logger.warning(f"LLM country audit failed for batch starting at {start + 1}")
+            return {}, self._llm_batch_failure("country_audit_failed", start)
+
+        return self._merge_audited_batch(batch_map, audit_map), None
+
+    def _resolve_llm_batches(self, all_events):
+        """Resolve every batch and merge the results by global index.
+
+        With openrouter_max_in_flight above 1 the attribution and audit passes run as a
+        pipeline; otherwise batches are walked one by one, attribution then audit. Each
+        batch is sized when it is dispatched, so adaptive sizing applies mid-run. In
+        combined mode a single call per batch returns both passes' fields.
+        """
+        max_in_flight = max(int(getattr(self, "openrouter_max_in_flight", 1)), 1)
+        if max_in_flight > 1:
+            return self._run_llm_pipeline(all_events, max_in_flight)
+
+        attribution_map = {}
+        start = 0
+        while start < len(all_events):
+            end = self._plan_llm_batch(all_events, start)
+            batch_map, failure = self._resolve_llm_batch(all_events[start:end], start)
+            if failure:
+                return attribution_map, failure
+            attribution_map.update(batch_map)
+            start = end
+        return attribution_map, None
+
+    def _resolve_attributions(self, all_events):
+        """Serve cached verdicts and send only cache misses through the LLM batches."""
+        cached_map, pending_positions = self._lookup_attribution_cache(all_events)
+        if cached_map:
+            logger.info(
+                f"Attribution cache: {len(cached_map)} headlines cached, {len(pending_positions)} sent to the LLM"
+            )
+        pending_events = [all_events[idx] for idx in pending_positions]
+        resolved_map, failure = self._resolve_llm_batches(pending_events) if pending_events else ({}, None)
+
+        fresh_map = {pending_positions[idx]: result for idx, result in resolved_map.items()}
+        self._store_attribution_results(all_events, fresh_map)
+        self._save_attribution_cache()
+        llm_metrics = self._llm_metrics_summary()
+        if llm_metrics:
+            self._save_llm_tuning()
+            logger.info(
+                f"LLM batches for {llm_metrics['model']}: sizes {llm_metrics['batch_sizes']}, "
+                f"{llm_metrics['failed_calls']}/{llm_metrics['calls']} unparsed calls, "
+                f"next batch size {llm_metrics['next_batch_size']}"
+            )
+        if failure:
+            failure = dict(failure)
+            failure["failed_batch_start"] = pending_positions[failure["failed_batch_start"]]
+            return {}, failure
+
+        attribution_map = dict(cached_map)
+        attribution_map.update(fresh_map)
+        return attribution_map, None
+
+    def _run_llm_pipeline(self, all_events, max_in_flight):
+        """Attribution stage -> queue -> audit stage, so auditing batch N overlaps attributing N+1.
+
+        max_in_flight is split between the two stages' workers. On failure the batch with
+        the lowest start wins, exactly as the sequential walk would report it, and work on
+        later batches that has not started yet is skipped.
+        """
+        audit_queue = queue.Queue()
+        state_lock = threading.Lock()
+        attribution_map = {}
+        failures = []
+        errors = []
+        cursor = {"next": 0}
+
+        def next_batch():
+            with state_lock:
+                start = cursor["next"]
+                if start >= len(all_events):
+                    return None
+                end = self._plan_llm_batch(all_events, start)
+                cursor["next"] = end
+            return start, all_events[start:end]
+
+        def superseded(start):
+            with state_lock:
+                return any(failure["failed_batch_start"] < start for failure in failures)
+
+        def record_failure(reason, start):
+            with state_lock:
+                failures.append(self._llm_batch_failure(reason, start))
+
+        def attribution_worker():
+            while True:
+                batch = next_batch()
+                if batch is None:
+                    return
+                start, batch_events = batch
+                if superseded(start):
+                    continue
+                if combined:
+                    batch_map, failure = self._resolve_llm_batch(batch_events, start)
+                    with state_lock:
+                        if failure:
+                            failures.append(failure)
+                        else:
+                            attribution_map.update(batch_map)
+                    continue
+                batch_map = self._resolve_attribution_batch(batch_events, start_index=start)
+                if len(batch_map) != len(batch_events):
+                    logger.warning(f"LLM attribution failed for batch starting at {start + 1}")
+                    record_failure("llm_call_failed", start)
+                    continue
+                audit_queue.put((start, batch_events, batch_map))
+
+        def audit_worker():
+            while True:
+                item = audit_queue.get()
+                if item is None:
+                    return
+                start, batch_events, batch_map = item
+                if superseded(start):
+                    continue
+                try:
+                    audit_map = self._resolve_country_audit_batch(batch_events, batch_map, start_index=start)
+                except Exception as e:
+                    with state_lock:
+                        errors.append(e)
+                    continue
+                if len(audit_map) != len(batch_events):
+                    logger.warning(f"LLM country audit failed for batch starting at {start + 1}")
+                    record_failure("country_audit_failed", start)
+                    continue
+                merged = self._merge_audited_batch(batch_map, audit_map)
+                with state_lock:
+                    attribution_map.update(merged)
+
+        combined = self._attribution_mode() == "combined"
+        expected_batches = math.ceil(len(all_events) / self._current_llm_batch_size())
+        audit_workers = 0 if combined else min(max(max_in_flight // 2, 1), expected_batches)
+        attribution_workers = min(max(max_in_flight - audit_workers, 1), expected_batches)
+        logger.info(
+            f"Resolving ~{expected_batches} LLM batches as a pipeline "
+            f"({attribution_workers} attribution / {audit_workers} audit workers)..."
+        )
+        audit_threads = [threading.Thread(target=audit_worker, daemon=True) for _ in range(audit_workers)]
+        for thread in audit_threads:
+            thread.start()
+        try:
+            with concurrent.futures.ThreadPoolExecutor(max_workers=attribution_workers) as executor:
+                attribution_futures = [executor.submit(attribution_worker) for _ in range(attribution_workers)]
+        finally:
+            for _ in audit_threads:
+                audit_queue.put(None)
+            for thread in audit_threads:
+                thread.join()
+
+        for future in attribution_futures:
+            future.result()
+        if errors:
+            raise errors[0]
+        if failures:
+            return attribution_map, min(failures, key=lambda item: item["failed_batch_start"])
+        return attribution_map, None
+
     def build_candidate_snapshot(self, country_candidates):
         history_records = self._trim_history(self.load_history())
         all_events = self._collect_candidate_events(country_candidates)
@@ -1779,24 +3399,9 @@ Respond ONLY with a valid JSON array, no explanation, no markdown:
                 "reason": "no_candidate_events",
             }
 
-        attribution_map = {}
-        batch_size = max(int(getattr(self, "openrouter_batch_size", 10)), 1)
-        for start in range(0, len(all_events), batch_size):
-            batch_events = all_events[start:start + batch_size]
-            batch_map = self._resolve_attribution_batch(batch_events, start_index=start)
-            if len(batch_map) != len(batch_events):
-                logger.warning(f"LLM attribution failed for batch starting at {start + 1}")
-                return {"publishable": False, "reason": "llm_call_failed", "failed_batch_start": start}
-
-            audit_map = self._resolve_country_audit_batch(batch_events, batch_map, start_index=start)
-            if len(audit_map) != len(batch_events):
-                logger.warning(f"LLM country audit failed for batch starting at {start + 1}")
-                return {"publishable": False, "reason": "country_audit_failed", "failed_batch_start": start}
-
-            for idx, result in batch_map.items():
-                merged = dict(result)
-                merged["final_country"] = audit_map[idx]["final_country"]
-                attribution_map[idx] = merged
+        attribution_map, failure = self._resolve_attributions(all_events)
+        if failure:
+            return failure
 
         if len(attribution_map) != len(all_events):
             return {"publishable": False, "reason": "partial_attribution_map"}
@@ -1828,16 +3433,24 @@ Respond ONLY with a valid JSON array, no explanation, no markdown:
             "status": status,
             "history_records": history_records,
             "regional_summary_6h": regional_summary,
+            "llm_metrics": self._llm_metrics_summary(),
         }
 
-    def run(self):
+    def run(self, engine=None, attribution_mode=None):
         os.makedirs(self.output_path, exist_ok=True)
+        if attribution_mode:
+            self.attribution_mode = attribution_mode
         country_candidates = {country: [] for country in self.border_countries}
 
+        country_entries = self._fetch_country_entries(engine)
         for country, urls in self.rss_urls.items():
             if not urls:
                 continue
-            _, candidates = self.process_country(country, urls)
+            _, candidates = self.process_country(
+                country,
+                urls,
+                fetched_entries=country_entries.get(country, []),
+            )
             country_candidates[country] = candidates
 
         candidate = self.build_candidate_snapshot(country_candidates)
@@ -1849,9 +3462,25 @@ Respond ONLY with a valid JSON array, no explanation, no markdown:
         logger.info(f"Analysis Complete. Composite Index: {candidate['turkey_index']:.2f}")
         return True
 if __name__ == "__main__":
+    import argparse
+
+    arg_parser = argparse.ArgumentParser(description="Border Neighbours Threat Index analyzer")
+    arg_parser.add_argument(
+        "--engine",
+        choices=BNTIAnalyzer.FETCH_ENGINES,
+        default=None,
+        help="Feed fetch engine (default: $BNTI_FETCH_ENGINE or threads)",
+    )
+    arg_parser.add_argument(
+        "--attribution-mode",
+        choices=BNTIAnalyzer.ATTRIBUTION_MODES,
+        default=None,
+        help="LLM attribution mode (default: $OPENROUTER_ATTRIBUTION_MODE or two_pass)",
+    )
+    args = arg_parser.parse_args()
     try:
         analyzer = BNTIAnalyzer()
-        analyzer.run()
+        analyzer.run(engine=args.engine, attribution_mode=args.attribution_mode)
     except Exception as e:
         # NEVER crash - log and exit gracefully
         logging.error(f"Analyzer encountered a critical error: {e}")
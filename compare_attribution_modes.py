@@ -0,0 +1,137 @@
+"""
+Compare the two-pass and combined OpenRouter attribution modes on the same headlines.
+
+Live:    python compare_attribution_modes.py [--limit N] [--save-dir DIR]
+Offline: python compare_attribution_modes.py --two-pass two_pass.json --combined combined.json
+
+Live runs read the events in bnti_data.json, resolve them once per mode with the
+production prompts and parsers, and report call counts, wall time and agreement.
+Saved result files can be compared again later without spending any API calls.
+"""
+
+import argparse
+import json
+import os
+import time
+
+import test_reattribution as dry_run
+
+AGREEMENT_FIELDS = ("final_country", "primary_country", "category")
+
+
+def attribution_agreement(two_pass_map, combined_map):
+    """Per-field agreement rates over the headlines both modes resolved."""
+    shared = sorted(set(two_pass_map) & set(combined_map))
+    report = {
+        "compared": len(shared),
+        "two_pass_only": len(set(two_pass_map) - set(combined_map)),
+        "combined_only": len(set(combined_map) - set(two_pass_map)),
+    }
+    for field in AGREEMENT_FIELDS + ("all_fields",):
+        fields = AGREEMENT_FIELDS if field == "all_fields" else (field,)
+        matches = sum(
+            1
+            for idx in shared
+            if all(two_pass_map[idx].get(name) == combined_map[idx].get(name) for name in fields)
+        )
+        report[field] = round(matches / len(shared), 4) if shared else None
+    return report
+
+
+def load_events(limit=None):
+    data_path = os.path.join(os.path.dirname(os.path.abspath(__file__)), "bnti_data.json")
+    with open(data_path, "r", encoding="utf-8") as handle:
+        data = json.load(handle)
+    events = [
+        event
+        for country in dry_run.BORDER_COUNTRIES
+        for event in data.get("countries", {}).get(country, {}).get("events", [])
+    ]
+    return events[:limit] if limit else events
+
+
+def run_mode(helper, events, mode):
+    helper.attribution_mode = mode
+    calls = {"count": 0}
+    call_openrouter = helper._call_openrouter
+
+    def counted_call(prompt, max_retries=2, expected_ids=None):
+        calls["count"] += 1
+        return call_openrouter(prompt, max_retries=max_retries, expected_ids=expected_ids)
+
+    helper._call_openrouter = counted_call
+    started = time.monotonic()
+    try:
+        results, failure = helper._resolve_llm_batches(events)
+    finally:
+        helper._call_openrouter = call_openrouter
+    return {
+        "mode": mode,
+        "calls": calls["count"],
+        "seconds": round(time.monotonic() - started, 2),
+        "failure": failure,
+        "results": {str(idx): result for idx, result in sorted(results.items())},
+    }
+
+
+def load_run(path):
+    with open(path, "r", encoding="utf-8") as handle:
+        run = json.load(handle)
+    run["results"] = {int(idx): result for idx, result in run["results"].items()}
+    return run
+
+
+def report(two_pass_run, combined_run):
+    for run in (two_pass_run, combined_run):
+        failure = run.get("failure")
+        status = f"failed at {failure['failed_batch_start'] + 1}" if failure else "ok"
+        print(
+            f"{run['mode']:<10} {len(run['results']):4d} resolved  {run.get('calls', 0):4d} calls  "
+            f"{run.get('seconds', 0):8.1f} s  {status}"
+        )
+
+    agreement = attribution_agreement(
+        {int(idx): result for idx, result in two_pass_run["results"].items()},
+        {int(idx): result for idx, result in combined_run["results"].items()},
+    )
+    print(f"\nAgreement over {agreement['compared']} headlines resolved by both modes:")
+    for field in AGREEMENT_FIELDS + ("all_fields",):
+        rate = agreement[field]
+        print(f"  {field:<16} {'n/a' if rate is None else f'{rate:.1%}'}")
+    return agreement
+
+
+def main():
+    arg_parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    arg_parser.add_argument("--limit", type=int, default=None, help="Only use the first N headlines")
+    arg_parser.add_argument("--save-dir", default=None, help="Write each mode's results here as JSON")
+    arg_parser.add_argument("--two-pass", default=None, help="Saved two_pass results to compare offline")
+    arg_parser.add_argument("--combined", default=None, help="Saved combined results to compare offline")
+    args = arg_parser.parse_args()
+
+    if args.two_pass or args.combined:
+        if not (args.two_pass and args.combined):
+            arg_parser.error("--two-pass and --combined must be given together")
+        report(load_run(args.two_pass), load_run(args.combined))
+        return
+
+    if not dry_run.API_KEY:
+        print("ERROR: Set OPENROUTER_API_KEY env var!")
+        return
+
+    events = load_events(args.limit)
+    helper = dry_run.build_helper()
+    helper._ensure_translated_titles(events)
+    print(f"Comparing attribution modes on {len(events)} headlines ({dry_run.MODEL})\n")
+    runs = {mode: run_mode(helper, events, mode) for mode in ("two_pass", "combined")}
+
+    if args.save_dir:
+        os.makedirs(args.save_dir, exist_ok=True)
+        for mode, run in runs.items():
+            with open(os.path.join(args.save_dir, f"{mode}.json"), "w", encoding="utf-8") as handle:
+                json.dump(run, handle, ensure_ascii=False, indent=2)
+    report(runs["two_pass"], runs["combined"])
+
+
+if __name__ == "__main__":
+    main()
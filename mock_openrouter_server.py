@@ -0,0 +1,280 @@
+"""
+Local stand-in for the OpenRouter chat completions endpoint.
+
+Usage: python mock_openrouter_server.py [--port 8765] [--latency 0.2] [--rate-429 0.05]
+                                        [--malformed-rate 0.05] [--reasoning-mandatory]
+
+Answers the analyzer's attribution, country audit and combined prompts from their
+numbered headline lines, so a run can be exercised end to end without spending
+quota. Failure modes are drawn from a seeded RNG: 429s with Retry-After, malformed
+replies (truncated JSON, a missing item, or prose) and, optionally, the
+"Reasoning is mandatory" 400 for requests that try to disable reasoning.
+Requests with "stream": true get SSE chunks paced over the response latency;
+--trailing-seconds adds chatter after the JSON, as rambling models do.
+GET /stats returns the request counters as JSON. Point the analyzer or the
+test_reattribution.py dry run at it with
+OPENROUTER_BASE_URL=http://127.0.0.1:8765/api/v1/chat/completions.
+"""
+
+import argparse
+import json
+import random
+import re
+import threading
+import time
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+BORDER_COUNTRIES = ("Armenia", "Georgia", "Greece", "Iran", "Iraq", "Syria", "Bulgaria")
+CONFLICT_WORDS = ("strike", "attack", "clash", "shelling", "drone", "missile", "offensive")
+REASONING_MANDATORY_ERROR = '{"error":{"message":"Reasoning is mandatory for this endpoint and cannot be disabled."}}'
+LINE_PATTERN = re.compile(r'^(\d+)\. Headline: "(.*?)"(?:.*Proposed primary_country: "(.*?)")?$')
+MALFORMED_KINDS = ("truncated", "missing_item", "prose")
+TRAILING_TEXT = "\n\nNote: these labels reflect only the headline wording and may need review."
+STREAM_CHUNK_CHARS = 24
+
+
+def estimate_tokens(text):
+    ascii_chars = len(text.encode("ascii", "ignore"))
+    return int(ascii_chars / 4 + (len(text) - ascii_chars) / 1.5)
+
+
+def headline_country(title):
+    lowered = title.lower()
+    for country in BORDER_COUNTRIES:
+        if country.lower() in lowered:
+            return country
+    return "IRRELEVANT"
+
+
+def headline_category(title):
+    lowered = title.lower()
+    return "military_conflict" if any(word in lowered for word in CONFLICT_WORDS) else "neutral"
+
+
+def answer_prompt(prompt):
+    """Return (JSON array text, item count) for a recognised prompt, else (None, 0)."""
+    block = re.search(r"\n(?:Headlines|Items):\n(.*?)\n\nRespond", prompt, re.DOTALL)
+    if not block:
+        return None, 0
+    audit = "auditing country attribution" in prompt
+    combined = "final_country" in prompt and not audit
+    items = []
+    for line in block.group(1).splitlines():
+        match = LINE_PATTERN.match(line.strip())
+        if not match:
+            continue
+        idx, title, proposed = int(match.group(1)), match.group(2), match.group(3)
+        country = headline_country(title)
+        if audit:
+            items.append({"id": idx, "final_country": proposed or country})
+            continue
+        item = {
+            "id": idx,
+            "primary_country": country,
+            "category": headline_category(title),
+            "subject": f"{country} headline {idx}",
+        }
+        if combined:
+            item["final_country"] = country
+        items.append(item)
+    return json.dumps(items), len(items)
+
+
+class MockOpenRouter:
+    def __init__(self, latency=0.0, latency_per_item=0.0, rate_429=0.0, malformed_rate=0.0,
+                 reasoning_mandatory=False, retry_after=1, seed=7, token_estimator=estimate_tokens,
+                 trailing_seconds=0.0):
+        self.latency = latency
+        self.latency_per_item = latency_per_item
+        self.trailing_seconds = trailing_seconds
+        self.rate_429 = rate_429
+        self.malformed_rate = malformed_rate
+        self.reasoning_mandatory = reasoning_mandatory
+        self.retry_after = retry_after
+        self.token_estimator = token_estimator
+        self.rng = random.Random(seed)
+        self.lock = threading.Lock()
+        self.stats = {
+            "requests": 0,
+            "completions": 0,
+            "rate_limited": 0,
+            "malformed": 0,
+            "reasoning_rejected": 0,
+            "prompt_tokens": 0,
+            "items_answered": 0,
+            "streams": 0,
+            "streams_cancelled": 0,
+        }
+        self.server = None
+        self.thread = None
+
+    def _count(self, key, amount=1):
+        with self.lock:
+            self.stats[key] += amount
+
+    def _roll(self, rate):
+        with self.lock:
+            return self.rng.random() < rate
+
+    def handle(self, payload):
+        """Return (status, headers, body) for one chat completions request."""
+        self._count("requests")
+        if self.reasoning_mandatory and payload.get("reasoning"):
+            self._count("reasoning_rejected")
+            return 400, {}, REASONING_MANDATORY_ERROR
+        if self._roll(self.rate_429):
+            self._count("rate_limited")
+            return 429, {"Retry-After": str(self.retry_after)}, '{"error":{"message":"Rate limit exceeded"}}'
+
+        prompt = "".join(message.get("content", "") for message in payload.get("messages", []))
+        self._count("prompt_tokens", self.token_estimator(prompt))
+        content, item_count = answer_prompt(prompt)
+        if content is None:
+            content = "{}"
+
+        if item_count and self._roll(self.malformed_rate):
+            self._count("malformed")
+            with self.lock:
+                kind = self.rng.choice(MALFORMED_KINDS)
+            if kind == "truncated":
+                content = content[: len(content) // 2]
+            elif kind == "missing_item":
+                content = json.dumps(json.loads(content)[1:])
+            else:
+                content = "I could not classify these headlines reliably."
+        else:
+            self._count("items_answered", item_count)
+        self._count("completions")
+
+        generation_seconds = self.latency_per_item * item_count
+        if payload.get("stream"):
+            self._count("streams")
+            return 200, {"Content-Type": "text/event-stream"}, self._stream_chunks(content, generation_seconds)
+        time.sleep(self.latency + generation_seconds + self.trailing_seconds)
+        if self.trailing_seconds:
+            content += TRAILING_TEXT
+        return 200, {}, json.dumps({"choices": [{"message": {"content": content}}]})
+
+    def _stream_chunks(self, content, generation_seconds):
+        """Yield (delay before, SSE line) pairs: first-token latency, the reply, then any chatter."""
+        def pieces(text, seconds):
+            parts = [text[start:start + STREAM_CHUNK_CHARS] for start in range(0, len(text), STREAM_CHUNK_CHARS)]
+            for part in parts:
+                yield seconds / max(len(parts), 1), part
+
+        def event(text):
+            return "data: " + json.dumps({"choices": [{"delta": {"content": text}}]})
+
+        first = True
+        for delay, part in pieces(content, generation_seconds):
+            yield delay + (self.latency if first else 0.0), event(part)
+            first = False
+        if self.trailing_seconds:
+            for delay, part in pieces(TRAILING_TEXT, self.trailing_seconds):
+                yield delay, event(part)
+        yield 0.0, "data: [DONE]"
+
+    def snapshot(self):
+        with self.lock:
+            return dict(self.stats)
+
+    def start(self, host="127.0.0.1", port=0):
+        mock = self
+
+        class Handler(BaseHTTPRequestHandler):
+            def do_POST(self):
+                length = int(self.headers.get("Content-Length") or 0)
+                try:
+                    payload = json.loads(self.rfile.read(length) or b"{}")
+                except ValueError:
+                    payload = {}
+                status, headers, body = mock.handle(payload)
+                self._reply(status, headers, body)
+
+            def do_GET(self):
+                if self.path.rstrip("/") == "/stats":
+                    self._reply(200, {}, json.dumps(mock.snapshot()))
+                else:
+                    self._reply(404, {}, '{"error":{"message":"Not found"}}')
+
+            def _reply(self, status, headers, body):
+                if not isinstance(body, str):
+                    return self._reply_stream(status, headers, body)
+                data = body.encode("utf-8")
+                self.send_response(status)
+                self.send_header("Content-Type", headers.pop("Content-Type", "application/json"))
+                self.send_header("Content-Length", str(len(data)))
+                for name, value in headers.items():
+                    self.send_header(name, value)
+                self.end_headers()
+                self.wfile.write(data)
+
+            def _reply_stream(self, status, headers, chunks):
+                self.send_response(status)
+                for name, value in headers.items():
+                    self.send_header(name, value)
+                self.send_header("Cache-Control", "no-cache")
+                self.end_headers()
+                try:
+                    for delay, line in chunks:
+                        time.sleep(delay)
+                        self.wfile.write((line + "\n\n").encode("utf-8"))
+                        self.wfile.flush()
+                except (BrokenPipeError, ConnectionResetError):
+                    mock._count("streams_cancelled")
+                self.close_connection = True
+
+            def log_message(self, format, *args):
+                return None
+
+        self.server = ThreadingHTTPServer((host, port), Handler)
+        self.server.daemon_threads = True
+        self.thread = threading.Thread(target=self.server.serve_forever, daemon=True)
+        self.thread.start()
+        return self
+
+    @property
+    def url(self):
+        host, port = self.server.server_address[:2]
+        return f"http://{host}:{port}/api/v1/chat/completions"
+
+    def stop(self):
+        if self.server is not None:
+            self.server.shutdown()
+            self.server.server_close()
+            self.server = None
+
+
+def main():
+    arg_parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    arg_parser.add_argument("--host", default="127.0.0.1")
+    arg_parser.add_argument("--port", type=int, default=8765)
+    arg_parser.add_argument("--latency", type=float, default=0.2, help="Seconds per response")
+    arg_parser.add_argument("--latency-per-item", type=float, default=0.0, help="Extra seconds per headline")
+    arg_parser.add_argument("--trailing-seconds", type=float, default=0.0, help="Chatter generated after the JSON")
+    arg_parser.add_argument("--rate-429", type=float, default=0.0, help="Share of requests answered with 429")
+    arg_parser.add_argument("--malformed-rate", type=float, default=0.0, help="Share of malformed replies")
+    arg_parser.add_argument("--retry-after", type=int, default=1)
+    arg_parser.add_argument("--reasoning-mandatory", action="store_true")
+    arg_parser.add_argument("--seed", type=int, default=7)
+    args = arg_parser.parse_args()
+
+    mock = MockOpenRouter(
+        latency=args.latency,
+        latency_per_item=args.latency_per_item,
+        trailing_seconds=args.trailing_seconds,
+        rate_429=args.rate_429,
+        malformed_rate=args.malformed_rate,
+        reasoning_mandatory=args.reasoning_mandatory,
+        retry_after=args.retry_after,
+        seed=args.seed,
+    ).start(args.host, args.port)
+    print(f"Mock OpenRouter listening on {mock.url} (stats at /stats); Ctrl+C to stop")
+    try:
+        mock.thread.join()
+    except KeyboardInterrupt:
+        mock.stop()
+
+
+if __name__ == "__main__":
+    main()
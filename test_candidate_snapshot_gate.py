@@ -1,7 +1,9 @@
+import gzip
 import json
 import os
 import tempfile
 import unittest
+from unittest import mock
 
 import borderneighboursthreatindex as analyzer_module
 
@@ -82,6 +84,36 @@ class CandidateSnapshotGateTests(unittest.TestCase):
                 "Regional pressure remains centered on Iraq.",
             )
 
+    def test_dashboard_writer_serializes_once_into_every_output(self):
+        with tempfile.TemporaryDirectory() as tempdir:
+            analyzer = self.make_analyzer(tempdir)
+            analyzer.dashboard_output_format = "compact"
+            analyzer.dashboard_sidecars = ["gzip"]
+            json_path = os.path.join(tempdir, "bnti_data.json")
+            js_path = os.path.join(tempdir, "bnti_data.js")
+            with open(json_path + ".br", "wb") as handle:
+                handle.write(b"stale")
+            dashboard = {"meta": {"main_index": 5.1}, "countries": {"Greece": {"events": [{"title": "Ελβετία"}]}}}
+
+            with mock.patch.object(analyzer_module.json, "dumps", wraps=json.dumps) as dumps:
+                analyzer._write_dashboard_files(dashboard, json_path=json_path, js_path=js_path)
+
+            with open(json_path, "rb") as handle:
+                payload = handle.read()
+            with open(js_path, "rb") as handle:
+                script = handle.read()
+            with open(json_path + ".gz", "rb") as handle:
+                sidecar = gzip.decompress(handle.read())
+
+            self.assertEqual(dumps.call_count, 1)
+            self.assertEqual(json.loads(payload), dashboard)
+            self.assertNotIn(b"\n", payload)
+            self.assertIn("Ελβετία".encode("utf-8"), payload)
+            self.assertEqual(script, b"window.BNTI_DATA = " + payload + b";")
+            self.assertEqual(sidecar, payload)
+            self.assertFalse(os.path.exists(json_path + ".br"))
+            self.assertEqual(sorted(os.listdir(tempdir)), ["bnti_data.js", "bnti_data.json", "bnti_data.json.gz"])
+
     def test_workflow_uses_two_hour_schedule_backup_key_and_deploy_only_path(self):
         workflow_path = os.path.join(
             os.path.dirname(os.path.abspath(__file__)),
@@ -0,0 +1,165 @@
+import gc
+import json
+import os
+import sqlite3
+import tempfile
+import unittest
+from unittest import mock
+
+import borderneighboursthreatindex as analyzer_module
+
+
+class FeedCacheTests(unittest.TestCase):
+    def make_analyzer(self, home, backend="sqlite"):
+        analyzer = object.__new__(analyzer_module.BNTIAnalyzer)
+        with mock.patch.dict(os.environ, {"HOME": home, "BNTI_FEED_CACHE_BACKEND": backend}):
+            analyzer._init_cache()
+        return analyzer
+
+    def test_sqlite_cache_round_trips_records_per_url(self):
+        with tempfile.TemporaryDirectory() as home:
+            analyzer = self.make_analyzer(home)
+            analyzer._write_cache_entries(
+                "https://example.com/a",
+                [{"title": "A headline", "link": "https://example.com/a1", "published": "Sat, 28 Mar 2026 06:00:00 GMT"}],
+                validators={"etag": '"a"'},
+            )
+            analyzer._write_cache_entries(
+                "https://example.com/b",
+                [{"title": "B headline", "link": "https://example.com/b1"}],
+            )
+            analyzer._flush_feed_cache()
+
+            reopened = self.make_analyzer(home)
+            record = reopened._read_cache_record("https://example.com/a")
+            entries, age = reopened._get_cached_entries("https://example.com/b", reopened.cache_fresh_ttl_seconds)
+
+            self.assertTrue(reopened.feed_cache_file.endswith("feed_cache.sqlite3"))
+            self.assertEqual(record["etag"], '"a"')
+            self.assertEqual(record["entries"][0]["title"], "A headline")
+            self.assertEqual(entries, [{"title": "B headline", "link": "https://example.com/b1"}])
+            self.assertIsNotNone(age)
+            self.assertIsNone(reopened._read_cache_record("https://example.com/missing"))
+
+    def test_sqlite_cache_upsert_replaces_single_url(self):
+        with tempfile.TemporaryDirectory() as home:
+            analyzer = self.make_analyzer(home)
+            url = "https://example.com/a"
+            analyzer._write_cache_entries(url, [{"title": "Old", "link": "https://example.com/old"}])
+            analyzer._flush_feed_cache()
+            analyzer._write_cache_entries(url, [{"title": "New", "link": "https://example.com/new"}])
+            analyzer._flush_feed_cache()
+
+            connection = sqlite3.connect(analyzer.feed_cache_file)
+            rows = connection.execute("SELECT url, entries FROM feed_cache").fetchall()
+            connection.close()
+
+            self.assertEqual(len(rows), 1)
+            self.assertEqual(json.loads(rows[0][1])[0]["title"], "New")
+
+    def test_corrupt_sqlite_row_is_dropped_and_treated_as_a_miss(self):
+        with tempfile.TemporaryDirectory() as home:
+            analyzer = self.make_analyzer(home)
+            url = "https://example.com/a"
+            connection = sqlite3.connect(analyzer.feed_cache_file)
+            with connection:
+                connection.execute(
+                    "INSERT INTO feed_cache (url, fetched_at, entries) VALUES (?, ?, ?)",
+                    (url, "2026-03-28T06:00:00", '[{"title": "trunc'),
+                )
+
+            with self.assertLogs(analyzer_module.logger, level="WARNING"):
+                entries, age = analyzer._get_cached_entries(url, analyzer.cache_fresh_ttl_seconds)
+            remaining = connection.execute("SELECT COUNT(*) FROM feed_cache").fetchone()[0]
+            connection.close()
+
+            self.assertEqual((entries, age), (None, None))
+            self.assertEqual(remaining, 0)
+
+    def test_sqlite_cache_imports_legacy_json_once(self):
+        with tempfile.TemporaryDirectory() as home:
+            cache_dir = os.path.join(home, ".cache", "bnti")
+            os.makedirs(cache_dir)
+            with open(os.path.join(cache_dir, "feed_cache.json"), "w", encoding="utf-8") as handle:
+                json.dump({
+                    "https://example.com/legacy": {
+                        "fetched_at": "2026-03-27T10:00:00",
+                        "entries": [{"title": "Legacy", "link": "https://example.com/l"}],
+                    },
+                    "https://example.com/broken": {"entries": "not-a-list"},
+                }, handle)
+
+            analyzer = self.make_analyzer(home)
+
+            record = analyzer._read_cache_record("https://example.com/legacy")
+            self.assertEqual(record["entries"][0]["title"], "Legacy")
+            self.assertIsNone(analyzer._read_cache_record("https://example.com/broken"))
+
+    def test_json_backend_remains_available(self):
+        with tempfile.TemporaryDirectory() as home:
+            analyzer = self.make_analyzer(home, backend="json")
+            analyzer._write_cache_entries("https://example.com/a", [{"title": "A", "link": "https://example.com/a1"}])
+            analyzer._flush_feed_cache()
+
+            with open(analyzer.feed_cache_file, "r", encoding="utf-8") as handle:
+                data = json.load(handle)
+
+            self.assertTrue(analyzer.feed_cache_file.endswith("feed_cache.json"))
+            self.assertEqual(data["https://example.com/a"]["entries"][0]["title"], "A")
+
+    def test_writes_are_buffered_until_flush(self):
+        for backend in ("sqlite", "json"):
+            with self.subTest(backend=backend), tempfile.TemporaryDirectory() as home:
+                analyzer = self.make_analyzer(home, backend=backend)
+                for idx in range(5):
+                    analyzer._write_cache_entries(
+                        f"https://example.com/{idx}",
+                        [{"title": f"Headline {idx}", "link": f"https://example.com/{idx}/a"}],
+                    )
+
+                self.assertEqual(analyzer.feed_cache_stats["flush_count"], 0)
+                self.assertEqual(analyzer._read_cache_record("https://example.com/3")["entries"][0]["title"], "Headline 3")
+
+                written = analyzer._flush_feed_cache()
+                self.assertEqual(analyzer._flush_feed_cache(), 0)
+
+                self.assertGreater(written, 0)
+                self.assertEqual(analyzer.feed_cache_stats["flush_count"], 1)
+                self.assertEqual(analyzer.feed_cache_stats["records_written"], 5)
+                self.assertEqual(analyzer.feed_cache_stats["bytes_written"], written)
+                self.assertIsNone(analyzer.feed_cache_flush_timer)
+                reopened = self.make_analyzer(home, backend=backend)
+                self.assertEqual(reopened._read_cache_record("https://example.com/4")["entries"][0]["title"], "Headline 4")
+
+    def test_failed_flush_keeps_records_and_newer_writes_win(self):
+        with tempfile.TemporaryDirectory() as home:
+            analyzer = self.make_analyzer(home)
+            analyzer._write_cache_entries("https://example.com/a", [{"title": "Old A", "link": "https://example.com/a1"}])
+            analyzer._write_cache_entries("https://example.com/b", [{"title": "B", "link": "https://example.com/b1"}])
+
+            def failing_connection():
+                analyzer._write_cache_entries("https://example.com/a", [{"title": "New A", "link": "https://example.com/a2"}])
+                raise sqlite3.OperationalError("disk I/O error")
+
+            with mock.patch.object(analyzer, "_cache_connection", side_effect=failing_connection):
+                with self.assertLogs(analyzer_module.logger, level="WARNING"):
+                    self.assertEqual(analyzer._flush_feed_cache(), 0)
+
+            self.assertEqual(sorted(analyzer.feed_cache_dirty), ["https://example.com/a", "https://example.com/b"])
+            self.assertGreater(analyzer._flush_feed_cache(), 0)
+            reopened = self.make_analyzer(home)
+            self.assertEqual(reopened._read_cache_record("https://example.com/a")["entries"][0]["title"], "New A")
+            self.assertEqual(reopened._read_cache_record("https://example.com/b")["entries"][0]["title"], "B")
+
+    def test_exit_hook_tracks_only_live_analyzers(self):
+        with tempfile.TemporaryDirectory() as home:
+            analyzer = self.make_analyzer(home, backend="json")
+            self.assertIn(analyzer, analyzer_module._FEED_CACHE_WRITERS)
+            writers = len(analyzer_module._FEED_CACHE_WRITERS)
+            del analyzer
+            gc.collect()
+            self.assertEqual(len(analyzer_module._FEED_CACHE_WRITERS), writers - 1)
+
+
+if __name__ == "__main__":
+    unittest.main()
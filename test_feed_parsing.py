@@ -0,0 +1,144 @@
+import threading
+import unittest
+from unittest import mock
+from datetime import datetime, timedelta
+
+import bnti_feed_parsing
+import bnti_timestamps
+import borderneighboursthreatindex as analyzer_module
+
+
+def rss_bytes(items):
+    body = "".join(
+        f"<item><title>{title}</title><link>{link}</link><pubDate>{published}</pubDate></item>"
+        for title, link, published in items
+    )
+    return f'<?xml version="1.0"?><rss version="2.0"><channel><title>t</title>{body}</channel></rss>'.encode("utf-8")
+
+
+def rfc822(dt_value):
+    return dt_value.strftime("%a, %d %b %Y %H:%M:%S +0000")
+
+
+class FeedParsingTests(unittest.TestCase):
+    def make_analyzer(self, workers):
+        analyzer = object.__new__(analyzer_module.BNTIAnalyzer)
+        analyzer.feed_parse_workers = workers
+        analyzer.feed_parse_pool = None
+        analyzer.feed_parse_pool_lock = threading.Lock()
+        return analyzer
+
+    def test_parse_feed_content_returns_compact_recent_rows(self):
+        now = datetime.utcnow()
+        content = rss_bytes([
+            ("Fresh headline", "https://example.com/fresh", rfc822(now)),
+            ("Old headline", "https://example.com/old", rfc822(now - timedelta(days=10))),
+        ])
+
+        rows = bnti_feed_parsing.parse_feed_content(content)
+
+        self.assertEqual(rows, [("Fresh headline", "https://example.com/fresh", rfc822(now))])
+        entry = bnti_feed_parsing.rows_to_entries(rows)[0]
+        self.assertEqual(entry.title, "Fresh headline")
+        self.assertEqual(entry.get("published"), rfc822(now))
+
+    def test_sorted_feed_stops_at_first_entry_past_cutoff(self):
+        now = datetime(2026, 3, 28, 12, 0, 0)
+        entries = [
+            {"title": f"Headline {hours}", "link": f"https://example.com/{hours}", "published": rfc822(now - timedelta(hours=hours))}
+            for hours in (1, 5, 30, 60, 90, 120)
+        ]
+        parsed = []
+
+        def counting_parse(value):
+            parsed.append(value)
+            return bnti_timestamps.parse_timestamp(value)
+
+        with mock.patch.object(bnti_feed_parsing, "parse_timestamp", side_effect=counting_parse):
+            selected = bnti_feed_parsing.select_recent_entries(entries, now=now)
+
+        self.assertEqual([entry["link"] for entry in selected], [entry["link"] for entry in entries[:3]])
+        self.assertEqual(len(parsed), 4)
+
+    def test_unsorted_feed_is_scanned_in_full(self):
+        now = datetime(2026, 3, 28, 12, 0, 0)
+        entries = [
+            {"title": f"Headline {hours}", "link": f"https://example.com/{hours}", "published": rfc822(now - timedelta(hours=hours))}
+            for hours in (1, 5, 2, 90, 120, 3)
+        ]
+
+        selected = bnti_feed_parsing.select_recent_entries(entries, now=now)
+
+        self.assertEqual([entry["link"] for entry in selected], [
+            "https://example.com/1", "https://example.com/5", "https://example.com/2", "https://example.com/3",
+        ])
+
+    def test_stale_sorted_feed_still_returns_fallback_entries(self):
+        now = datetime(2026, 3, 28, 12, 0, 0)
+        entries = [{"title": "No link"}] + [
+            {"title": f"Headline {days}", "link": f"https://example.com/{days}", "published": rfc822(now - timedelta(days=days))}
+            for days in range(3, 12)
+        ]
+
+        selected = bnti_feed_parsing.select_recent_entries(entries, now=now)
+
+        self.assertEqual([entry["link"] for entry in selected], [f"https://example.com/{days}" for days in range(3, 8)])
+
+    def test_feed_bytes_are_parsed_in_worker_processes(self):
+        analyzer = self.make_analyzer(workers=1)
+        content = rss_bytes([("Pool headline", "https://example.com/pool", rfc822(datetime.utcnow()))])
+        try:
+            entries = analyzer._parse_feed_content(content)
+            self.assertIsNotNone(analyzer.feed_parse_pool)
+        finally:
+            analyzer._shutdown_feed_parse_pool()
+
+        self.assertEqual([entry.link for entry in entries], ["https://example.com/pool"])
+        self.assertIsNone(analyzer.feed_parse_pool)
+
+    def test_broken_parse_pool_falls_back_to_inline_parsing(self):
+        analyzer = self.make_analyzer(workers=2)
+
+        class BrokenPool:
+            def submit(self, *args):
+                raise RuntimeError("pool is gone")
+
+            def shutdown(self, wait=True):
+                return None
+
+        analyzer.feed_parse_pool = BrokenPool()
+        content = rss_bytes([("Inline headline", "https://example.com/inline", rfc822(datetime.utcnow()))])
+
+        entries = analyzer._parse_feed_content(content)
+
+        self.assertEqual([entry.title for entry in entries], ["Inline headline"])
+        self.assertEqual(analyzer.feed_parse_workers, 0)
+        self.assertIsNone(analyzer.feed_parse_pool)
+
+    def test_single_feed_parse_error_keeps_the_pool(self):
+        analyzer = self.make_analyzer(workers=2)
+
+        class FailingFuture:
+            def result(self):
+                raise ValueError("malformed feed")
+
+        class HealthyPool:
+            def submit(self, *args):
+                return FailingFuture()
+
+            def shutdown(self, wait=True):
+                return None
+
+        pool = analyzer.feed_parse_pool = HealthyPool()
+        content = rss_bytes([("Inline headline", "https://example.com/inline", rfc822(datetime.utcnow()))])
+
+        with self.assertLogs(analyzer_module.logger, level="WARNING"):
+            entries = analyzer._parse_feed_content(content)
+
+        self.assertEqual([entry.title for entry in entries], ["Inline headline"])
+        self.assertEqual(analyzer.feed_parse_workers, 2)
+        self.assertIs(analyzer.feed_parse_pool, pool)
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,56 @@
+import unittest
+from unittest import mock
+
+import bnti_language
+import borderneighboursthreatindex as analyzer_module
+
+SAMPLES = {
+    "Rome’s Trevi Fountain will become a paid attraction": "en",
+    "Erdoğan meets Mitsotakis in Athens": "tr",
+    "Café owners protest new tax in Athens": "en",
+    "Georgia’s GDP Up by 7.2% in November 2025": "en",
+    "2026": "en",
+    "Ελβετία: Δεκάδες νεκροί και εκατό τραυματίες από την έκρηξη": "el",
+    "Betsson: Σούπερ προσφορά* στο Betsson Super Cup!": "el",
+    "Հայաստանը և Ադրբեջանը": "hy",
+    "საქართველოს პარლამენტი": "ka",
+    "Кървава новогодишна нощ: 24 убити при атака с дронове": "bg",
+    "Выборы в России: ещё один тур": "ru",
+    "تأثير الفساد على الانتخابات في العراق": "ar",
+    "چهارمین روز اعتراضات ضدحکومتی دی ۱۴۰۴": "fa",
+    "هەولێر: کۆبوونەوەی پەرلەمان": "ckb",
+    "Lazkiye’de Yeni Yıl Coşkusu: Suriye Sahilinde Kutlamalar": "tr",
+    "Le président français à Athènes après la crise économique": "local",
+    "ধাকায় বিক্ষোভ": "local",
+    "Merkez Bankası faizi sabit tuttu": "tr",
+    "Suriye seçimleri ertelendi": "local",
+    "Meclis bugün toplanacak": "local",
+    "Azərbaycan Prezidenti Ankaraya gedir": "az",
+    "Parlamentoya Kurdistanê dicive": "local",
+}
+
+
+class LanguageDetectionTests(unittest.TestCase):
+    def test_labels_each_border_script(self):
+        for title, expected in SAMPLES.items():
+            with self.subTest(title=title):
+                self.assertEqual(bnti_language.detect_language(title), expected)
+
+    def test_enrichment_labels_titles_and_skips_translating_english_ones(self):
+        analyzer = object.__new__(analyzer_module.BNTIAnalyzer)
+        analyzer.openrouter_model = "openrouter/free"
+        events = [
+            {"title": "Rome’s Trevi Fountain will become a paid attraction"},
+            {"title": "Ελβετία: Δεκάδες νεκροί"},
+        ]
+
+        with mock.patch.object(analyzer, "_translate_titles", return_value={}) as translate:
+            analyzer._ensure_translated_titles(events)
+
+        translate.assert_called_once_with(["Ελβετία: Δεκάδες νεκροί"])
+        self.assertEqual([event["detected_lang"] for event in events], ["en", "el"])
+        self.assertEqual(events[0]["translated_title"], events[0]["title"])
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -1,4 +1,11 @@
+import asyncio
+import json
+import os
+import re
+import ssl
 import tempfile
+import threading
+import time
 import unittest
 from datetime import datetime
 from types import SimpleNamespace
@@ -49,6 +56,176 @@ class LLMPublishGateTests(unittest.TestCase):
         self.assertNotIn("category", candidates[0])
         self.assertNotIn("weight", candidates[0])
 
+    def test_standalone_process_country_refetches_on_each_call(self):
+        analyzer = self.make_analyzer()
+        calls = []
+
+        def fake_fetch(country, url):
+            calls.append(url)
+            if len(calls) == 1:
+                raise RuntimeError("feed timed out")
+            return [FeedEntry(title="Mosul bridge reopens", link="https://example.com/m", published="2026-03-27T18:00:00")]
+
+        analyzer.fetch_feed_entries = fake_fetch
+        with self.assertRaises(RuntimeError):
+            analyzer.process_country("Iraq", ["https://feed.example/rss"])
+        _, candidates = analyzer.process_country("Iraq", ["https://feed.example/rss"])
+
+        self.assertEqual(len(calls), 2)
+        self.assertEqual(len(candidates), 1)
+
+    def test_fetch_all_feeds_caps_per_host_concurrency_and_keeps_url_order(self):
+        analyzer = self.make_analyzer()
+        analyzer.rss_urls = {
+            "Iran": [f"https://slow.example/{idx}" for idx in range(6)] + ["https://other.example/iran"],
+            "Iraq": ["https://other.example/iraq", "https://slow.example/iraq"],
+        }
+        lock = threading.Lock()
+        active = {}
+        peak = {}
+
+        def fake_fetch(country, url):
+            host = url.split("/")[2]
+            with lock:
+                active[host] = active.get(host, 0) + 1
+                peak[host] = max(peak.get(host, 0), active[host])
+            time.sleep(0.02)
+            with lock:
+                active[host] -= 1
+            return [FeedEntry(title=url, link=url)]
+
+        analyzer.fetch_feed_entries = fake_fetch
+
+        results = analyzer._fetch_all_feeds()
+
+        self.assertLessEqual(peak["slow.example"], analyzer_module.BNTIAnalyzer.FEED_MAX_CONNECTIONS_PER_HOST)
+        self.assertEqual([entry.link for entry in results["Iran"]], analyzer.rss_urls["Iran"])
+        self.assertEqual([entry.link for entry in results["Iraq"]], analyzer.rss_urls["Iraq"])
+
+    def test_fetch_all_feeds_downloads_shared_urls_once(self):
+        analyzer = self.make_analyzer()
+        shared_url = "https://www.aljazeera.com/xml/rss/all.xml"
+        analyzer.rss_urls = {
+            "Iran": [shared_url, "https://iran.example/rss"],
+            "Iraq": [shared_url],
+            "Syria": [shared_url],
+        }
+        calls = []
+
+        def fake_fetch(country, url):
+            calls.append(url)
+            time.sleep(0.02)
+            return [FeedEntry(title=url, link=url)]
+
+        analyzer.fetch_feed_entries = fake_fetch
+
+        results = analyzer._fetch_all_feeds()
+
+        self.assertEqual(calls.count(shared_url), 1)
+        for country in ("Iran", "Iraq", "Syria"):
+            self.assertEqual(results[country][0].link, shared_url)
+
+    def make_async_client(self, handler):
+        class FakeAsyncClient:
+            def __init__(self):
+                self.calls = []
+                self.closed = False
+
+            async def get(self, url, headers=None):
+                self.calls.append(url)
+                return handler(url, headers)
+
+            async def aclose(self):
+                self.closed = True
+
+        return FakeAsyncClient()
+
+    def test_async_engine_fetches_unique_urls_with_ssl_fallback(self):
+        with tempfile.TemporaryDirectory() as tempdir:
+            analyzer = self.make_cached_analyzer(tempdir)
+            shared_url = "https://www.aljazeera.com/xml/rss/all.xml"
+            analyzer.rss_urls = {
+                "Iran": [shared_url, "https://badcert.example/rss"],
+                "Iraq": [shared_url],
+            }
+
+            def verified(url, headers):
+                if "badcert" in url:
+                    raise ConnectionError("handshake failed") from ssl.SSLError("CERTIFICATE_VERIFY_FAILED")
+                return SimpleNamespace(status_code=200, content=url.encode(), headers={})
+
+            clients = {
+                True: self.make_async_client(verified),
+                False: self.make_async_client(
+                    lambda url, headers: SimpleNamespace(status_code=200, content=url.encode(), headers={})
+                ),
+            }
+            analyzer._build_async_feed_clients = lambda: clients
+            parse = lambda content: SimpleNamespace(entries=[FeedEntry(title=content.decode(), link=content.decode())])
+
+            with mock.patch.object(analyzer_module.feedparser, "parse", side_effect=parse):
+                results = asyncio.run(analyzer._fetch_all_feeds_async())
+
+            self.assertEqual(clients[True].calls.count(shared_url), 1)
+            self.assertEqual(clients[False].calls, ["https://badcert.example/rss"])
+            self.assertEqual([entry.link for entry in results["Iran"]], analyzer.rss_urls["Iran"])
+            self.assertEqual([entry.link for entry in results["Iraq"]], [shared_url])
+            self.assertTrue(all(client.closed for client in clients.values()))
+
+    def test_async_engine_bounds_requests_and_skips_proxy_after_timeout(self):
+        with tempfile.TemporaryDirectory() as tempdir:
+            analyzer = self.make_cached_analyzer(tempdir)
+            analyzer.rss_urls = {"Iran": ["https://stalled.example/rss"]}
+
+            class StalledClient:
+                def __init__(self):
+                    self.calls = []
+
+                async def get(self, url, headers=None):
+                    self.calls.append(url)
+                    await asyncio.sleep(60)
+
+                async def aclose(self):
+                    return None
+
+            stalled = StalledClient()
+            analyzer._build_async_feed_clients = lambda: {True: stalled, False: stalled}
+            with mock.patch.object(analyzer_module.BNTIAnalyzer, "FEED_REQUEST_TIMEOUT_SECONDS", 0.01):
+                results = asyncio.run(analyzer._fetch_all_feeds_async())
+
+            self.assertEqual(results, {"Iran": []})
+            self.assertEqual(stalled.calls, ["https://stalled.example/rss"])
+
+    def test_async_engine_reads_the_feed_cache_off_the_event_loop(self):
+        with tempfile.TemporaryDirectory() as tempdir:
+            analyzer = self.make_cached_analyzer(tempdir)
+            analyzer.rss_urls = {"Iran": ["https://www.presstv.ir/rss", "https://broken.example/rss"]}
+
+            def handler(url, headers):
+                if "broken" in url:
+                    raise ConnectionError("connection reset")
+                return SimpleNamespace(status_code=200, content=url.encode(), headers={})
+
+            client = self.make_async_client(handler)
+            analyzer._build_async_feed_clients = lambda: {True: client, False: client}
+            analyzer._fetch_proxy_entries_async = mock.AsyncMock(return_value=[])
+            parse = lambda content: SimpleNamespace(entries=[FeedEntry(title=content.decode(), link=content.decode())])
+            loop_thread = threading.get_ident()
+            read_threads = []
+            read_cache_record = analyzer._read_cache_record
+
+            def recording_read(url):
+                read_threads.append(threading.get_ident())
+                return read_cache_record(url)
+
+            analyzer._read_cache_record = recording_read
+            with mock.patch.object(analyzer_module.feedparser, "parse", side_effect=parse):
+                results = asyncio.run(analyzer._fetch_all_feeds_async())
+
+            self.assertEqual([entry.link for entry in results["Iran"]], ["https://www.presstv.ir/rss"])
+            self.assertGreaterEqual(len(read_threads), 5)
+            self.assertNotIn(loop_thread, read_threads)
+
     def test_build_candidate_snapshot_rejects_partial_batch_success(self):
         analyzer = self.make_analyzer()
         responses = iter([
@@ -359,6 +536,293 @@ class LLMPublishGateTests(unittest.TestCase):
         self.assertEqual(candidate["country_results"]["Iran"]["events"][0]["llm_final_country"], "Iran")
         self.assertEqual(candidate["country_results"]["Syria"]["events"][0]["llm_final_country"], "Syria")
 
+    def make_publishable_llm_analyzer(self):
+        analyzer = self.make_analyzer()
+        analyzer.MIN_PUBLISHABLE_TOTAL_SIGNALS = 1
+        analyzer.MIN_PUBLISHABLE_ACTIVE_COUNTRIES = 1
+        analyzer.MIN_SIGNAL_COVERAGE_RATIO = 0.0
+        analyzer.MIN_ACTIVE_COUNTRY_COVERAGE_RATIO = 0.0
+        analyzer.load_history = lambda: []
+        analyzer._load_existing_summary = lambda: {
+            "slot_start": "2026-03-28T00:00:00",
+            "slot_end": "2026-03-28T06:00:00",
+            "generated_at": "2026-03-28T06:00:00",
+            "next_refresh_at": "2026-03-28T12:00:00",
+            "headline": "Existing brief.",
+            "bullets": ["One.", "Two.", "Three."],
+            "watch": None,
+        }
+        return analyzer
+
+    def make_prompt_aware_llm(self, countries_by_title, delay=0.0, fail_ids=(), audit_countries=None):
+        """Answer attribution and audit prompts from their numbered lines, in any call order."""
+        lock = threading.Lock()
+        state = {"active": 0, "peak": 0, "calls": 0, "log": []}
+
+        def respond(prompt, max_retries=2):
+            is_audit = "auditing country attribution" in prompt
+            with lock:
+                state["active"] += 1
+                state["calls"] += 1
+                state["peak"] = max(state["peak"], state["active"])
+            started = time.monotonic()
+            time.sleep(delay)
+            block = re.search(r"\n(?:Headlines|Items):\n(.*?)\n\nRespond", prompt, re.DOTALL).group(1)
+            items = re.findall(r'^(\d+)\. Headline: "(.*?)"(?:.*Proposed primary_country: "(.*)")?$', block, re.MULTILINE)
+            with lock:
+                state["active"] -= 1
+                state["log"].append(("audit" if is_audit else "attribution", int(items[0][0]), started, time.monotonic()))
+            if any(int(idx) in fail_ids for idx, _, _ in items):
+                return "not json"
+            if is_audit:
+                return json.dumps([
+                    {"id": int(idx), "final_country": (audit_countries or {}).get(title, proposed)}
+                    for idx, title, proposed in items
+                ])
+            return json.dumps([
+                {"id": int(idx), "primary_country": countries_by_title[title], "category": "military_conflict", "subject": title}
+                for idx, title, _ in items
+            ])
+
+        return respond, state
+
+    def test_build_candidate_snapshot_runs_batches_concurrently_with_same_result(self):
+        titles = {f"Border incident {idx}": country for idx, country in enumerate(["Iran", "Iraq", "Syria", "Greece", "Armenia"])}
+        country_candidates = {}
+        for idx, (title, country) in enumerate(titles.items()):
+            country_candidates.setdefault(country, []).append({
+                "title": title,
+                "translated_title": title,
+                "link": f"https://example.com/{idx}",
+                "date": "2026-03-28T05:15:00",
+                "source_country": country,
+            })
+
+        results = {}
+        for max_in_flight in (1, 3):
+            analyzer = self.make_publishable_llm_analyzer()
+            analyzer.openrouter_batch_size = 2
+            analyzer.openrouter_max_in_flight = max_in_flight
+            analyzer._call_openrouter, state = self.make_prompt_aware_llm(titles, delay=0.02)
+            candidate = analyzer.build_candidate_snapshot(country_candidates)
+            self.assertTrue(candidate["publishable"])
+            results[max_in_flight] = (candidate["country_results"], state)
+
+        self.assertEqual(results[1][0], results[3][0])
+        self.assertEqual(results[1][1]["peak"], 1)
+        self.assertGreater(results[3][1]["peak"], 1)
+        self.assertEqual(results[3][1]["calls"], 6)
+
+    def test_pipelined_audit_overlaps_next_attribution_with_same_output(self):
+        leak_title = "US, Israel bomb heavy water nuclear reactor and uranium processing plant in Iran"
+        titles = {
+            leak_title: "Greece",
+            "Syria reopens municipal services after wartime disruption": "Syria",
+            "Drone attacks near Baghdad airport raise security concerns": "Iraq",
+            "Georgia closes border checkpoint after clashes": "Georgia",
+        }
+        country_candidates = {}
+        for idx, (title, country) in enumerate(titles.items()):
+            country_candidates.setdefault(country, []).append({
+                "title": title,
+                "translated_title": title,
+                "link": f"https://example.com/{idx}",
+                "date": "2026-03-28T05:15:00",
+                "source_country": country,
+            })
+
+        runs = {}
+        for max_in_flight in (1, 2):
+            analyzer = self.make_publishable_llm_analyzer()
+            analyzer.openrouter_batch_size = 1
+            analyzer.openrouter_max_in_flight = max_in_flight
+            analyzer._call_openrouter, state = self.make_prompt_aware_llm(
+                titles, delay=0.03, audit_countries={leak_title: "Iran"}
+            )
+            candidate = analyzer.build_candidate_snapshot(country_candidates)
+            self.assertTrue(candidate["publishable"])
+            runs[max_in_flight] = (candidate["country_results"], state["log"])
+
+        self.assertEqual(runs[1][0], runs[2][0])
+        self.assertEqual(len(runs[2][0]["Iran"]["events"]), 1)
+        self.assertEqual(len(runs[2][0]["Greece"]["events"]), 0)
+        log = runs[2][1]
+        last_attribution_end = max(end for kind, _, _, end in log if kind == "attribution")
+        first_audit_start = min(start for kind, _, start, _ in log if kind == "audit")
+        self.assertLess(first_audit_start, last_attribution_end)
+
+    def make_attribution_cached_analyzer(self, cache_dir, **env):
+        analyzer = self.make_publishable_llm_analyzer()
+        analyzer.cache_dir = cache_dir
+        with mock.patch.dict(os.environ, env):
+            analyzer._init_attribution_cache()
+        return analyzer
+
+    def test_attribution_cache_sends_only_new_headlines_to_llm(self):
+        titles = {
+            "Mosul power station hit by rocket fire": "Iraq",
+            "Aleppo water network returns to service": "Syria",
+            "Georgia closes border checkpoint after clashes": "Georgia",
+        }
+        events = [
+            {"title": title, "link": f"https://example.com/{idx}", "date": "2026-03-28T05:15:00", "source_country": country}
+            for idx, (title, country) in enumerate(titles.items())
+        ]
+        with tempfile.TemporaryDirectory() as cache_dir:
+            first = self.make_attribution_cached_analyzer(cache_dir)
+            first._call_openrouter, first_state = self.make_prompt_aware_llm(titles)
+            first_candidate = first.build_candidate_snapshot({"Iraq": events[:1], "Syria": events[1:2]})
+
+            second = self.make_attribution_cached_analyzer(cache_dir)
+            prompts = []
+            responder, second_state = self.make_prompt_aware_llm(titles)
+            second._call_openrouter = lambda prompt, max_retries=2: prompts.append(prompt) or responder(prompt)
+            second_candidate = second.build_candidate_snapshot({"Iraq": events[:1], "Syria": events[1:2], "Georgia": events[2:]})
+
+        self.assertTrue(first_candidate["publishable"])
+        self.assertTrue(second_candidate["publishable"])
+        self.assertEqual(first_state["calls"], 2)
+        self.assertEqual(second_state["calls"], 2)
+        self.assertTrue(all("Georgia closes border checkpoint" in prompt for prompt in prompts))
+        self.assertFalse(any("Mosul power station" in prompt for prompt in prompts))
+        for country in ("Iraq", "Syria"):
+            self.assertEqual(
+                first_candidate["country_results"][country]["events"],
+                second_candidate["country_results"][country]["events"],
+            )
+        self.assertEqual(len(second_candidate["country_results"]["Georgia"]["events"]), 1)
+
+    def test_attribution_cache_expires_and_evicts_least_recently_used(self):
+        verdict = {"primary_country": "Iran", "category": "neutral", "subject": "s", "final_country": "Iran"}
+        events = [{"title": f"Headline {idx}", "link": f"https://example.com/{idx}"} for idx in range(3)]
+        with tempfile.TemporaryDirectory() as cache_dir:
+            analyzer = self.make_attribution_cached_analyzer(cache_dir, BNTI_ATTRIBUTION_CACHE_MAX_ENTRIES="2")
+            analyzer._store_attribution_results(events, {0: verdict, 1: verdict})
+            analyzer._lookup_attribution_cache(events[:1])
+            analyzer._store_attribution_results(events, {2: verdict})
+            analyzer._save_attribution_cache()
+
+            cached, pending = analyzer._lookup_attribution_cache(events)
+            self.assertEqual(sorted(cached), [0, 2])
+            self.assertEqual(pending, [1])
+
+            reloaded = self.make_attribution_cached_analyzer(cache_dir, BNTI_ATTRIBUTION_CACHE_TTL_HOURS="0")
+            self.assertEqual(reloaded._lookup_attribution_cache(events), ({}, [0, 1, 2]))
+
+            analyzer.openrouter_model = "another/model"
+            self.assertEqual(analyzer._lookup_attribution_cache(events)[1], [0, 1, 2])
+
+            with open(os.path.join(cache_dir, "attribution_cache.json"), "w", encoding="utf-8") as handle:
+                json.dump({"k": {"result": verdict, "stored_at": "not-a-number", "used_at": 0}}, handle)
+            self.assertEqual(self.make_attribution_cached_analyzer(cache_dir).attribution_cache.records, {})
+
+    def make_tuned_analyzer(self, cache_dir, batch_size=10):
+        analyzer = self.make_publishable_llm_analyzer()
+        analyzer.cache_dir = cache_dir
+        analyzer.openrouter_batch_size = batch_size
+        with mock.patch.dict(os.environ, {"OPENROUTER_ADAPTIVE_BATCH": "1"}):
+            analyzer._init_llm_batch_tuning()
+        return analyzer
+
+    def test_adaptive_batch_size_grows_on_fast_success_and_shrinks_on_failure(self):
+        with tempfile.TemporaryDirectory() as cache_dir:
+            analyzer = self.make_tuned_analyzer(cache_dir, batch_size=10)
+            timeout = analyzer_module.BNTIAnalyzer.OPENROUTER_TIMEOUT_SECONDS
+
+            analyzer._observe_llm_batch(10, True, 2.0, "x" * 400)
+            self.assertEqual(analyzer._current_llm_batch_size(), 12)
+            analyzer._observe_llm_batch(12, False, 2.0, "x" * 400)
+            self.assertEqual(analyzer._current_llm_batch_size(), 6)
+            analyzer._observe_llm_batch(3, True, 2.0, "x" * 400)
+            self.assertEqual(analyzer._current_llm_batch_size(), 6)
+            analyzer._observe_llm_batch(6, True, timeout, "x" * 400)
+            self.assertEqual(analyzer._current_llm_batch_size(), 5)
+            analyzer._save_llm_tuning()
+
+            reloaded = self.make_tuned_analyzer(cache_dir, batch_size=10)
+            self.assertEqual(reloaded._current_llm_batch_size(), 5)
+            state = reloaded.llm_tuning["openrouter/free"]
+            self.assertEqual(state["observations"], 4)
+            self.assertEqual(state["prompt_tokens"], 100)
+            self.assertLess(state["success_rate"], 1.0)
+
+            reseeded = self.make_tuned_analyzer(cache_dir, batch_size=3)
+            self.assertEqual(reseeded._current_llm_batch_size(), 3)
+            self.assertEqual(reseeded.llm_tuning["openrouter/free"]["observations"], 4)
+
+    def test_adaptive_batches_are_sized_per_dispatch_and_reported(self):
+        titles = {f"Border incident {idx}": "Iran" for idx in range(9)}
+        with tempfile.TemporaryDirectory() as cache_dir:
+            analyzer = self.make_tuned_analyzer(cache_dir, batch_size=4)
+            respond, _ = self.make_prompt_aware_llm(titles)
+            calls = {"count": 0}
+
+            def fail_first_call(prompt, max_retries=2):
+                calls["count"] += 1
+                if calls["count"] == 1:
+                    return "not json"
+                return respond(prompt, max_retries)
+
+            analyzer._call_openrouter = fail_first_call
+            candidate = analyzer.build_candidate_snapshot({
+                "Iran": [
+                    {"title": title, "link": f"https://example.com/{idx}", "date": "2026-03-28T05:15:00"}
+                    for idx, title in enumerate(titles)
+                ]
+            })
+
+        self.assertTrue(candidate["publishable"])
+        metrics = candidate["llm_metrics"]
+        self.assertEqual(metrics["batch_sizes"][0], 4)
+        self.assertGreaterEqual(sum(metrics["batch_sizes"]), len(titles))
+        self.assertEqual(metrics["failed_calls"], 1)
+        self.assertEqual(metrics["calls"], calls["count"])
+
+    def test_batches_are_packed_to_the_prompt_token_budget(self):
+        analyzer = self.make_publishable_llm_analyzer()
+        analyzer.openrouter_batch_size = 6
+        short_events = [{"title": f"Iran talks {idx}", "translated_title": f"Iran talks {idx}"} for idx in range(8)]
+        long_title = "საქართველოს მთავრობამ საზღვრის კონტროლი გააძლიერა სომხეთის მიმართულებით " * 2
+        long_events = [{"title": long_title, "translated_title": "Georgia tightens border control"} for _ in range(8)]
+        head, tail = analyzer._prompt_parts("attribution")
+        overhead = analyzer._estimate_tokens(head) + analyzer._estimate_tokens(tail)
+
+        self.assertEqual(analyzer._estimate_tokens("x" * 400), 100)
+        self.assertGreater(analyzer._estimate_tokens(long_title), len(long_title) // 2)
+        self.assertEqual(analyzer._plan_llm_batch(short_events, 0), 6)
+
+        analyzer.openrouter_prompt_token_budget = overhead + 400
+        self.assertEqual(analyzer._plan_llm_batch(short_events, 0), 6)
+        self.assertEqual(analyzer._plan_llm_batch(short_events, 6), 8)
+        long_end = analyzer._plan_llm_batch(long_events, 0)
+        self.assertGreaterEqual(long_end, 1)
+        self.assertLess(long_end, 6)
+        self.assertLessEqual(
+            analyzer._estimate_tokens(analyzer._build_attribution_prompt(long_events[:long_end])),
+            analyzer.openrouter_prompt_token_budget + long_end,
+        )
+
+        analyzer.openrouter_prompt_token_budget = 1
+        self.assertEqual(analyzer._plan_llm_batch(long_events, 3), 4)
+
+    def test_concurrent_batches_report_lowest_failing_batch(self):
+        titles = {f"Border incident {idx}": "Iran" for idx in range(6)}
+        analyzer = self.make_publishable_llm_analyzer()
+        analyzer.openrouter_batch_size = 1
+        analyzer.openrouter_max_in_flight = 4
+        analyzer._call_openrouter, _ = self.make_prompt_aware_llm(titles, fail_ids=(3, 5))
+
+        candidate = analyzer.build_candidate_snapshot({
+            "Iran": [
+                {"title": title, "link": f"https://example.com/{idx}", "date": "2026-03-28T05:15:00"}
+                for idx, title in enumerate(titles)
+            ]
+        })
+
+        self.assertFalse(candidate["publishable"])
+        self.assertEqual(candidate["reason"], "llm_call_failed")
+        self.assertEqual(candidate["failed_batch_start"], 2)
+
     def test_build_candidate_snapshot_skips_bulk_translation_before_attribution(self):
         analyzer = self.make_analyzer()
         analyzer.MIN_PUBLISHABLE_TOTAL_SIGNALS = 1
@@ -432,7 +896,7 @@ class LLMPublishGateTests(unittest.TestCase):
         fake_session = FakeSession()
         retry_configs = []
 
-        def fake_http_adapter(max_retries=None):
+        def fake_http_adapter(max_retries=None, **kwargs):
             retry_configs.append(max_retries)
             return SimpleNamespace(max_retries=max_retries)
 
@@ -456,6 +920,98 @@ class LLMPublishGateTests(unittest.TestCase):
         self.assertEqual(retry_configs[0].connect, analyzer_module.BNTIAnalyzer.FEED_RETRY_CONNECT)
         self.assertEqual(retry_configs[0].read, analyzer_module.BNTIAnalyzer.FEED_RETRY_READ)
 
+    def make_cached_analyzer(self, tempdir, cache=None):
+        analyzer = self.make_analyzer()
+        analyzer.user_agents = ["ua-1"]
+        analyzer.feed_cache_file = tempdir + "/feed_cache.json"
+        analyzer.feed_cache = dict(cache or {})
+        analyzer.cache_lock = threading.Lock()
+        analyzer._init_feed_cache_writer()
+        analyzer.cache_fresh_ttl_seconds = 60 * 30
+        analyzer.cache_stale_ttl_seconds = 60 * 60 * 48
+        return analyzer
+
+    def test_fetch_feed_entries_revalidates_cache_with_304(self):
+        with tempfile.TemporaryDirectory() as tempdir:
+            analyzer = self.make_cached_analyzer(tempdir, {
+                "https://example.com/rss": {
+                    "fetched_at": "2026-03-27T10:00:00",
+                    "etag": '"abc"',
+                    "last_modified": "Fri, 27 Mar 2026 10:00:00 GMT",
+                    "entries": [{"title": "Cached headline", "link": "https://example.com/a"}],
+                }
+            })
+            sent_headers = []
+
+            class FakeSession:
+                def get(self, url, headers=None, timeout=None, verify=True):
+                    sent_headers.append(headers)
+                    return SimpleNamespace(status_code=304, headers={}, raise_for_status=lambda: None)
+
+            analyzer._get_http_session = lambda url, max_retries=None: FakeSession()
+            with mock.patch.object(
+                analyzer_module.feedparser,
+                "parse",
+                side_effect=AssertionError("304 responses must not be reparsed"),
+            ):
+                entries = analyzer.fetch_feed_entries("Iran", "https://example.com/rss")
+
+            self.assertEqual([entry["title"] for entry in entries], ["Cached headline"])
+            self.assertEqual(sent_headers[0]["If-None-Match"], '"abc"')
+            self.assertEqual(sent_headers[0]["If-Modified-Since"], "Fri, 27 Mar 2026 10:00:00 GMT")
+            self.assertNotEqual(
+                analyzer._read_cache_record("https://example.com/rss")["fetched_at"],
+                "2026-03-27T10:00:00",
+            )
+            analyzer._flush_feed_cache()
+
+    def test_fetch_feed_entries_records_validators_from_200(self):
+        with tempfile.TemporaryDirectory() as tempdir:
+            analyzer = self.make_cached_analyzer(tempdir)
+            sent_headers = []
+
+            class FakeSession:
+                def get(self, url, headers=None, timeout=None, verify=True):
+                    sent_headers.append(headers)
+                    return SimpleNamespace(
+                        status_code=200,
+                        content=b"<rss/>",
+                        headers={"ETag": '"v2"', "Last-Modified": "Sat, 28 Mar 2026 06:00:00 GMT"},
+                        raise_for_status=lambda: None,
+                    )
+
+            analyzer._get_http_session = lambda url, max_retries=None: FakeSession()
+            feed = SimpleNamespace(entries=[FeedEntry(title="Fresh headline", link="https://example.com/b")])
+            with mock.patch.object(analyzer_module.feedparser, "parse", return_value=feed):
+                entries = analyzer.fetch_feed_entries("Iran", "https://example.com/rss")
+
+            self.assertEqual(len(entries), 1)
+            self.assertNotIn("If-None-Match", sent_headers[0])
+            record = analyzer._read_cache_record("https://example.com/rss")
+            self.assertEqual(record["etag"], '"v2"')
+            self.assertEqual(record["last_modified"], "Sat, 28 Mar 2026 06:00:00 GMT")
+            analyzer._flush_feed_cache()
+
+    def test_http_sessions_are_pooled_per_host(self):
+        analyzer = self.make_analyzer()
+        created = []
+
+        def fake_session():
+            session = mock.MagicMock()
+            created.append(session)
+            return session
+
+        with mock.patch("requests.Session", side_effect=fake_session):
+            first = analyzer._get_http_session("https://news.google.com/rss/search?q=Iran")
+            second = analyzer._get_http_session("https://news.google.com/rss/search?q=Iraq")
+            other = analyzer._get_http_session("https://api.gdeltproject.org/api/v2/doc/doc?query=Iran")
+
+        self.assertIs(first, second)
+        self.assertIsNot(first, other)
+        self.assertEqual(len(created), 2)
+        adapter = first.mount.call_args_list[0].args[1]
+        self.assertEqual(adapter._pool_maxsize, analyzer_module.BNTIAnalyzer.HTTP_POOL_MAXSIZE)
+
     def test_proxy_fetch_uses_bounded_timeout(self):
         analyzer = self.make_analyzer()
         analyzer._build_proxy_url = lambda url: "https://proxy.example"
@@ -498,7 +1054,7 @@ class LLMPublishGateTests(unittest.TestCase):
                 raise requests.exceptions.ReadTimeout("timed out")
 
         with mock.patch("requests.Session", return_value=FakeSession()), mock.patch(
-            "requests.adapters.HTTPAdapter", side_effect=lambda max_retries=None: SimpleNamespace(max_retries=max_retries)
+            "requests.adapters.HTTPAdapter", side_effect=lambda max_retries=None, **kwargs: SimpleNamespace(max_retries=max_retries)
         ), mock.patch.object(
             analyzer_module.feedparser,
             "parse",
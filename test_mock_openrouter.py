@@ -0,0 +1,155 @@
+import json
+import time
+import unittest
+from unittest import mock
+
+import requests
+
+import bench_llm_phase
+import bnti_llm_stream
+import borderneighboursthreatindex as analyzer_module
+from mock_openrouter_server import MockOpenRouter, answer_prompt
+
+
+class MockOpenRouterTests(unittest.TestCase):
+    def make_analyzer(self, server):
+        analyzer = object.__new__(analyzer_module.BNTIAnalyzer)
+        analyzer.openrouter_api_key = "primary-key"
+        analyzer.openrouter_backup_api_key = ""
+        analyzer.openrouter_model = "openrouter/free"
+        analyzer.openrouter_base_url = server.url
+        analyzer.border_countries = list(analyzer_module.BNTIAnalyzer.BORDER_COUNTRIES)
+        analyzer.category_weights = dict(analyzer_module.BNTIAnalyzer.LLM_CATEGORY_WEIGHTS)
+        return analyzer
+
+    def test_mock_answers_each_prompt_kind_from_its_numbered_lines(self):
+        analyzer = object.__new__(analyzer_module.BNTIAnalyzer)
+        events = [
+            {"title": "Greece reports drone strike on depot", "translated_title": "Greece reports drone strike on depot"},
+            {"title": "Nepal premier sworn in", "translated_title": "Nepal premier sworn in"},
+        ]
+
+        attribution, count = answer_prompt(analyzer._build_attribution_prompt(events, start_index=4))
+        audit, _ = answer_prompt(analyzer._build_country_audit_prompt(events, {4: {"primary_country": "Iran"}}, start_index=4))
+        combined, _ = answer_prompt(analyzer._build_combined_attribution_prompt(events, start_index=4))
+
+        self.assertEqual(count, 2)
+        self.assertEqual(
+            [(item["id"], item["primary_country"], item["category"]) for item in json.loads(attribution)],
+            [(5, "Greece", "military_conflict"), (6, "IRRELEVANT", "neutral")],
+        )
+        self.assertEqual(json.loads(audit), [{"id": 5, "final_country": "Iran"}, {"id": 6, "final_country": "IRRELEVANT"}])
+        self.assertEqual(json.loads(combined)[0]["final_country"], "Greece")
+        self.assertEqual(answer_prompt("Write a regional summary"), (None, 0))
+
+    @mock.patch("time.sleep", return_value=None)
+    def test_analyzer_client_handles_mock_failure_modes(self, _mock_sleep):
+        server = MockOpenRouter(rate_429=1.0, reasoning_mandatory=True).start()
+        try:
+            analyzer = self.make_analyzer(server)
+            self.assertIsNone(analyzer._call_openrouter("prompt", max_retries=1))
+            self.assertEqual(server.snapshot()["rate_limited"], 2)
+
+            server.rate_429 = 0.0
+            prompt = analyzer._build_attribution_prompt([{"title": "Iraq clash", "translated_title": "Iraq clash"}])
+            parsed = analyzer._parse_attribution_response(analyzer._call_openrouter(prompt), [{}])
+            stats = requests.get(server.url.replace("/api/v1/chat/completions", "/stats"), timeout=5).json()
+        finally:
+            server.stop()
+
+        self.assertEqual(parsed[0]["primary_country"], "Iraq")
+        self.assertEqual(stats["reasoning_rejected"], 3)
+        self.assertEqual(stats["completions"], 1)
+        self.assertGreater(stats["prompt_tokens"], 0)
+
+    def test_array_item_parser_handles_split_chunks_and_brackets_in_strings(self):
+        parser = bnti_llm_stream.JsonArrayItemParser()
+        text = 'Sure: [{"id": 1, "subject": "a ] \\" {b"}, {\'id\': 2}, {"id": 3, "tags": [1, 2]}] then [chatter]'
+        items = []
+        for start in range(0, len(text), 5):
+            items.extend(parser.feed(text[start:start + 5]))
+
+        self.assertEqual([item["id"] for item in items], [1, 3])
+        self.assertEqual(items[0]["subject"], 'a ] " {b')
+        self.assertEqual(parser.skipped, 1)
+        self.assertTrue(parser.closed)
+        self.assertTrue(parser.array_text.endswith("[1, 2]}]"))
+
+    def test_streamed_call_stops_once_every_expected_id_arrived(self):
+        server = MockOpenRouter(latency_per_item=0.01, trailing_seconds=3.0).start()
+        events = [{"title": f"Syria clash {idx}", "translated_title": f"Syria clash {idx}"} for idx in range(4)]
+        try:
+            analyzer = self.make_analyzer(server)
+            analyzer.openrouter_streaming = True
+            prompt = analyzer._build_attribution_prompt(events, start_index=10)
+            started = time.monotonic()
+            response = analyzer._call_llm(prompt, [11, 12, 13, 14])
+            elapsed = time.monotonic() - started
+            stats = server.snapshot()
+        finally:
+            server.stop()
+
+        self.assertLess(elapsed, 2.0)
+        self.assertEqual(stats["streams"], 1)
+        self.assertNotIn("Note:", response)
+        parsed = analyzer._parse_attribution_response(response, events, start_index=10)
+        self.assertEqual(sorted(parsed), [10, 11, 12, 13])
+        self.assertEqual(parsed[13]["primary_country"], "Syria")
+
+    def test_streamed_call_returns_what_arrived_when_items_are_missing(self):
+        server = MockOpenRouter(malformed_rate=1.0, seed=1).start()
+        events = [{"title": f"Iran talks {idx}", "translated_title": f"Iran talks {idx}"} for idx in range(3)]
+        try:
+            analyzer = self.make_analyzer(server)
+            analyzer.openrouter_streaming = True
+            analyzer.openrouter_salvage_mode = True
+            with mock.patch("mock_openrouter_server.random.Random.choice", return_value="missing_item"):
+                response = analyzer._call_llm(analyzer._build_attribution_prompt(events), [1, 2, 3])
+        finally:
+            server.stop()
+
+        parsed = analyzer._parse_attribution_response(response, events, salvage=True)
+        self.assertEqual(sorted(parsed), [1, 2])
+
+    @mock.patch("time.sleep", return_value=None)
+    @mock.patch("requests.Session.post")
+    def test_streamed_responses_are_closed_on_every_unread_path(self, mock_post, _mock_sleep):
+        def response(status, text=""):
+            resp = mock.MagicMock()
+            resp.status_code = status
+            resp.text = text
+            resp.headers = {}
+            if status >= 400:
+                resp.raise_for_status.side_effect = requests.HTTPError(f"{status} error")
+            return resp
+
+        reasoning = response(400, "Reasoning is mandatory for this endpoint")
+        limited, rejected, failed = response(429), response(401), response(500)
+        mock_post.side_effect = [reasoning, limited, rejected, failed]
+        analyzer = self.make_analyzer(mock.MagicMock(url="https://openrouter.invalid/api/v1/chat/completions"))
+        analyzer.openrouter_backup_api_key = "backup-key"
+        analyzer.openrouter_extra_api_keys = ["third-key"]
+
+        self.assertIsNone(analyzer._call_openrouter("prompt", max_retries=0, expected_ids=[1]))
+
+        self.assertEqual(mock_post.call_count, 4)
+        for resp in (reasoning, limited, rejected, failed):
+            resp.close.assert_called()
+
+    def test_benchmark_harness_reports_llm_phase_counters(self):
+        server = MockOpenRouter(malformed_rate=0.2, seed=3).start()
+        try:
+            result = bench_llm_phase.run_benchmark(30, server)
+        finally:
+            server.stop()
+
+        self.assertEqual(result["events"], 30)
+        self.assertEqual(result["calls"], server.snapshot()["requests"])
+        self.assertGreater(result["calls"], 0)
+        self.assertGreater(result["prompt_tokens"], 0)
+        self.assertGreaterEqual(result["bisections"] + result["salvage_requeries"], 1 if result["malformed"] else 0)
+        self.assertIn("seconds", result)
+
+
+if __name__ == "__main__":
+    unittest.main()
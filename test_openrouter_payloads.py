@@ -1,10 +1,13 @@
+import json
+import time
 import unittest
-from datetime import datetime
+from datetime import datetime, timedelta
 from unittest.mock import MagicMock, patch
 
 import requests
 
 import borderneighboursthreatindex as analyzer_module
+import compare_attribution_modes
 import test_reattribution as dry_run_module
 
 
@@ -20,7 +23,7 @@ class OpenRouterPayloadTests(unittest.TestCase):
         analyzer.category_weights = dict(analyzer_module.BNTIAnalyzer.LLM_CATEGORY_WEIGHTS)
         return analyzer
 
-    @patch("requests.post")
+    @patch("requests.Session.post")
     def test_analyzer_disables_reasoning_in_openrouter_calls(self, mock_post):
         analyzer = self.make_analyzer()
 
@@ -39,7 +42,7 @@ class OpenRouterPayloadTests(unittest.TestCase):
         self.assertEqual(kwargs["json"].get("reasoning"), {"effort": "none"})
         self.assertEqual(kwargs["timeout"], analyzer_module.BNTIAnalyzer.OPENROUTER_TIMEOUT_SECONDS)
 
-    @patch("requests.post")
+    @patch("requests.Session.post")
     def test_analyzer_retries_without_reasoning_when_provider_requires_it(self, mock_post):
         analyzer = self.make_analyzer()
 
@@ -66,7 +69,7 @@ class OpenRouterPayloadTests(unittest.TestCase):
         self.assertNotIn("reasoning", second_call)
 
     @patch("time.sleep", return_value=None)
-    @patch("requests.post")
+    @patch("requests.Session.post")
     def test_analyzer_tries_backup_key_after_primary_rate_limit(self, mock_post, _mock_sleep):
         analyzer = self.make_analyzer()
 
@@ -91,6 +94,143 @@ class OpenRouterPayloadTests(unittest.TestCase):
         self.assertEqual(primary_auth, "Bearer primary-key")
         self.assertEqual(backup_auth, "Bearer backup-key")
 
+    @patch("time.sleep", return_value=None)
+    @patch("requests.Session.post")
+    def test_analyzer_honors_retry_after_on_rate_limit(self, mock_post, mock_sleep):
+        analyzer = self.make_analyzer()
+        analyzer.openrouter_backup_api_key = ""
+
+        first = MagicMock()
+        first.status_code = 429
+        first.headers = requests.structures.CaseInsensitiveDict({"retry-after": "7"})
+
+        second = MagicMock()
+        second.status_code = 200
+        second.json.return_value = {
+            "choices": [{"message": {"content": "[]"}}],
+        }
+
+        mock_post.side_effect = [first, second]
+
+        result = analyzer._call_openrouter("prompt", max_retries=1)
+
+        self.assertEqual(result, "[]")
+        mock_sleep.assert_called_once()
+        self.assertAlmostEqual(mock_sleep.call_args[0][0], 7.0, places=1)
+
+    @patch("time.sleep", return_value=None)
+    @patch("requests.Session.post")
+    def test_rate_limited_key_cools_down_while_backup_serves_without_sleeping(self, mock_post, mock_sleep):
+        analyzer = self.make_analyzer()
+
+        limited = MagicMock()
+        limited.status_code = 429
+        limited.headers = requests.structures.CaseInsensitiveDict({"retry-after": "60"})
+        ok = MagicMock()
+        ok.status_code = 200
+        ok.json.return_value = {"choices": [{"message": {"content": "[]"}}]}
+        mock_post.side_effect = [limited, ok, ok]
+
+        self.assertEqual(analyzer._call_openrouter("prompt", max_retries=2), "[]")
+        self.assertEqual(analyzer._call_openrouter("prompt", max_retries=2), "[]")
+
+        mock_sleep.assert_not_called()
+        auth = [call.kwargs["headers"]["Authorization"] for call in mock_post.call_args_list]
+        self.assertEqual(auth, ["Bearer primary-key", "Bearer backup-key", "Bearer backup-key"])
+        primary = analyzer.openrouter_key_health["primary-key"]
+        self.assertEqual(len(primary["rate_limited_at"]), 1)
+        self.assertGreater(primary["cooldown_until"], time.monotonic() + 50)
+        self.assertIsNotNone(analyzer.openrouter_key_health["backup-key"]["latency_seconds"])
+
+    @patch("requests.Session.post")
+    def test_rejected_key_is_skipped_for_the_rest_of_the_run(self, mock_post):
+        analyzer = self.make_analyzer()
+
+        rejected = MagicMock()
+        rejected.status_code = 401
+        ok = MagicMock()
+        ok.status_code = 200
+        ok.json.return_value = {"choices": [{"message": {"content": "[]"}}]}
+        mock_post.side_effect = [rejected, ok, ok]
+
+        self.assertEqual(analyzer._call_openrouter("prompt", max_retries=2), "[]")
+        self.assertEqual(analyzer._call_openrouter("prompt", max_retries=2), "[]")
+
+        auth = [call.kwargs["headers"]["Authorization"] for call in mock_post.call_args_list]
+        self.assertEqual(auth, ["Bearer primary-key", "Bearer backup-key", "Bearer backup-key"])
+
+    def test_concurrent_requests_are_spread_across_keys(self):
+        analyzer = self.make_analyzer()
+        analyzer.openrouter_extra_api_keys = ["third-key", "primary-key"]
+        keys = analyzer._openrouter_api_keys()
+
+        picked = [analyzer._acquire_openrouter_key(keys)[0] for _ in range(4)]
+        self.assertEqual(keys, ["primary-key", "backup-key", "third-key"])
+        self.assertEqual(picked, ["primary-key", "backup-key", "third-key", "primary-key"])
+
+        for key in picked:
+            analyzer._release_openrouter_key(key, latency_seconds=1.0)
+        analyzer._release_openrouter_key(analyzer._acquire_openrouter_key(keys)[0], latency_seconds=9.0)
+        self.assertEqual(analyzer._acquire_openrouter_key(keys), ("backup-key", 0.0))
+
+    def test_retry_after_parsing_accepts_seconds_and_http_dates_only(self):
+        analyzer = self.make_analyzer()
+        retry_at = datetime.utcnow().replace(microsecond=0) + timedelta(seconds=30)
+
+        self.assertEqual(analyzer._retry_after_seconds(MagicMock(headers={"Retry-After": "12"})), 12.0)
+        self.assertEqual(
+            analyzer._retry_after_seconds(MagicMock(headers={"Retry-After": "9999"})),
+            analyzer_module.BNTIAnalyzer.OPENROUTER_MAX_RETRY_AFTER_SECONDS,
+        )
+        self.assertAlmostEqual(
+            analyzer._retry_after_seconds(MagicMock(headers={"Retry-After": retry_at.strftime("%a, %d %b %Y %H:%M:%S GMT")})),
+            30,
+            delta=2,
+        )
+        self.assertIsNone(analyzer._retry_after_seconds(MagicMock()))
+        self.assertIsNone(analyzer._retry_after_seconds(MagicMock(headers={"Retry-After": "soon"})))
+
+    @patch("requests.Session.post")
+    def test_rate_limit_cools_only_the_throttled_key(self, mock_post):
+        analyzer = self.make_analyzer()
+        analyzer._init_openrouter_key_health()
+        analyzer.openrouter_max_in_flight = 2
+        analyzer._init_openrouter_rate_limit()
+        clock = [1000.0]
+        limited = MagicMock()
+        limited.status_code = 429
+        limited.headers = requests.structures.CaseInsensitiveDict({"retry-after": "7"})
+        ok = MagicMock()
+        ok.status_code = 200
+        ok.json.return_value = {"choices": [{"message": {"content": "[]"}}]}
+        mock_post.side_effect = [limited, ok]
+
+        def fake_sleep(seconds):
+            clock[0] += seconds
+
+        with patch("time.monotonic", side_effect=lambda: clock[0]), patch("time.sleep", side_effect=fake_sleep) as sleep:
+            analyzer.openrouter_bucket.updated_at = clock[0]
+            self.assertEqual(analyzer._call_openrouter("prompt", max_retries=0), "[]")
+
+        auth = [call.kwargs["headers"]["Authorization"] for call in mock_post.call_args_list]
+        self.assertEqual(auth, ["Bearer primary-key", "Bearer backup-key"])
+        sleep.assert_not_called()
+        key_health = analyzer.openrouter_key_health
+        self.assertAlmostEqual(key_health["primary-key"]["cooldown_until"], clock[0] + 7.0)
+        self.assertEqual(key_health["backup-key"]["cooldown_until"], 0.0)
+
+    def test_rejected_key_shrinks_the_shared_request_rate(self):
+        analyzer = self.make_analyzer()
+        analyzer._init_openrouter_key_health()
+        with patch.dict("os.environ", {"OPENROUTER_REQUESTS_PER_MINUTE": "60"}):
+            analyzer._init_openrouter_rate_limit()
+        self.assertAlmostEqual(analyzer.openrouter_bucket.rate_per_second, 2.0)
+
+        key, _ = analyzer._acquire_openrouter_key(analyzer._openrouter_api_keys())
+        analyzer._release_openrouter_key(key, disabled=True)
+
+        self.assertAlmostEqual(analyzer.openrouter_bucket.rate_per_second, 1.0)
+
     def test_analyzer_prompt_numbers_batches_with_global_ids(self):
         analyzer = self.make_analyzer()
         prompt = analyzer._build_attribution_prompt(
@@ -235,6 +375,192 @@ class OpenRouterPayloadTests(unittest.TestCase):
         )
         self.assertEqual(parsed[0]["final_country"], "Iran")
 
+    def test_salvage_parser_keeps_valid_items_and_drops_conflicting_duplicates(self):
+        analyzer = self.make_analyzer()
+        events = [
+            {"title": f"Headline {i}", "translated_title": f"Headline {i}"}
+            for i in range(4)
+        ]
+        response = (
+            '[{"id": 5, "primary_country": "Iran", "category": "military_conflict", "subject": "Iranian strikes"},'
+            ' {"id": 6, "primary_country": "Iraq", "category": "not_a_category", "subject": "Iraqi politics"},'
+            ' {"id": 7, "primary_country": "Syria", "category": "neutral", "subject": "Syrian trade"},'
+            ' {"id": 7, "primary_country": "Greece", "category": "neutral", "subject": "Greek trade"},'
+            ' {"id": 8, "primary_country": "Armenia", "category": "political_instability", "subject": "Armenian cabinet"}]'
+        )
+
+        strict = analyzer._parse_attribution_response(response, events, start_index=4)
+        salvaged = analyzer._parse_attribution_response(response, events, start_index=4, salvage=True)
+
+        self.assertEqual(strict, {})
+        self.assertEqual(sorted(salvaged), [4, 7])
+        self.assertEqual(salvaged[7]["primary_country"], "Armenia")
+
+    def test_salvage_parser_rejects_responses_with_shifted_ids(self):
+        analyzer = self.make_analyzer()
+        events = [
+            {"title": f"Headline {i}", "translated_title": f"Headline {i}"}
+            for i in range(4)
+        ]
+        attribution = "[" + ", ".join(
+            f'{{"id": {idx}, "primary_country": "Iran", "category": "neutral", "subject": "Iranian trade"}}'
+            for idx in range(12, 16)
+        ) + "]"
+        audit = "[" + ", ".join(f'{{"id": {idx}, "final_country": "Iran"}}' for idx in range(12, 16)) + "]"
+
+        with self.assertLogs(analyzer_module.logger, level="WARNING"):
+            salvaged = analyzer._parse_attribution_response(attribution, events, start_index=10, salvage=True)
+        with self.assertLogs(analyzer_module.logger, level="WARNING"):
+            audited = analyzer._parse_country_audit_response(audit, events, start_index=10, salvage=True)
+
+        self.assertEqual(analyzer._parse_attribution_response(attribution, events, start_index=10), {})
+        self.assertEqual(salvaged, {})
+        self.assertEqual(audited, {})
+
+    def test_salvage_mode_requeries_only_missing_ids(self):
+        analyzer = self.make_analyzer()
+        analyzer.openrouter_salvage_mode = True
+        events = [
+            {"title": f"Headline {i}", "translated_title": f"Headline {i}"}
+            for i in range(4)
+        ]
+        prompts = []
+        responses = iter([
+            '[{"id": 1, "primary_country": "Iran", "category": "neutral", "subject": "Iranian trade"},'
+            ' {"id": 2, "primary_country": "Iraq", "category": "neutral", "subject": "Iraqi trade"},'
+            ' {"id": 4, "primary_country": "Syria", "category": "neutral", "subject": "Syrian trade"}]',
+            '[{"id": 3, "primary_country": "Greece", "category": "neutral", "subject": "Greek trade"}]',
+        ])
+
+        def fake_call(prompt, max_retries=2):
+            prompts.append(prompt)
+            return next(responses)
+
+        analyzer._call_openrouter = fake_call
+
+        resolved = analyzer._resolve_attribution_batch(events, start_index=0)
+
+        self.assertEqual(len(prompts), 2)
+        self.assertIn('3. Headline: "Headline 2"', prompts[1])
+        self.assertNotIn('1. Headline: "Headline 0"', prompts[1])
+        self.assertEqual(sorted(resolved), [0, 1, 2, 3])
+        self.assertEqual(resolved[2]["primary_country"], "Greece")
+
+    def test_salvage_mode_requeries_missing_country_audit_ids(self):
+        analyzer = self.make_analyzer()
+        analyzer.openrouter_salvage_mode = True
+        events = [
+            {"title": f"Headline {i}", "translated_title": f"Headline {i}"}
+            for i in range(3)
+        ]
+        attribution_map = {
+            idx: {"primary_country": "Iran", "category": "neutral", "subject": "Iranian trade"}
+            for idx in range(10, 13)
+        }
+        prompts = []
+        responses = iter([
+            '[{"id": 11, "final_country": "Iran"}, {"id": 13, "final_country": "Iraq"}]',
+            '[{"id": 12, "final_country": "Syria"}]',
+        ])
+
+        def fake_call(prompt, max_retries=2):
+            prompts.append(prompt)
+            return next(responses)
+
+        analyzer._call_openrouter = fake_call
+
+        resolved = analyzer._resolve_country_audit_batch(events, attribution_map, start_index=10)
+
+        self.assertEqual(len(prompts), 2)
+        self.assertIn('12. Headline: "Headline 1"', prompts[1])
+        self.assertNotIn("11. Headline", prompts[1])
+        self.assertEqual({idx: item["final_country"] for idx, item in resolved.items()}, {10: "Iran", 11: "Syria", 12: "Iraq"})
+
+    def test_combined_prompt_asks_for_attribution_and_final_country(self):
+        analyzer = self.make_analyzer()
+        prompt = analyzer._build_combined_attribution_prompt(
+            [{"title": "Second headline", "translated_title": "Second headline"}],
+            start_index=1,
+        )
+
+        self.assertIn("do FOUR things", prompt)
+        self.assertIn("Ignore the publication language", prompt)
+        self.assertIn('2. Headline: "Second headline"', prompt)
+        self.assertIn('"final_country": "Syria"', prompt)
+        self.assertLess(prompt.index("Country audit rules"), prompt.index("Headlines:"))
+
+    def test_combined_parser_requires_both_passes_fields(self):
+        analyzer = self.make_analyzer()
+        events = [
+            {"title": "Iran headline", "translated_title": "Iran headline"},
+            {"title": "Iraq headline", "translated_title": "Iraq headline"},
+        ]
+        complete = (
+            '[{"id": 1, "primary_country": "Greece", "category": "military_conflict", "subject": "Iranian strikes", "final_country": "Iran"},'
+            ' {"id": 2, "primary_country": "Iraq", "category": "neutral", "subject": "Iraqi trade", "final_country": "Iraq"}]'
+        )
+        missing_audit = (
+            '[{"id": 1, "primary_country": "Iran", "category": "military_conflict", "subject": "Iranian strikes", "final_country": "Iran"},'
+            ' {"id": 2, "primary_country": "Iraq", "category": "neutral", "subject": "Iraqi trade"}]'
+        )
+
+        parsed = analyzer._parse_combined_attribution_response(complete, events, start_index=0)
+
+        self.assertEqual(parsed[0]["primary_country"], "Greece")
+        self.assertEqual(parsed[0]["final_country"], "Iran")
+        self.assertEqual(parsed[1]["category"], "neutral")
+        self.assertEqual(analyzer._parse_combined_attribution_response(missing_audit, events, start_index=0), {})
+        self.assertEqual(
+            sorted(analyzer._parse_combined_attribution_response(missing_audit, events, start_index=0, salvage=True)),
+            [0],
+        )
+
+    def test_combined_mode_resolves_batch_with_one_call(self):
+        analyzer = self.make_analyzer()
+        analyzer.attribution_mode = "combined"
+        events = [
+            {"title": f"Headline {i}", "translated_title": f"Headline {i}"}
+            for i in range(3)
+        ]
+        prompts = []
+
+        def fake_call(prompt, max_retries=2):
+            prompts.append(prompt)
+            return json.dumps([
+                {"id": i + 1, "primary_country": "Iran", "category": "neutral", "subject": "Iranian trade", "final_country": "Iran"}
+                for i in range(3)
+            ])
+
+        analyzer._call_openrouter = fake_call
+
+        resolved, failure = analyzer._resolve_llm_batches(events)
+
+        self.assertIsNone(failure)
+        self.assertEqual(len(prompts), 1)
+        self.assertEqual(sorted(resolved), [0, 1, 2])
+        self.assertEqual(resolved[2]["final_country"], "Iran")
+
+    def test_attribution_agreement_compares_shared_headlines(self):
+        two_pass = {
+            0: {"primary_country": "Iran", "category": "neutral", "final_country": "Iran"},
+            1: {"primary_country": "Iraq", "category": "terrorism", "final_country": "Iraq"},
+            2: {"primary_country": "Syria", "category": "neutral", "final_country": "Syria"},
+        }
+        combined = {
+            0: {"primary_country": "Iran", "category": "neutral", "final_country": "Iran"},
+            1: {"primary_country": "Iraq", "category": "military_conflict", "final_country": "IRRELEVANT"},
+            3: {"primary_country": "Greece", "category": "neutral", "final_country": "Greece"},
+        }
+
+        agreement = compare_attribution_modes.attribution_agreement(two_pass, combined)
+
+        self.assertEqual(agreement["compared"], 2)
+        self.assertEqual(agreement["two_pass_only"], 1)
+        self.assertEqual(agreement["combined_only"], 1)
+        self.assertEqual(agreement["primary_country"], 1.0)
+        self.assertEqual(agreement["final_country"], 0.5)
+        self.assertEqual(agreement["all_fields"], 0.5)
+
     def test_summary_prompt_demands_structured_six_hour_brief(self):
         analyzer = self.make_analyzer()
         prompt = analyzer._build_regional_summary_prompt(
@@ -293,7 +619,7 @@ class OpenRouterPayloadTests(unittest.TestCase):
 
         self.assertFalse(analyzer._regional_summary_mentions_are_grounded(parsed, summary_events))
 
-    @patch("test_reattribution.requests.post")
+    @patch("test_reattribution.requests.Session.post")
     def test_dry_run_uses_same_openrouter_guardrails(self, mock_post):
         response = MagicMock()
         response.status_code = 200
@@ -9,6 +9,7 @@ import os
 import time
 import requests
 
+import bnti_translation
 import borderneighboursthreatindex as analyzer_module
 
 
@@ -18,7 +19,7 @@ logger = logging.getLogger(__name__)
 API_KEY = os.environ.get("OPENROUTER_API_KEY", "")
 BACKUP_API_KEY = os.environ.get("OPENROUTER_API_KEY_BACKUP", "")
 MODEL = os.environ.get("OPENROUTER_MODEL", "openrouter/free")
-BASE_URL = "https://openrouter.ai/api/v1/chat/completions"
+BASE_URL = os.environ.get("OPENROUTER_BASE_URL", "https://openrouter.ai/api/v1/chat/completions")
 BATCH_SIZE = 10
 BORDER_COUNTRIES = list(analyzer_module.BNTIAnalyzer.BORDER_COUNTRIES)
 CATEGORY_WEIGHTS = dict(analyzer_module.BNTIAnalyzer.LLM_CATEGORY_WEIGHTS)
@@ -40,7 +41,7 @@ def build_helper():
     analyzer.openrouter_batch_size = BATCH_SIZE
     analyzer.border_countries = list(BORDER_COUNTRIES)
     analyzer.category_weights = dict(CATEGORY_WEIGHTS)
-    analyzer.translator = analyzer_module.Translator()
+    analyzer.translation_backend = bnti_translation.GoogleTranslateBackend()
     return analyzer
 
 
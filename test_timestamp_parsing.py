@@ -0,0 +1,58 @@
+import unittest
+import warnings
+from datetime import datetime
+
+from dateutil import parser as date_parser
+
+import bnti_timestamps
+
+SAMPLES = [
+    "Sat, 28 Mar 2026 06:00:00 GMT",
+    "Sat, 28 Mar 2026 06:00:00 +0300",
+    "Sat,28 Mar 2026 06:00 EST",
+    "28 mar 2026 6:05:07 Z",
+    " Mon, 02 Jan 2006 15:04:05 MST ",
+    "2026-03-28T06:00:00Z",
+    "2026-03-28 06:00:00.123456",
+    "2026-03-28T06:00:00+03:00",
+    "2026-03-28T06:00:00.5+0300",
+    "2026-03-28",
+    "2026-03-28T06:00:00.1234567",
+    "March 28, 2026 6:00 PM",
+]
+
+
+class TimestampParsingTests(unittest.TestCase):
+    def test_matches_dateutil_wall_clock_semantics(self):
+        with warnings.catch_warnings():
+            warnings.simplefilter("ignore")
+            for value in SAMPLES:
+                with self.subTest(value=value):
+                    expected = date_parser.parse(value).replace(tzinfo=None)
+                    self.assertEqual(bnti_timestamps.parse_timestamp(value), expected)
+
+    def test_common_feed_formats_take_fast_paths(self):
+        self.assertEqual(
+            bnti_timestamps.parse_rfc822("Sat, 28 Mar 2026 06:00:00 GMT"),
+            datetime(2026, 3, 28, 6, 0, 0),
+        )
+        self.assertEqual(
+            bnti_timestamps.parse_iso("2026-03-28T06:00:00+03:00"),
+            datetime(2026, 3, 28, 6, 0, 0),
+        )
+        self.assertIsNone(bnti_timestamps.parse_rfc822("March 28, 2026 6:00 PM"))
+        self.assertIsNone(bnti_timestamps.parse_rfc822("Sat, 31 Feb 2026 06:00:00 GMT"))
+
+    def test_invalid_values_return_none(self):
+        for value in (None, "", "not a date", "Sat, 28 Mar 2026 24:00:00 GMT"):
+            with self.subTest(value=value):
+                self.assertIsNone(bnti_timestamps.parse_timestamp(value))
+
+    def test_repeated_strings_are_memoized(self):
+        value = "Sun, 29 Mar 2026 07:30:00 GMT"
+        first = bnti_timestamps.parse_timestamp(value)
+        self.assertIs(bnti_timestamps.parse_timestamp(value), first)
+
+
+if __name__ == "__main__":
+    unittest.main()
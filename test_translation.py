@@ -0,0 +1,212 @@
+import json
+import os
+import subprocess
+import sys
+import tempfile
+import threading
+import time
+import unittest
+from types import SimpleNamespace
+from unittest import mock
+
+import bnti_translation
+import borderneighboursthreatindex as analyzer_module
+
+
+class FakeTranslator:
+    calls = []
+    threads = set()
+    lock = threading.Lock()
+    delay = 0.0
+    failing = set()
+
+    def translate(self, text, dest="en"):
+        with self.lock:
+            FakeTranslator.calls.append(text)
+            FakeTranslator.threads.add(threading.get_ident())
+        time.sleep(self.delay)
+        if text in self.failing:
+            raise RuntimeError("service unavailable")
+        return SimpleNamespace(text=f"EN {text}")
+
+
+class TranslationServiceTests(unittest.TestCase):
+    def setUp(self):
+        FakeTranslator.calls = []
+        FakeTranslator.threads = set()
+        FakeTranslator.delay = 0.0
+        FakeTranslator.failing = set()
+        self.workdir = tempfile.TemporaryDirectory()
+        self.addCleanup(self.workdir.cleanup)
+        patcher = mock.patch("googletrans.Translator", FakeTranslator)
+        patcher.start()
+        self.addCleanup(patcher.stop)
+
+    def make_analyzer(self, **environment):
+        analyzer = object.__new__(analyzer_module.BNTIAnalyzer)
+        analyzer.cache_dir = self.workdir.name
+        analyzer.openrouter_model = "openrouter/free"
+        with mock.patch.dict(os.environ, environment):
+            analyzer._init_translation_service()
+        return analyzer
+
+    def test_titles_are_translated_concurrently_without_fixed_sleeps(self):
+        FakeTranslator.delay = 0.05
+        analyzer = self.make_analyzer(BNTI_TRANSLATION_REQUESTS_PER_SECOND="0")
+        events = [{"title": f"Ειδήσεις {idx}"} for idx in range(8)] + [{"title": "Iran talks resume"}]
+
+        with mock.patch.object(analyzer_module.time, "sleep", wraps=time.sleep) as sleep:
+            analyzer._ensure_translated_titles(events)
+
+        self.assertEqual(len(FakeTranslator.calls), 8)
+        self.assertGreater(len(FakeTranslator.threads), 1)
+        self.assertNotIn(mock.call(0.5), sleep.call_args_list)
+        self.assertEqual(events[0]["translated_title"], "EN Ειδήσεις 0")
+        self.assertTrue(events[0]["is_translated"])
+        self.assertEqual(events[-1]["translated_title"], "Iran talks resume")
+        self.assertFalse(events[-1]["is_translated"])
+
+    def test_repeated_titles_cost_no_calls_within_and_across_runs(self):
+        analyzer = self.make_analyzer()
+        analyzer._ensure_translated_titles([{"title": "Ειδήσεις"}, {"title": "Ειδήσεις"}, {"title": "Новости"}])
+        self.assertEqual(sorted(FakeTranslator.calls), ["Ειδήσεις", "Новости"])
+
+        FakeTranslator.calls = []
+        events = [{"title": "Новости"}]
+        self.make_analyzer()._ensure_translated_titles(events)
+
+        self.assertEqual(FakeTranslator.calls, [])
+        self.assertEqual(events[0]["translated_title"], "EN Новости")
+        self.assertTrue(os.path.exists(os.path.join(self.workdir.name, "translation_cache.json")))
+
+    def test_cache_evicts_least_recently_used_titles(self):
+        analyzer = self.make_analyzer(BNTI_TRANSLATION_CACHE_MAX_ENTRIES="2")
+        analyzer._translate_titles(["Α"])
+        analyzer._translate_titles(["Β"])
+        analyzer._translate_titles(["Α"])
+        analyzer._translate_titles(["Γ"])
+
+        cached, pending = self.make_analyzer(BNTI_TRANSLATION_CACHE_MAX_ENTRIES="2")._lookup_translation_cache(["Α", "Β", "Γ"])
+        self.assertEqual(cached, {"Α": "EN Α", "Γ": "EN Γ"})
+        self.assertEqual(pending, ["Β"])
+
+    def test_cache_rows_with_unparseable_timestamps_are_skipped(self):
+        self.make_analyzer()._translate_titles(["Ειδήσεις", "Новости"])
+        path = os.path.join(self.workdir.name, "translation_cache.json")
+        with open(path, "r", encoding="utf-8") as handle:
+            data = json.load(handle)
+        broken_key = next(iter(data))
+        data[broken_key]["stored_at"] = "yesterday"
+        with open(path, "w", encoding="utf-8") as handle:
+            json.dump(data, handle)
+
+        cached, pending = self.make_analyzer()._lookup_translation_cache(["Ειδήσεις", "Новости"])
+
+        self.assertEqual(len(cached), 1)
+        self.assertEqual(len(pending), 1)
+
+    def test_failed_translations_fall_back_and_are_not_cached(self):
+        FakeTranslator.failing = {"Ειδήσεις"}
+        analyzer = self.make_analyzer()
+        events = [{"title": "Ειδήσεις"}]
+
+        with self.assertLogs(analyzer_module.logger, level="WARNING"):
+            analyzer._ensure_translated_titles(events)
+
+        self.assertEqual(events[0]["translated_title"], "Ειδήσεις")
+        self.assertFalse(events[0]["is_translated"])
+        self.assertEqual(analyzer._lookup_translation_cache(["Ειδήσεις"]), ({}, ["Ειδήσεις"]))
+
+    def test_token_bucket_paces_requests_beyond_the_burst(self):
+        analyzer = self.make_analyzer(BNTI_TRANSLATION_WORKERS="2", BNTI_TRANSLATION_REQUESTS_PER_SECOND="20")
+        started = time.monotonic()
+        for _ in range(4):
+            analyzer._acquire_translation_token()
+        self.assertGreaterEqual(time.monotonic() - started, 0.08)
+
+    def test_dictionary_backend_translates_offline_and_reports_latency(self):
+        path = os.path.join(self.workdir.name, "dictionary.json")
+        with open(path, "w", encoding="utf-8") as handle:
+            json.dump({"Ειδήσεις": "News"}, handle, ensure_ascii=False)
+        analyzer = self.make_analyzer(BNTI_TRANSLATION_BACKEND="dictionary", BNTI_TRANSLATION_DICTIONARY=path)
+        events = [{"title": "Ειδήσεις"}, {"title": "Новости"}]
+
+        analyzer._ensure_translated_titles(events)
+        metrics = analyzer._translation_metrics()["dictionary"]
+
+        self.assertEqual(FakeTranslator.calls, [])
+        self.assertEqual((events[0]["translated_title"], events[0]["translation_engine"]), ("News", "Local dictionary"))
+        self.assertEqual((events[1]["translated_title"], events[1]["is_translated"]), ("Новости", False))
+        self.assertEqual((metrics["calls"], metrics["translated"], metrics["untranslated"]), (2, 1, 1))
+        self.assertGreaterEqual(metrics["max_seconds"], metrics["avg_seconds"])
+        self.assertFalse(os.path.exists(os.path.join(self.workdir.name, "translation_cache.json")))
+
+    def test_passthrough_and_unknown_backends(self):
+        analyzer = self.make_analyzer(BNTI_TRANSLATION_BACKEND="passthrough")
+        events = [{"title": "Ειδήσεις"}]
+        analyzer._ensure_translated_titles(events)
+        self.assertEqual((events[0]["translated_title"], events[0]["is_translated"]), ("Ειδήσεις", False))
+
+        with self.assertLogs(analyzer_module.logger, level="WARNING"):
+            analyzer = self.make_analyzer(BNTI_TRANSLATION_BACKEND="deepl")
+        self.assertIsInstance(analyzer.translation_backend, bnti_translation.GoogleTranslateBackend)
+
+    def test_local_backends_do_not_need_googletrans(self):
+        script = (
+            "import sys; sys.modules['googletrans'] = None; import bnti_translation; "
+            "print(bnti_translation.create_backend('passthrough').name)"
+        )
+        result = subprocess.run([sys.executable, "-c", script], capture_output=True, text=True,
+                                cwd=os.path.dirname(os.path.abspath(bnti_translation.__file__)))
+
+        self.assertEqual(result.returncode, 0, result.stderr)
+        self.assertEqual(result.stdout.strip(), "passthrough")
+
+    def test_titles_past_the_translation_budget_are_skipped(self):
+        analyzer = self.make_analyzer(BNTI_TRANSLATION_WORKERS="1", BNTI_TRANSLATION_REQUESTS_PER_SECOND="0")
+        analyzer.translation_backend = bnti_translation.DictionaryBackend(
+            {f"Ειδήσεις {idx}": f"News {idx}" for idx in range(5)}, latency_seconds=0.1
+        )
+        analyzer.translation_budget_seconds = 0.25
+
+        translations = analyzer._translate_titles([f"Ειδήσεις {idx}" for idx in range(5)])
+        metrics = analyzer._translation_metrics()["dictionary"]
+
+        self.assertEqual(len(translations), 3)
+        self.assertEqual((metrics["translated"], metrics["skipped"]), (3, 2))
+
+    def test_top_threats_are_enriched_once_and_picked_by_weight(self):
+        analyzer = self.make_analyzer(BNTI_TRANSLATION_BACKEND="passthrough")
+        dashboard = {"countries": {
+            country: {"events": [{"title": f"{country} headline {idx}", "weight": (idx * 7 + offset) % 11}
+                                 for idx in range(10)]}
+            for offset, country in enumerate(("Iran", "Iraq", "Syria"))
+        }}
+        everything = [event for data in dashboard["countries"].values() for event in data["events"]]
+        expected = sorted(everything, key=lambda event: event["weight"], reverse=True)[:15]
+
+        with mock.patch.object(analyzer, "detect_and_enrich_metadata",
+                               wraps=analyzer.detect_and_enrich_metadata) as enrich:
+            top_list = analyzer.translate_top_threats(dashboard)
+
+        self.assertEqual([event["title"] for event in top_list], [event["title"] for event in expected])
+        self.assertEqual(sum(len(call.args[0]) for call in enrich.call_args_list), len(everything))
+        self.assertTrue(all(event["country"] and event["detected_lang"] == "en" for event in everything))
+        self.assertTrue(all(event["translated_title"] == event["title"] for event in top_list))
+
+    def test_top_threats_log_per_backend_latency(self):
+        analyzer = self.make_analyzer()
+        analyzer.translation_backend = bnti_translation.DictionaryBackend({"Ειδήσεις": "News"})
+        dashboard = {"countries": {"Greece": {"events": [{"title": "Ειδήσεις", "weight": 3.0}]}}}
+
+        with self.assertLogs(analyzer_module.logger, level="INFO") as logs:
+            analyzer.translate_top_threats(dashboard)
+
+        lines = [line for line in logs.output if "Translation backend dictionary" in line]
+        self.assertEqual(len(lines), 1)
+        self.assertIn("1/1 calls translated", lines[0])
+        self.assertIn("latency avg", lines[0])
+
+
+if __name__ == "__main__":
+    unittest.main()